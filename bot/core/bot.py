@@ -13,11 +13,19 @@ from bot.system.llm_client import LLMClient
 from bot.core.game_state import GameState
 from bot.input.input_controller import InputController
 from bot.recording.recorder import Recorder
-from bot.system.config import config
+from bot.system.config import config, ConfigWatcher
 from bot.system.logger import logger
+from bot.system.log_writer import shared_writer
 from bot.recording.visualizer import Visualizer
-from bot.core.state_handlers import handle_revive, handle_treasure_opening, handle_level_up
+from bot.core.state_handlers import handle_revive, handle_treasure_start, handle_treasure_done, handle_level_up, handle_guy
 from bot.core.gameplay_loop import process_gameplay_frame
+from bot.core.control_loop import ControlLoop
+from bot.core.menu_navigator import MenuNavigator
+from bot.core.ui_flow import UIStateMachine
+from bot.core.level_up_policy import LevelUpDecider, LevelUpPolicy
+from bot.knowledge_base.evolution_index import KnowledgeBase
+from bot.vision.item_icons import load_recognizer
+from bot.vision.inventory_hud import InventoryMonitor, load_inventory_reader
 
 class VampireSurvivorsBot:
     def __init__(self):
@@ -55,20 +63,33 @@ class VampireSurvivorsBot:
         self.input_controller = InputController() # 'bot' in main.py
 
         # 4. State & AI
-        self.llm_client = LLMClient()
-        self.game_state = GameState()
+        self.knowledge_base = KnowledgeBase()
+        self.llm_client = LLMClient(self.knowledge_base)
+        self.option_recognizer = load_recognizer() # Reads level-up cards from their icons
+        self.level_up_decider = LevelUpDecider(
+            self.llm_client,
+            LevelUpPolicy(self.knowledge_base),
+            options_provider=self.option_recognizer.recognize if self.option_recognizer else None
+        )
+        inventory_reader = load_inventory_reader() # Reads weapons/passives off the HUD
+        self.game_state = GameState(self.knowledge_base.names, inventory_reader=inventory_reader)
+        self.inventory_monitor = InventoryMonitor(inventory_reader, self.game_state) if inventory_reader else None
         
         self.image_size = tuple(config.get("game.image_size", (960, 608)))
         self.pilot = Pilot((self.image_size[0]//2, self.image_size[1]//2))
+        self.control_loop = ControlLoop(self.pilot, self.input_controller) if config.snapshot.control.enabled else None
 
         # 5. Recording & Visuals
         self.recorder = Recorder()
         self.visualizer = Visualizer()
+        self.config_watcher = ConfigWatcher(config, config.get("hot_reload.interval", 1.0)) if config.get("hot_reload.enabled", False) else None
         
         # 6. Game Environment
         game_dimensions = tuple(config.get("game.dimensions", (1245, 768)))
         self.game_area = {"top": 0, "left": 0, "width": game_dimensions[0], "height": game_dimensions[1]}
         
+        self.menu_navigator = MenuNavigator(self.input_controller, self.game_area) if config.get("menu.enabled", False) else None
+        
         # 7. Control Events
         self.stop_event = threading.Event()
         self.pause_event = threading.Event()
@@ -76,6 +97,11 @@ class VampireSurvivorsBot:
         # 8. Load Initial State
         self._load_initial_state()
         
+        # 9. UI Flow (per-state handlers, capture rate and timeouts)
+        self.ui_flow = UIStateMachine(self._ui_actions())
+        self._key_press = -1
+        self._frame_time = None
+        
         # Constants
         self.KEY_ESC = config.get("keybindings.esc", 27)
 
@@ -90,20 +116,84 @@ class VampireSurvivorsBot:
                 self.game_state.add_passive(p.strip())
                 logger.debug(f"Added starting passive: {p.strip()}")
 
+    def _ui_actions(self):
+        """Actions referenced by the UI flow's transitions, each called with the triggering frame."""
+        bot = self.input_controller
+        return {
+            "suspend_steering": lambda frame: self.control_loop.suspend() if self.control_loop else None,
+            "level_up": lambda frame: self._read_inventory_after(
+                handle_level_up(bot, self.level_up_decider, self.game_state, frame, self.menu_navigator)),
+            "open_treasure": lambda frame: handle_treasure_start(bot),
+            "collect_treasure": lambda frame: self._read_inventory_after(handle_treasure_done(bot, self.game_state, frame)),
+            "revive": lambda frame: handle_revive(bot),
+            "guy": lambda frame: handle_guy(bot, self.menu_navigator),
+            "quit": lambda frame: self.stop_event.set(),
+            "gameplay": self._gameplay_frame,
+        }
+
+    def _read_inventory_after(self, future):
+        """Re-reads the HUD on the first gameplay frame after a menu's inputs have played out."""
+        if self.inventory_monitor and future is not None:
+            future.add_done_callback(lambda f: self.inventory_monitor.request())
+        return future
+
+    def _gameplay_frame(self, frame_raw):
+        if self.inventory_monitor:
+            self.inventory_monitor.offer(frame_raw, now=self._frame_time)
+        process_gameplay_frame(
+            frame_raw, 
+            self.inference_model, 
+            self.pilot, 
+            self.input_controller, 
+            self.visualizer, 
+            self.pause_event, 
+            self._key_press, 
+            self.game_area,
+            control_loop=self.control_loop,
+            frame_time=self._frame_time
+        )
+
     def start(self):
         logger.info("Starting bot services...")
         self.recorder.start()
         self.visualizer.start()
+        if self.control_loop:
+            self.control_loop.start()
+        if self.inventory_monitor:
+            self.inventory_monitor.start()
+        if self.config_watcher:
+            self.config_watcher.start()
 
     def stop(self):
         logger.info("Stopping bot services...")
+        if self.control_loop:
+            self.control_loop.stop()
+        if self.config_watcher:
+            self.config_watcher.stop()
+        if self.inventory_monitor:
+            self.inventory_monitor.stop()
+            logger.info(f"Inventory monitor: {self.inventory_monitor.get_stats()}")
+        if self.menu_navigator:
+            self.menu_navigator.shutdown()
         if self.input_controller:
             self.input_controller.stop_movement()
+            self.input_controller.close()
         if self.recorder:
             self.recorder.stop()
         if self.visualizer:
             self.visualizer.stop()
         cv2.destroyAllWindows()
+        logger.info(f"Level-up decisions: {self.level_up_decider.get_stats()}")
+        self.level_up_decider.shutdown()
+        if self.llm_client.cache:
+            logger.info(f"Decision cache: {self.llm_client.cache.get_stats()}")
+            self.llm_client.cache.close()
+        if self.llm_client.router:
+            logger.info(f"LLM endpoints: {self.llm_client.router.get_stats()}")
+            self.llm_client.router.shutdown()
+        writer = shared_writer()
+        writer.close()
+        logger.info(f"Log writer: {writer.get_stats()}")
         logger.info("Cleanup complete.")
 
     def run(self):
@@ -111,42 +201,25 @@ class VampireSurvivorsBot:
         logger.info("Entering main game loop...")
         
         try:
-            while (key_press := cv2.waitKey(1)) != self.KEY_ESC:
+            next_capture = 0.0
+            while (key_press := cv2.waitKey(1)) != self.KEY_ESC and not self.stop_event.is_set():
                 try:
+                    # Idle screens (pause, menus waiting on input) capture at a throttled rate
+                    delay = next_capture - time.perf_counter()
+                    if delay > 0 and self.stop_event.wait(delay):
+                        break
+                    
                     # Capture Raw Frame
+                    self._key_press = key_press
+                    self._frame_time = time.perf_counter()
                     raw_screen = screenshot(self.game_area)
                     frame_raw = cv2.cvtColor(raw_screen, cv2.COLOR_BGRA2BGR)
 
-                    # UI Detection
+                    # UI Detection drives the state machine: handlers fire on the first
+                    # frame a state appears, gameplay frames go to the pilot
                     ui_state = self.ui_detector.detect_state(frame_raw)
-                    
-                    if ui_state == 'PAUSE':
-                        continue
-                    elif ui_state == 'QUIT':
-                        break
-                    elif ui_state == 'REVIVE':
-                        handle_revive(self.input_controller)
-                    elif ui_state == 'GUY':
-                        handle_guy(self.input_controller)
-                    elif ui_state == 'TREASURE_START':
-                        handle_treasure_opening(self.input_controller, self.ui_detector, self.game_state, self.game_area)
-                        continue
-                    elif ui_state == 'LEVEL_UP':
-                        handle_level_up(self.input_controller, self.llm_client, self.game_state, frame_raw)
-                        continue
-                    elif ui_state == 'GAMEPLAY':
-                        process_gameplay_frame(
-                            frame_raw, 
-                            self.inference_model, 
-                            self.pilot, 
-                            self.input_controller, 
-                            self.visualizer, 
-                            self.pause_event, 
-                            key_press, 
-                            self.game_area
-                        )
-                    else:
-                        logger.warning(f"Unknown UI State: {ui_state}")
+                    self.ui_flow.step(ui_state, frame_raw, now=self._frame_time)
+                    next_capture = self._frame_time + self.ui_flow.capture_interval()
                         
                 except KeyboardInterrupt:
                     logger.info("Interrupted by user.")
@@ -0,0 +1,124 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from bot.system.config import config
+from bot.system.logger import logger
+from bot.vision.types import Detection
+
+class ControlLoop(threading.Thread):
+    """
+    Drives the left stick from the Pilot at a fixed rate, independent of perception.
+
+    The perception loop submits each frame's detections; between frames the loop keeps
+    steering on the latest detections, advanced along the Pilot's estimated monster
+    velocities, and sends exponentially smoothed stick values.
+    """
+    def __init__(self, pilot, input_controller):
+        super().__init__()
+        self.daemon = True
+        self.pilot = pilot
+        self.input_controller = input_controller
+        self.stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+        # Configuration (re-read each tick so hot reloads apply)
+        self.settings = config.snapshot.control
+
+        # Latest perception frame (None while suspended)
+        self._frame: Optional[Tuple[List[Detection], Dict[int, str], float]] = None
+        self._frame_is_new = False
+        self._suspends = 0 # bumped by suspend(); a tick computed before it is discarded
+
+        # Output State
+        self.stick: Tuple[float, float] = (0.0, 0.0)
+        self.ticks = 0
+
+    def start(self):
+        logger.info(f"Control loop starting at {self.settings.rate_hz} Hz...")
+        super().start()
+
+    def stop(self):
+        logger.info("Control loop stopping...")
+        self.stop_event.set()
+        if self.is_alive():
+            self.join()
+
+    def submit(self, detections: List[Detection], class_names: Dict[int, str], timestamp: Optional[float] = None):
+        """Hands a new perception frame to the control loop (resumes it if suspended)."""
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        with self._lock:
+            self._frame = (detections, class_names, timestamp)
+            self._frame_is_new = True
+
+    def suspend(self):
+        """
+        Stops steering until the next submit(), e.g. when a menu opens.
+        Once this returns, no further stick update will be sent.
+        """
+        with self._lock:
+            if self._frame is not None:
+                self._frame = None
+                self._suspends += 1
+                self.stick = (0.0, 0.0)
+                self.input_controller.stop_movement()
+
+    def _tick(self):
+        settings = self.settings = config.snapshot.control
+        # Take the frame under the lock; the Pilot runs outside it so submit()/suspend() never wait on it
+        with self._lock:
+            if self._frame is None:
+                return
+            detections, class_names, timestamp = self._frame
+            frame_is_new, self._frame_is_new = self._frame_is_new, False
+            suspends = self._suspends
+
+        if frame_is_new:
+            self.pilot.update(detections, class_names, timestamp=timestamp)
+
+        lookahead = min(time.perf_counter() - timestamp, settings.max_extrapolation)
+        fx, fy = self.pilot.get_force_vector(detections, class_names, lookahead=lookahead)
+
+        # Normalize vector to ensure magnitude <= 1.0 (clamped)
+        magnitude = (fx**2 + fy**2)**0.5
+        if magnitude > 1.0:
+            fx /= magnitude
+            fy /= magnitude
+
+        with self._lock:
+            if self._suspends != suspends:
+                return # suspended while the Pilot ran
+
+            sx, sy = self.stick
+            sx += settings.smoothing * (fx - sx)
+            sy += settings.smoothing * (fy - sy)
+            self.stick = (sx, sy)
+
+            self.input_controller.update_movement(sx, sy, frame_time=timestamp)
+            self.ticks += 1
+
+    def _run(self):
+        """
+        Main loop: fixed-rate ticks scheduled against absolute deadlines (no drift).
+        """
+        next_tick = time.perf_counter()
+        while not self.stop_event.is_set():
+            self._tick()
+
+            next_tick += 1.0 / self.settings.rate_hz
+            sleep_time = next_tick - time.perf_counter()
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+            else:
+                # Overran: skip missed ticks rather than bursting to catch up
+                next_tick = time.perf_counter()
+
+    def run(self):
+        # Wrapper for _run to catch exceptions
+        try:
+            self._run()
+        except Exception as e:
+            logger.error(f"Control loop crashed: {e}")
+            import traceback
+            traceback.print_exc()
@@ -1,42 +1,81 @@
-from typing import List, Dict, Any
-import difflib
+import threading
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from bot.knowledge_base.kb_artifact import load_artifact
+from bot.knowledge_base.name_index import NameIndex
 from bot.system.logger import logger
 
 class GameState:
-    def __init__(self):
+    def __init__(self, names: Optional[NameIndex] = None, inventory_reader=None):
         self.weapons: List[str] = []
         self.passives: List[str] = []
         self.max_weapons = 6
         self.max_passives = 6
         self.history: List[Dict[str, Any]] = []
+        self._lock = threading.RLock() # The HUD monitor syncs from its own thread
 
         # Load knowledge base for type inference
         self.item_db = {} 
         self._load_knowledge_base()
+        # Resolves the LLM's item names (pass KnowledgeBase.names for evolution aliases)
+        self.names = names or NameIndex(self.item_db)
+        # Reads the HUD icon strips (bot.vision.inventory_hud.InventoryReader); None = decisions only
+        self.inventory_reader = inventory_reader
 
     def _load_knowledge_base(self):
         try:
-            import json
-            import os
-            # Assume running from root
-            path = "bot/knowledge_base/items.json"
-            if os.path.exists(path):
-                with open(path, "r", encoding='utf-8') as f:
-                    self.item_db = json.load(f)
+            # Compiled artifact, mapped once per process (rebuilt if items.json changed)
+            self.item_db = load_artifact().item_types()
+            if self.item_db:
                 logger.info(f"[GameState] Loaded {len(self.item_db)} items from KB.")
             else:
-                logger.warning(f"[GameState] Warning: Item DB not found at {path}")
+                logger.warning("[GameState] Warning: Item DB is empty (is bot/knowledge_base/items.json missing?)")
                 
         except Exception as e:
             logger.error(f"[GameState] Error loading knowledge base: {e}")
 
     def add_weapon(self, name: str):
-        if name not in self.weapons and len(self.weapons) < self.max_weapons:
-            self.weapons.append(name)
+        with self._lock:
+            if name not in self.weapons and len(self.weapons) < self.max_weapons:
+                self.weapons = self.weapons + [name]
 
     def add_passive(self, name: str):
-        if name not in self.passives and len(self.passives) < self.max_passives:
-            self.passives.append(name)
+        with self._lock:
+            if name not in self.passives and len(self.passives) < self.max_passives:
+                self.passives = self.passives + [name]
+
+    def _reconcile(self, current: List[str], seen: List[Optional[str]], item_type: str, limit: int) -> List[str]:
+        # Slots read as another type's item count as unrecognised
+        seen = [name if name and self.item_db.get(name) == item_type else None for name in seen]
+        if not seen:
+            return current # Nothing read (strip hidden or off-screen): keep what we know
+        if None not in seen:
+            return seen[:limit] # Every slot recognised: the HUD is the inventory, in slot order
+        merged = list(current)
+        for name in seen:
+            if name and name not in merged and len(merged) < limit:
+                merged.append(name)
+        return merged
+
+    def sync_inventory(self, weapons: List[Optional[str]], passives: List[Optional[str]]) -> bool:
+        """
+        Reconciles the inventory with a HUD reading (None = occupied slot that wasn't
+        recognised; a trailing None means the strip ended on an unreadable cell). Recognised
+        items are added; when every slot of a strip up to an empty one (or the last slot)
+        was recognised, that strip replaces the list, which also drops base weapons that evolved.
+        Returns True if anything changed.
+        """
+        with self._lock:
+            new_weapons = self._reconcile(self.weapons, weapons, "weapon", self.max_weapons)
+            new_passives = self._reconcile(self.passives, passives, "passive", self.max_passives)
+            if new_weapons == self.weapons and new_passives == self.passives:
+                return False
+            logger.info(f"[GameState] Inventory from HUD: {self.weapons} -> {new_weapons}, {self.passives} -> {new_passives}")
+            # Readers on other threads see either the old or the new lists, never a partial update
+            self.weapons, self.passives = new_weapons, new_passives
+            return True
 
     def log_decision(self, decision: Dict[str, Any]):
         """
@@ -56,18 +95,15 @@ class GameState:
             canonical_name = item_name # Default to LLM's name
 
             if not item_type:
-                if item_name in self.item_db:
-                    item_type = self.item_db[item_name]
+                # Exact, normalized, alias (evolved form -> base) or trigram match
+                match = self.names.resolve(item_name)
+                if match and match.name in self.item_db:
+                    canonical_name = match.name
+                    item_type = self.item_db[canonical_name]
+                    if match.via != "exact" or canonical_name != item_name:
+                        logger.debug(f"[GameState] Resolved '{item_name}' -> '{canonical_name}' ({match.via}, {match.score})")
                 else:
-                    # Fuzzy match
-                    matches = difflib.get_close_matches(item_name, self.item_db.keys(), n=1, cutoff=0.6)
-                    if matches:
-                        canonical_name = matches[0]
-                        item_type = self.item_db[canonical_name]
-                        # print(f"[GameState] Fuzzy matched '{item_name}' -> '{canonical_name}' ({item_type})")
-                    else:
-                        item_type = "unknown"
-                        # print(f"[GameState] Inferred type for '{item_name}': {item_type}")
+                    item_type = "unknown"
             
             if item_type == "weapon":
                 self.add_weapon(canonical_name)
@@ -85,9 +121,16 @@ class GameState:
             "history_count": len(self.history)
         }
 
-    def update_from_treasure(self, image: Any):
+    def update_from_treasure(self, image: Any) -> bool:
         """
-        Updates the game state based on the contents of a treasure chest.
-        TODO: Implement visual analysis to identify the obtained item.
+        Updates the game state after a treasure chest by reading the HUD on its screen
+        (RGB PIL image or BGR array). The chest's evolutions replace their base weapons.
         """
-        logger.warning("[GameState] Warning: update_from_treasure is not yet implemented. Inventory not updated.")
+        if self.inventory_reader is None:
+            logger.warning("[GameState] No icon index for the HUD; inventory not updated from treasure.")
+            return False
+        frame = np.asarray(image)
+        if not isinstance(image, np.ndarray):
+            frame = np.ascontiguousarray(frame[:, :, 2::-1]) # RGB -> BGR
+        inventory = self.inventory_reader.read(frame)
+        return self.sync_inventory(inventory["weapon"], inventory["passive"])
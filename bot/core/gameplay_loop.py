@@ -5,9 +5,11 @@ from bot.system.logger import logger
 from bot.utils import check_and_update_view_position, handle_pause
 
 def process_gameplay_frame(frame_raw, inference_model, pilot, bot, visualizer, 
-                           pause_event, key_press, game_area):
+                           pause_event, key_press, game_area, control_loop=None, frame_time=None):
     
-    IMAGE_SIZE = tuple(config.get("game.image_size", (960, 608)))
+    settings = config.snapshot # Bind once per frame
+    IMAGE_SIZE = settings.game.image_size
+    exclusion_radius_sq = settings.pilot.center_exclusion_radius_sq
     
     # Resize frame for Object Detection and Pilot (Model expects IMAGE_SIZE)
     frame = cv2.resize(frame_raw, IMAGE_SIZE)
@@ -24,22 +26,27 @@ def process_gameplay_frame(frame_raw, inference_model, pilot, bot, visualizer,
         dist_sq = (cx - center_x)**2 + (cy - center_y)**2
         
         # Ignorance Radius: 50 pixels (squared = 2500)
-        if dist_sq > config.get("pilot.center_exclusion_radius_sq", 2500): 
+        if dist_sq > exclusion_radius_sq: 
             filtered_detections.append(d)
     
     detections = filtered_detections
 
-    # Update Pilot State and Calculate Force
-    pilot.update(detections, class_names)
-    fx, fy = pilot.get_force_vector(detections, class_names)
-    
-    # Normalize vector to ensure magnitude <= 1.0 (clamped)
-    magnitude = (fx**2 + fy**2)**0.5
-    if magnitude > 1.0:
-        fx /= magnitude
-        fy /= magnitude
-    
-    bot.update_movement(fx, fy)
+    if control_loop:
+        # Steering runs on the control thread at its own rate
+        control_loop.submit(detections, class_names, frame_time)
+        fx, fy = control_loop.stick
+    else:
+        # Update Pilot State and Calculate Force
+        pilot.update(detections, class_names, timestamp=frame_time)
+        fx, fy = pilot.get_force_vector(detections, class_names)
+        
+        # Normalize vector to ensure magnitude <= 1.0 (clamped)
+        magnitude = (fx**2 + fy**2)**0.5
+        if magnitude > 1.0:
+            fx /= magnitude
+            fy /= magnitude
+        
+        bot.update_movement(fx, fy, frame_time=frame_time)
     
     # Send Data to Visualizer
     pilot_state = {
@@ -0,0 +1,192 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from bot.knowledge_base.evolution_index import KnowledgeBase
+from bot.system.config import config
+from bot.system.logger import logger
+
+# Decision tiers, mirroring the LLM prompt's hierarchy
+TIER_EVOLUTION = 3
+TIER_CORE = 2
+TIER_FILL = 1
+
+@dataclass
+class _LevelUp:
+    recorded: bool = False # a path (worker or timeout) has been counted for this level-up
+
+@dataclass
+class PolicyDecision:
+    decision: Optional[Dict[str, Any]]
+    confidence: float
+    reason: str
+
+class LevelUpPolicy:
+    """
+    Rule-based fast path for level-ups. Decides locally when the answer is clear from the
+    recognised options and the inventory: completing an evolution pair, taking a core
+    item of the closest sample build, or filling empty slots early. Anything else is left
+    to the LLM (low confidence).
+    """
+    def __init__(self, kb: Optional[KnowledgeBase] = None):
+        self.kb = kb or KnowledgeBase()
+        # Evolution progress, synced to each decision's inventory (decisions may overlap)
+        self.evolutions = self.kb.tracker()
+        self._lock = threading.Lock()
+        self.avoid = set(config.get("policy.avoid_items", ["Skull O'Maniac"]))
+        self.fill_min_empty = config.get("policy.fill_min_empty_slots", 4)
+        self.confidence = {
+            TIER_EVOLUTION: config.get("policy.confidence.evolution", 0.95),
+            TIER_CORE: config.get("policy.confidence.core", 0.85),
+            TIER_FILL: config.get("policy.confidence.fill", 0.75),
+        }
+
+    def target_build(self, owned: set) -> Optional[Dict[str, Any]]:
+        """Sample build sharing the most items with the inventory (first one on ties)."""
+        if not self.kb.builds:
+            return None
+        return max(self.kb.builds, key=lambda b: len(b["core_items"] & owned))
+
+    def _tier(self, option: str, owned: set, weapons: List[str], passives: List[str],
+              build: Optional[Dict[str, Any]], max_weapons: int, max_passives: int) -> Tuple[int, str]:
+        item_type = self.kb.item_type(option)
+        if item_type is None or option in self.avoid:
+            return 0, ""
+        slots_left = (max_weapons - len(weapons)) if item_type == "weapon" else (max_passives - len(passives))
+        if option not in owned:
+            if slots_left <= 0:
+                return 0, ""
+            completed = self.evolutions.completes(option)
+            if completed:
+                freed = self.evolutions.slots_freed(option)
+                return TIER_EVOLUTION, f"completes {completed[0].name}" + (f", freeing {freed} weapon slot" if freed else "")
+        if build and option in build["core_items"]:
+            return TIER_CORE, f"core item of {build['build_name']}"
+        if option not in owned and slots_left >= self.fill_min_empty:
+            return TIER_FILL, f"fills one of {slots_left} empty {item_type} slots"
+        return 0, ""
+
+    def decide(self, options: Sequence[Optional[str]], weapons: List[str], passives: List[str],
+               max_weapons: int = 6, max_passives: int = 6) -> PolicyDecision:
+        """
+        options: recognised item names top to bottom (None where a card couldn't be read).
+        """
+        if not options:
+            return PolicyDecision(None, 0.0, "no recognised options")
+
+        owned = set(weapons) | set(passives)
+        build = self.target_build(owned)
+        with self._lock:
+            self.evolutions.sync(owned)
+            tiers = [self._tier(o, owned, weapons, passives, build, max_weapons, max_passives) if o else (0, "")
+                     for o in options]
+        best = max(t for t, _ in tiers)
+        if best == 0:
+            return PolicyDecision(None, 0.0, "no rule applies")
+
+        candidates = [i for i, (t, _) in enumerate(tiers) if t == best]
+        confidence = self.confidence[best]
+        if best < TIER_EVOLUTION and None in options:
+            # An unreadable card could hold an evolution piece
+            confidence *= 0.5
+        if best < TIER_EVOLUTION and len(candidates) > 1:
+            # Several equally good picks: the trade-off needs judgement
+            confidence *= 0.6
+
+        slot = candidates[0]
+        name = options[slot]
+        decision = {
+            "action": "select",
+            "slot": slot + 1,
+            "item_name": name,
+            "item_type": self.kb.item_type(name),
+            "reasoning": tiers[slot][1],
+        }
+        return PolicyDecision(decision, confidence, tiers[slot][1])
+
+class LevelUpDecider:
+    """
+    Local policy first, LLM when its confidence is below policy.min_confidence. Records
+    which path decided each level-up and how long it took. submit() runs the decision on
+    a worker so it overlaps with the menu inputs; fallback() answers when it is too slow.
+    """
+    def __init__(self, llm_client, policy: Optional[LevelUpPolicy] = None,
+                 options_provider: Optional[Callable[[Any], Optional[List[Optional[str]]]]] = None):
+        self.llm_client = llm_client
+        self.policy = policy or LevelUpPolicy()
+        self.options_provider = options_provider # frame_raw -> recognised option names
+        self.min_confidence = config.get("policy.min_confidence", 0.7)
+        self.enabled = config.get("policy.enabled", True)
+
+        self.timeout = config.get("policy.decision_timeout", 8.0)
+        self.fallback_action = config.get("policy.fallback_action", None)
+        self._executor = ThreadPoolExecutor(max_workers=config.get("policy.workers", 2), thread_name_prefix="LevelUpDecider")
+        self._guess: Optional[Dict[str, Any]] = None # Policy's low-confidence pick for the current level-up
+        self._current: Optional[_LevelUp] = None
+        self._stats_lock = threading.Lock()
+
+        self.path_counts = Counter()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+
+    def submit(self, frame_raw, pil_image, game_state) -> Future:
+        """Starts decide() on the worker; the Future resolves to the decision (or None)."""
+        self._guess = None
+        level_up = self._current = _LevelUp()
+        return self._executor.submit(self.decide, frame_raw, pil_image, game_state, level_up=level_up)
+
+    def fallback(self) -> Optional[Dict[str, Any]]:
+        """Decision used when the worker misses the timeout: the policy's best guess, else policy.fallback_action."""
+        self._record("timeout", None, self._current)
+        guess = self._guess or self.fallback_action
+        return dict(guess, source="fallback") if guess else None
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def decide(self, frame_raw, pil_image, game_state, options: Optional[Sequence[Optional[str]]] = None,
+               level_up: Optional[_LevelUp] = None) -> Optional[Dict[str, Any]]:
+        start = time.perf_counter()
+        if options is None and self.options_provider:
+            options = self.options_provider(frame_raw)
+
+        if self.enabled and options:
+            result = self.policy.decide(options, game_state.weapons, game_state.passives,
+                                        game_state.max_weapons, game_state.max_passives)
+            if result.decision and result.confidence >= self.min_confidence:
+                self._record("local", start, level_up)
+                logger.info(f"Local policy: {result.decision['item_name']} ({result.reason}, conf {result.confidence:.2f})")
+                return dict(result.decision, source="local")
+            logger.debug(f"Local policy escalating ({result.reason}, conf {result.confidence:.2f})")
+            self._guess = result.decision
+
+        decision = self.llm_client.get_decision(pil_image, game_state.to_json(), options=options or None)
+        source = decision.get("source", "llm") if decision else "llm_failed" # "cache" for cache hits
+        self._record(source, start, level_up)
+        return dict(decision, source=source) if decision else None
+
+    def _record(self, path: str, start: Optional[float], level_up: Optional[_LevelUp] = None):
+        """Counts one path per level-up: a worker that answers after the timeout isn't counted again."""
+        with self._stats_lock:
+            if level_up is not None:
+                if level_up.recorded:
+                    return
+                level_up.recorded = True
+            self.path_counts[path] += 1
+            if start is not None:
+                self.latencies[path].append(time.perf_counter() - start)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate of the local path and the LLM time it saved (estimated from the mean LLM latency)."""
+        total = sum(self.path_counts.values())
+        mean = {path: sum(v) / len(v) for path, v in self.latencies.items() if v}
+        llm_mean = mean.get("llm", 0.0)
+        return {
+            "decisions": total,
+            "paths": dict(self.path_counts),
+            "local_hit_rate": self.path_counts["local"] / total if total else 0.0,
+            "mean_latency_s": mean,
+            "latency_saved_s": self.path_counts["local"] * max(llm_mean - mean.get("local", 0.0), 0.0),
+        }
@@ -0,0 +1,109 @@
+import time
+import cv2
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from bot.system.config import config
+from bot.system.logger import logger
+from bot.vision.menu_cursor import MenuCursorDetector
+from bot.vision.screenshot import screenshot
+
+# (layout, target cell, press A when reached)
+Stage = Tuple[str, str, bool]
+
+class MenuNavigator:
+    """
+    Closed-loop menu navigation: reads the highlighted cell from the screen, sends the next
+    d-pad press on the minimal path to the target and waits until the move has visibly
+    registered before sending another. Starting from the observed cursor (not an assumed
+    top slot) makes stray gameplay inputs irrelevant.
+    """
+    def __init__(self, input_controller, game_area: dict, detector: Optional[MenuCursorDetector] = None,
+                 capture: Optional[Callable[[], np.ndarray]] = None):
+        self.input_controller = input_controller
+        self.game_area = game_area
+        self.detector = detector or MenuCursorDetector()
+        self.capture = capture or self._capture
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="MenuNavigator")
+
+        # Timing
+        self.tap_hold = config.get("menu.tap_hold", 0.05)
+        self.step_timeout = config.get("menu.step_timeout", 0.35) # wait for a press to register
+        self.appear_timeout = config.get("menu.appear_timeout", 2.0) # wait for the menu to settle
+        self.poll_interval = config.get("menu.poll_interval", 0.01)
+        self.max_presses = config.get("menu.max_presses", 20)
+
+    def _capture(self) -> np.ndarray:
+        return cv2.cvtColor(screenshot(self.game_area), cv2.COLOR_BGRA2BGR)
+
+    def has_layout(self, layout: str) -> bool:
+        return layout in self.detector.layouts
+
+    def submit(self, stages: Sequence[Stage], fallback_steps: Sequence = (), settle: float = 0.0) -> Future:
+        """
+        Runs the stages on the navigator thread. If the cursor can't be read on the first
+        stage, the blind fallback_steps macro is played instead. The Future resolves settle
+        seconds after the last input, so the closing menu isn't classified (and handled) again.
+        """
+        return self._executor.submit(self._run, list(stages), list(fallback_steps), settle)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, stages: List[Stage], fallback_steps: List, settle: float = 0.0) -> bool:
+        start = time.perf_counter()
+        for i, (layout, target, confirm) in enumerate(stages):
+            if not self.navigate(layout, target, confirm):
+                if i == 0 and fallback_steps:
+                    logger.warning(f"[Menu] Cursor not readable on '{layout}', falling back to blind inputs.")
+                    self.input_controller.sequence(fallback_steps).result()
+                else:
+                    logger.error(f"[Menu] Failed to reach '{target}' on '{layout}'.")
+                    self._settle(settle)
+                return False
+        logger.info(f"[Menu] Navigation done in {time.perf_counter() - start:.2f}s")
+        self._settle(settle)
+        return True
+
+    def _settle(self, seconds: float):
+        if seconds > 0:
+            self.input_controller.sequence([("wait", seconds)]).result()
+
+    def _wait_for_cursor(self, layout: str, timeout: float, not_cell: Optional[str] = None) -> Optional[str]:
+        """Polls frames until the cursor is readable (and, if given, has left not_cell)."""
+        deadline = time.perf_counter() + timeout
+        while True:
+            cell = self.detector.detect(self.capture(), layout)
+            if cell is not None and cell != not_cell:
+                return cell
+            if time.perf_counter() >= deadline:
+                return cell
+            time.sleep(self.poll_interval)
+
+    def navigate(self, layout: str, target: str, confirm: bool = True) -> bool:
+        menu = self.detector.layouts.get(layout)
+        if menu is None or target not in menu.positions:
+            return False
+
+        cell = self._wait_for_cursor(layout, self.appear_timeout)
+        presses = 0
+        while cell != target:
+            if cell is None or presses >= self.max_presses:
+                return False
+            path = menu.shortest_path(cell, target)
+            if not path:
+                return False
+
+            # One press at a time, each confirmed on screen before the next
+            self.input_controller.tap(path[0], hold=self.tap_hold, gap=0.0).result()
+            presses += 1
+            moved = self._wait_for_cursor(layout, self.step_timeout, not_cell=cell)
+            if moved is None:
+                return False
+            cell = moved # Re-plan from wherever the cursor actually is
+
+        if confirm:
+            self.input_controller.tap("A", hold=self.tap_hold, gap=0.0).result()
+        return True
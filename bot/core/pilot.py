@@ -1,108 +1,118 @@
 import math
 import random
+import time
 import numpy as np
 from typing import List, Tuple, Dict, Optional
 from bot.utils import Point
 from bot.vision.types import Detection
 
-from bot.system.config import config
+from bot.system.config import config, PilotSettings, Settings
 
 class Pilot:
     def __init__(self, screen_center: Point):
         self.center = screen_center
         
-        # Grid settings for Clustering
-        self.grid_cols = config.get("pilot.grid.cols", 4)
-        self.grid_rows = config.get("pilot.grid.rows", 3)
-        self.width = config.get("game.image_size")[0]
-        self.height = config.get("game.image_size")[1]
-        
         # State
         self.target_cluster_centroid: Optional[Point] = None
         self.target_bin: Optional[Tuple[int, int]] = None
         self.tick_counter = 0
 
+        # Tracking State (previous frame monster centers and their velocities, px/s)
+        self.monster_centers = np.empty((0, 2))
+        self.monster_velocities = np.empty((0, 2))
+        self.last_update_time: Optional[float] = None
+
+        # Weights (re-bound whenever config.yaml is hot-reloaded)
+        self.settings: Optional[PilotSettings] = None
+        self._bind_settings(config.snapshot)
+
+    def _bind_settings(self, snapshot: Settings):
+        s = snapshot.pilot
+        self.settings = s
+
+        # Grid settings for Clustering
+        self.grid_cols = s.grid_cols
+        self.grid_rows = s.grid_rows
+        self.width, self.height = snapshot.game.image_size
+
         # Weights
-        self.k_attract_target = config.get("pilot.forces.attract_target", 150.0)
-        self.k_attract_rune = config.get("pilot.forces.attract_rune", 10.0)
-        self.k_repel_monster = config.get("pilot.forces.repel_monster", 500.0)
-        self.repulsion_range = config.get("pilot.forces.repulsion_range", 100)
-        self.repulsion_cap = config.get("pilot.forces.repulsion_cap", 500.0)
+        self.k_attract_target = s.forces.attract_target
+        self.k_attract_rune = s.forces.attract_rune
+        self.k_repel_monster = s.forces.repel_monster
+        self.repulsion_range = s.forces.repulsion_range
+        self.repulsion_cap = s.forces.repulsion_cap
 
-        self.critical_repulsion_range = config.get("pilot.forces.critical_repulsion_range", 50)
+        self.critical_repulsion_range = s.forces.critical_repulsion_range
+        self.critical_boost = s.forces.critical_boost
 
-    def update(self, detections: List[Detection], class_names: Dict[int, str]):
+        # Predictive Repulsion (Time-to-Closest-Approach)
+        self.ttc_horizon = s.prediction.horizon # seconds to look ahead
+        self.ttc_tau = s.prediction.tau # urgency falloff (seconds)
+        self.max_match_distance = s.prediction.max_match_distance
+        self.max_frame_gap = s.prediction.max_frame_gap
+        self.max_monster_speed = s.prediction.max_monster_speed # px/s
+        self.velocity_smoothing = s.prediction.velocity_smoothing
+
+        # Sticky Target
+        self.sticky_min_runes = s.sticky_target.min_runes
+        self.sticky_multiplier = s.sticky_target.better_cluster_multiplier
+
+    def update(self, detections: List[Detection], class_names: Dict[int, str], timestamp: Optional[float] = None):
         """
         Updates internal state based on new frame detections.
+        timestamp: capture time of the frame (time.perf_counter()). Defaults to now.
         """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        snapshot = config.snapshot
+        if snapshot.pilot is not self.settings:
+            self._bind_settings(snapshot)
+        self._update_monster_tracks(detections, class_names, timestamp)
         self._update_target_cluster(detections, class_names)
 
-    def get_force_vector(self, detections: List[Detection], class_names: Dict[int, str]) -> Tuple[float, float]:
+    def get_force_vector(self, detections: List[Detection], class_names: Dict[int, str], lookahead: float = 0.0) -> Tuple[float, float]:
         """
         Calculates the force vector for movement.
+        Monster repulsion is weighted by predicted time-to-closest-approach, using the
+        velocities estimated in update().
+        lookahead: seconds since the detections were captured; monsters are advanced
+                   along their velocities by this much before computing forces.
         """
         fx, fy = 0.0, 0.0
-        
+        center = np.asarray(self.center, dtype=float)
+
+        monsters = _centers(detections, class_names, "monster")
+        velocities = self._velocities_for(monsters)
+        if lookahead > 0:
+            monsters = monsters + velocities * lookahead
+        offsets = center - monsters # Monster -> Player
+        dists = np.hypot(offsets[:, 0], offsets[:, 1])
+
         # Check for critical danger first
-        monsters = [x.position for x in detections if class_names[x.label] == "monster"]
-        in_critical_danger = False
-        
-        for monster_rect in monsters:
-            mx = (monster_rect[0] + monster_rect[2]) / 2
-            my = (monster_rect[1] + monster_rect[3]) / 2
-            dx = self.center[0] - mx
-            dy = self.center[1] - my
-            dist = math.sqrt(dx*dx + dy*dy)
-            
-            if dist < self.critical_repulsion_range:
-                in_critical_danger = True
-                break
-        
+        in_critical_danger = bool(np.any(dists < self.critical_repulsion_range))
+
         # 1. Attraction: Target Cluster (Only if safe)
         if not in_critical_danger and self.target_cluster_centroid:
             dx = self.target_cluster_centroid[0] - self.center[0]
             dy = self.target_cluster_centroid[1] - self.center[1]
             dist = math.sqrt(dx*dx + dy*dy)
-            
+
             if dist > 0:
                 fx += (dx / dist) * self.k_attract_target
                 fy += (dy / dist) * self.k_attract_target
 
         # 2. Attraction: Individual Runes (Only if safe)
         if not in_critical_danger:
-            runes = [x.position for x in detections if class_names[x.label] == "rune"]
-            for r_rect in runes:
-                rx = (r_rect[0] + r_rect[2]) / 2
-                ry = (r_rect[1] + r_rect[3]) / 2
-                dx = rx - self.center[0]
-                dy = ry - self.center[1]
-                dist = math.sqrt(dx*dx + dy*dy)
-                
-                if dist > 0:
-                    fx += (dx / dist) * self.k_attract_rune
-                    fy += (dy / dist) * self.k_attract_rune
-                
-        # 3. Repulsion: Monsters
-        
-        repel_fx, repel_fy = 0.0, 0.0
-        for monster_rect in monsters:
-            mx = (monster_rect[0] + monster_rect[2]) / 2
-            my = (monster_rect[1] + monster_rect[3]) / 2
-            
-            dx = self.center[0] - mx
-            dy = self.center[1] - my
-            dist = math.sqrt(dx*dx + dy*dy)
-            
-            if 0 < dist < self.repulsion_range:
-                # Linear falloff: 1.0 at dist=0, 0.0 at dist=range
-                force = self.k_repel_monster * (1 - (dist / self.repulsion_range))
-                
-                # Critical boost: If inside critical range, multiply force to ensure escape
-                if dist < self.critical_repulsion_range:
-                    force *= 2.0 
-                    
-                repel_fx += (dx / dist) * force
-                repel_fy += (dy / dist) * force
+            rune_offsets = _centers(detections, class_names, "rune") - center
+            rune_dists = np.hypot(rune_offsets[:, 0], rune_offsets[:, 1])
+            valid = rune_dists > 0
+            if np.any(valid):
+                pull = rune_offsets[valid] / rune_dists[valid, None] * self.k_attract_rune
+                fx += float(pull[:, 0].sum())
+                fy += float(pull[:, 1].sum())
+
+        # 3. Repulsion: Monsters (Predictive)
+        repel_fx, repel_fy = self._predictive_repulsion(velocities, offsets, dists)
 
         # Cap Repulsion
         repel_mag = math.sqrt(repel_fx**2 + repel_fy**2)
@@ -132,6 +142,90 @@ class Pilot:
 
         return fx, fy
 
+    def _predictive_repulsion(self, velocities: np.ndarray, offsets: np.ndarray, dists: np.ndarray) -> Tuple[float, float]:
+        """
+        Linear falloff repulsion on an *effective* distance.
+        For each monster the closest approach within the horizon is predicted from its velocity:
+            t* = clip((p . v) / |v|^2, 0, horizon),  d* = |p - v t*|
+        where p is the Monster -> Player offset. The effective distance blends the current
+        distance towards d* by urgency w = 1 / (1 + t* / tau), so a monster charging at us is
+        treated as closer (and pushes us sideways, away from its path) while one drifting
+        away keeps its plain distance-based force.
+        """
+        if len(offsets) == 0:
+            return 0.0, 0.0
+
+        speed_sq = np.einsum('ij,ij->i', velocities, velocities)
+        closing = np.einsum('ij,ij->i', offsets, velocities)
+
+        t_star = np.zeros_like(dists)
+        moving = speed_sq > 1e-6
+        t_star[moving] = np.clip(closing[moving] / speed_sq[moving], 0.0, self.ttc_horizon)
+
+        predicted = offsets - velocities * t_star[:, None]
+        predicted_dists = np.hypot(predicted[:, 0], predicted[:, 1])
+
+        urgency = np.where(t_star > 0, 1.0 / (1.0 + t_star / self.ttc_tau), 0.0)
+        effective_dists = dists - (dists - predicted_dists) * urgency
+
+        active = (dists > 0) & (effective_dists < self.repulsion_range)
+        if not np.any(active):
+            return 0.0, 0.0
+
+        # Direction: away from the monster now, bent towards "off its predicted path"
+        away_now = offsets[active] / dists[active, None]
+        away_later = np.divide(
+            predicted[active], predicted_dists[active, None],
+            out=away_now.copy(), where=predicted_dists[active, None] > 1e-6
+        )
+        w = urgency[active, None]
+        direction = away_now * (1 - w) + away_later * w
+        norms = np.hypot(direction[:, 0], direction[:, 1])
+        direction = np.divide(direction, norms[:, None], out=away_now.copy(), where=norms[:, None] > 1e-6)
+
+        # Linear falloff: 1.0 at dist=0, 0.0 at dist=range
+        force = self.k_repel_monster * (1 - (effective_dists[active] / self.repulsion_range))
+
+        # Critical boost: If inside critical range, multiply force to ensure escape
+        force = np.where(dists[active] < self.critical_repulsion_range, force * self.critical_boost, force)
+
+        repel = direction * force[:, None]
+        return float(repel[:, 0].sum()), float(repel[:, 1].sum())
+
+    def _velocities_for(self, monsters: np.ndarray) -> np.ndarray:
+        """Velocities tracked in update() for these monster centers (zeros if from another frame)."""
+        if self.monster_velocities.shape == monsters.shape and np.array_equal(self.monster_centers, monsters):
+            return self.monster_velocities
+        return np.zeros_like(monsters)
+
+    def _update_monster_tracks(self, detections: List[Detection], class_names: Dict[int, str], timestamp: float):
+        """
+        Estimates per-monster velocities by nearest-neighbour association with the previous frame.
+        Only monsters that could reach the repulsion range within the horizon are tracked.
+        """
+        monsters = _centers(detections, class_names, "monster")
+        velocities = np.zeros_like(monsters)
+
+        dt = None if self.last_update_time is None else timestamp - self.last_update_time
+        previous = self.monster_centers
+        if dt is not None and 0 < dt <= self.max_frame_gap and len(monsters) and len(previous):
+            center = np.asarray(self.center, dtype=float)
+            radius = self.repulsion_range + self.max_monster_speed * self.ttc_horizon
+            near = np.flatnonzero(np.hypot(*(monsters - center).T) < radius)
+
+            if len(near):
+                curr = monsters[near]
+                nearest, matched = _nearest_neighbours(curr, previous, self.max_match_distance)
+
+                raw = (curr[matched] - previous[nearest[matched]]) / dt
+                # Smooth with the matched track's previous estimate to damp detector jitter
+                prev_velocity = self.monster_velocities[nearest[matched]]
+                velocities[near[matched]] = self.velocity_smoothing * prev_velocity + (1 - self.velocity_smoothing) * raw
+
+        self.monster_centers = monsters
+        self.monster_velocities = velocities
+        self.last_update_time = timestamp
+
     def _update_target_cluster(self, detections: List[Detection], class_names: Dict[int, str]):
         """
         Internal logic to determine the "Best" cluster of gems.
@@ -166,11 +260,8 @@ class Pilot:
              p_r, p_c = self.target_bin
              current_target_count = bins[p_r, p_c]
              
-             min_runes = config.get("pilot.sticky_target.min_runes", 2)
-             multiplier = config.get("pilot.sticky_target.better_cluster_multiplier", 1.5)
-             
-             if current_target_count > min_runes:
-                 if max_runes > current_target_count * multiplier:
+             if current_target_count > self.sticky_min_runes:
+                 if max_runes > current_target_count * self.sticky_multiplier:
                      use_previous = False # Switch to better
                  else:
                      target_r, target_c = p_r, p_c
@@ -211,3 +302,49 @@ class Pilot:
             "target_bin": self.target_bin,
             "target_centroid": self.target_cluster_centroid
         }
+
+
+def _centers(detections: List[Detection], class_names: Dict[int, str], category: str) -> np.ndarray:
+    """(N, 2) array of box centers for detections of the given category."""
+    boxes = [x.position for x in detections if class_names[x.label] == category]
+    if not boxes:
+        return np.empty((0, 2))
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    return (boxes[:, :2] + boxes[:, 2:]) / 2
+
+
+def _nearest_neighbours(points: np.ndarray, candidates: np.ndarray, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For each point, index of the nearest candidate within radius (grid bucketed, no N x M matrix).
+    Returns (indices, matched) where matched is False for points with no candidate in range.
+    """
+    best_idx = np.zeros(len(points), dtype=np.intp)
+    best_dist = np.full(len(points), np.inf)
+    if len(candidates) == 0:
+        return best_idx, best_dist <= radius * radius
+
+    # Bucket candidates into radius-sized cells, sorted by cell key
+    cand_cells = np.floor(candidates / radius).astype(np.int64)
+    point_cells = np.floor(points / radius).astype(np.int64)
+    offset = min(cand_cells.min(), point_cells.min()) - 1
+    span = max(cand_cells.max(), point_cells.max()) - offset + 2
+    cand_keys = (cand_cells[:, 0] - offset) * span + (cand_cells[:, 1] - offset)
+    order = np.argsort(cand_keys, kind='stable')
+    sorted_keys = cand_keys[order]
+
+    # Scan the 3x3 neighbourhood of every point's cell
+    for ox in (-1, 0, 1):
+        for oy in (-1, 0, 1):
+            keys = (point_cells[:, 0] + ox - offset) * span + (point_cells[:, 1] + oy - offset)
+            lo = np.searchsorted(sorted_keys, keys, side='left')
+            counts = np.searchsorted(sorted_keys, keys, side='right') - lo
+            for j in range(int(counts.max())):
+                rows = np.flatnonzero(counts > j)
+                idx = order[lo[rows] + j]
+                diff = points[rows] - candidates[idx]
+                dist = np.einsum('ij,ij->i', diff, diff)
+                better = dist < best_dist[rows]
+                best_dist[rows[better]] = dist[better]
+                best_idx[rows[better]] = idx[better]
+
+    return best_idx, best_dist <= radius * radius
@@ -1,17 +1,44 @@
-import time
+import threading
 import cv2
+from concurrent.futures import Future
+from typing import Optional
 from PIL import Image
 
 from bot.system.config import config
 from bot.system.logger import logger
-from bot.vision.screenshot import screenshot
 from bot.input.input_controller import InputController
 
+# Seconds to let a menu close after its final input before the UI is classified again
+MENU_SETTLE = config.get("input.menu_settle", 0.5)
+# Seconds between the blind cursor reset and the decision inputs
+LEVEL_UP_SETTLE = config.get("input.level_up_settle", 2.0)
+
+# The blind macros start from the top option (the card column on the level-up menu). A
+# navigator that gives up may already have moved the cursor, so its fallback resets it first.
+LEVEL_UP_CURSOR_RESET = ["DPAD_LEFT"] + ["DPAD_UP"] * 4
+GUY_CURSOR_RESET = ["DPAD_UP"] * 6
+
 # --- Decision Execution Logic ---
 
-def execute_decision(bot: InputController, decision: dict):
+def _decision_stages(action: str, slot: int):
+    """Vision-confirmed navigation targets on the level-up menu for a decision."""
+    card = f"slot_{slot}"
+    if action == "select":
+        return [("level_up", card, True)]
+    if action in ("reroll", "skip"):
+        return [("level_up", action, True)]
+    if action == "banish":
+        # Enter Banish Mode, then confirm on the target card
+        return [("level_up", "banish", True), ("level_up", card, True)]
+    return []
+
+def execute_decision(bot: InputController, decision: dict, navigator=None) -> Optional[Future]:
+    """
+    Queues the menu inputs for a decision. Returns a Future resolved once they have played out.
+    With a navigator the cursor is tracked on screen; the blind d-pad macro below is the fallback.
+    """
     if not decision:
-        return
+        return None
 
     action = decision.get("action")
     slot = decision.get("slot", 1)
@@ -19,119 +46,154 @@ def execute_decision(bot: InputController, decision: dict):
     logger.info(f"Executing decision: {action} on slot {slot}")
     
     # Navigation Logic (Start Point: Slot 1 / Top-Left Option)
+    steps = []
     
     if action == "select":
         moves_down = slot - 1
-        for _ in range(moves_down):
-            bot.press_dpad_down()
-        bot.press_a()
+        steps += ["DPAD_DOWN"] * moves_down
+        steps += ["A"]
         
     elif action == "reroll":
-        bot.press_dpad_right()
-        bot.press_a()
+        steps += ["DPAD_RIGHT", "A"]
         
     elif action == "skip":
-        bot.press_dpad_right()
-        bot.press_dpad_down()
-        bot.press_a()
+        steps += ["DPAD_RIGHT", "DPAD_DOWN", "A"]
         
     elif action == "banish":
-        bot.press_dpad_right()
-        bot.press_dpad_down()
-        bot.press_dpad_down()
-        bot.press_a() # Enter Banish Mode
+        steps += ["DPAD_RIGHT", "DPAD_DOWN", "DPAD_DOWN"]
+        steps += ["A"] # Enter Banish Mode
         
-        bot.press_dpad_left()
-        for _ in range(6):
-            bot.press_dpad_up()
+        steps += ["DPAD_LEFT"]
+        steps += ["DPAD_UP"] * 6
         
         moves_down = slot - 1
-        for _ in range(moves_down):
-            bot.press_dpad_down()
+        steps += ["DPAD_DOWN"] * moves_down
             
-        bot.press_a() # Confirm Banish on target slot
+        steps += ["A"] # Confirm Banish on target slot
+
+    steps += [("wait", MENU_SETTLE)] # Let the menu close before the UI is classified again
+    
+    if navigator and navigator.has_layout("level_up"):
+        fallback_steps = LEVEL_UP_CURSOR_RESET + [("wait", MENU_SETTLE)] + steps
+        return navigator.submit(_decision_stages(action, slot), fallback_steps=fallback_steps, settle=MENU_SETTLE)
+    return bot.sequence(steps)
 
 # --- State Handlers ---
 
-def handle_revive(bot):
+def handle_revive(bot) -> Future:
     logger.info("Revive Detected! Opening...")
-    time.sleep(1) # Wait for animation start
-    bot.press_a()
-    time.sleep(.5)
+    # Wait for animation start
+    return bot.sequence([("wait", 1.0), "A", ("wait", MENU_SETTLE)])
 
-def handle_guy(bot):
+def handle_guy(bot, navigator=None) -> Future:
     logger.info("Guy Detected! navigating...")
-    time.sleep(.5)
-    bot.press_dpad_down()
-    time.sleep(.5)
-    bot.press_dpad_down()
-    time.sleep(.5)
-    bot.press_dpad_down()
-    time.sleep(.5)
-    bot.press_dpad_down()
-    time.sleep(.5)
-    bot.press_dpad_down()
-    time.sleep(.5)
-    bot.press_dpad_down()
-    time.sleep(.5)
-    bot.press_a()
-    time.sleep(.5)
+    steps = [("wait", .5)]
+    for _ in range(6):
+        steps += ["DPAD_DOWN", ("wait", .5)]
+    steps += ["A", ("wait", .5)]
+    
+    if navigator and navigator.has_layout("guy"):
+        target = config.get("menu.guy_target", "option_7")
+        return navigator.submit([("guy", target, True)], fallback_steps=GUY_CURSOR_RESET + steps, settle=.5)
+    return bot.sequence(steps)
 
-def handle_treasure_opening(bot, ui_detector, game_state, game_area):
+def handle_treasure_start(bot) -> Future:
     logger.info("Treasure Detected! Opening...")
-    time.sleep(1) # Wait for animation start
-    bot.press_a()
+    # Wait for animation start; the state machine picks up TREASURE_DONE when it appears
+    return bot.sequence([("wait", 1.0), "A"])
+
+def handle_treasure_done(bot, game_state, frame_raw) -> Future:
+    logger.info("Treasure Open Complete.")
     
-    # Wait for Treasure Done
-    start_wait = time.time()
-    while True:
-        if time.time() - start_wait > config.get("timeouts.treasure_open", 60):
-            logger.warning("Treasure opening timed out.")
-            break
-            
-        # Capture current raw frame for checking 'Done' state
-        curr_raw = screenshot(game_area)
-        curr_frame_raw = cv2.cvtColor(curr_raw, cv2.COLOR_BGRA2BGR)
-        
-        if ui_detector.detect_state(curr_frame_raw) == 'TREASURE_DONE':
-            logger.info("Treasure Open Complete.")
-            
-            # Process Result
-            frame_rgb = cv2.cvtColor(curr_frame_raw, cv2.COLOR_BGR2RGB)
-            pil_image = Image.fromarray(frame_rgb)
-            game_state.update_from_treasure(pil_image)
-            
-            time.sleep(1)
-            # Close Chest
-            bot.press_a()
-            time.sleep(1) # Wait for close animation
-            
-            break
-        
-        time.sleep(0.5)
+    # Process Result
+    frame_rgb = cv2.cvtColor(frame_raw, cv2.COLOR_BGR2RGB)
+    pil_image = Image.fromarray(frame_rgb)
+    game_state.update_from_treasure(pil_image)
+    
+    # Close Chest, then wait for close animation
+    return bot.sequence([("wait", 1.0), "A", ("wait", 1.0)])
+
+def _chain(source: Optional[Future], target: Future):
+    """Resolves target once source (the queued inputs) has played out."""
+    if source is None:
+        target.set_result(None)
+        return
+    def forward(f: Future):
+        if target.done(): # Dropped by the state machine's timeout
+            return
+        if f.cancelled():
+            target.cancel()
+        elif f.exception():
+            target.set_exception(f.exception())
+        else:
+            target.set_result(f.result())
+    source.add_done_callback(forward)
 
-def handle_level_up(bot, llm_client, game_state, frame_raw):
-    logger.info("Level Up detected! Pausing and consulting LLM...")
+def handle_level_up(bot, decider, game_state, frame_raw, navigator=None) -> Future:
+    """
+    Starts the decision on the decider's worker at the first LEVEL_UP frame, so it runs
+    while the cursor reset and settle play out. If it takes longer than
+    policy.decision_timeout the decider's fallback is used. Returns a Future resolved once
+    the decision's inputs have played out.
+    """
+    logger.info("Level Up detected! Pausing and deciding...")
     bot.stop_movement()
     
-    # [FIX] Reset cursor position (Input Bleed Bug)
-    # Spam UP to ensure we are at the top slot, in case gameplay inputs moved it down.
-    logger.debug("Resetting menu cursor...")
-    for _ in range(4):
-        bot.press_dpad_up()
-        time.sleep(0.1)
+    # The navigator reads the cursor from the screen, so it needs no reset or settle delay
+    vision_confirmed = navigator is not None and navigator.has_layout("level_up")
+    
+    cursor_reset = None
+    if not vision_confirmed:
+        # [FIX] Reset cursor position (Input Bleed Bug)
+        # Spam UP to ensure we are at the top slot, in case gameplay inputs moved it down.
+        logger.debug("Resetting menu cursor...")
+        cursor_reset = bot.sequence(["DPAD_UP"] * 4) # Plays out while the LLM is consulted
     
     # Convert frame to PIL for Gemini
     # OpenCV is BGR, PIL needs RGB
     frame_rgb = cv2.cvtColor(frame_raw, cv2.COLOR_BGR2RGB)
     pil_image = Image.fromarray(frame_rgb)
     
-    decision = llm_client.get_decision(pil_image, game_state.to_json())
+    # Local policy when the options are unambiguous, LLM otherwise
+    pending_decision = decider.submit(frame_raw, pil_image, game_state)
     
-    if decision:
-        time.sleep(2) # Wait for UI to settle (User requested 2s)
-
-        game_state.log_decision(decision)
-        execute_decision(bot, decision)
-    else:
-        logger.error("LLM failed to decide. Resuming manually (or stuck).")
+    if cursor_reset:
+        # Let the UI settle after the reset while the decision is being made
+        bot.sequence([("wait", LEVEL_UP_SETTLE)])
+    
+    done = Future()
+    lock = threading.Lock()
+    handled = []
+    
+    def finish(decision, source: str):
+        with lock:
+            if handled:
+                if source == "worker":
+                    logger.info(f"Late decision discarded: {decision}")
+                return
+            handled.append(source)
+        timer.cancel()
+        
+        # Runs in a Future callback or the timer thread, where an exception would be lost
+        # and done never resolved (the state machine would wait on it forever)
+        try:
+            if not decision:
+                logger.error("No level-up decision (LLM failed). Resuming manually (or stuck).")
+                done.set_result(None)
+                return
+            if source == "timeout":
+                logger.warning(f"Decision timed out after {decider.timeout}s, using fallback: {decision}")
+            game_state.log_decision(decision)
+            _chain(execute_decision(bot, decision, navigator), done)
+        except Exception as e:
+            logger.error(f"Level-up decision failed: {e}")
+            if not done.done():
+                done.set_result(None)
+    
+    timer = threading.Timer(decider.timeout, lambda: finish(decider.fallback(), "timeout"))
+    timer.daemon = True
+    pending_decision.add_done_callback(
+        lambda f: finish(None if f.cancelled() or f.exception() else f.result(), "worker")
+    )
+    timer.start()
+    return done
@@ -0,0 +1,153 @@
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from bot.system.config import config
+from bot.system.logger import logger
+
+# An action receives the frame that triggered it and may return a Future for the inputs
+# it queued; while that Future is pending no other (deferred) transition fires.
+Action = Callable[[Any], Optional[Future]]
+
+ANY = "*"
+
+@dataclass(frozen=True, slots=True)
+class StateSpec:
+    name: str
+    capture_hz: float = 0.0 # 0 = capture as fast as frames are processed
+    timeout: float = 0.0 # seconds in the state before it is re-entered, 0 = never
+    rearm: bool = True # once the entry inputs have played out, the next frame enters again
+    on_frame: Optional[str] = None # action run on every frame in this state
+
+@dataclass(frozen=True, slots=True)
+class Transition:
+    source: str
+    target: str
+    action: str
+    immediate: bool = False # fire even while earlier inputs are still playing out
+
+    def matches(self, source: Optional[str], target: str) -> bool:
+        return self.source in (ANY, source) and self.target in (ANY, target)
+
+DEFAULT_STATES = {
+    "GAMEPLAY": StateSpec("GAMEPLAY", on_frame="gameplay"),
+    "PAUSE": StateSpec("PAUSE", capture_hz=2.0),
+    "LEVEL_UP": StateSpec("LEVEL_UP", capture_hz=20.0, timeout=30.0),
+    "TREASURE_START": StateSpec("TREASURE_START", capture_hz=10.0, timeout=60.0, rearm=False),
+    "TREASURE_DONE": StateSpec("TREASURE_DONE", capture_hz=10.0, timeout=5.0, rearm=False),
+    "REVIVE": StateSpec("REVIVE", capture_hz=10.0, timeout=10.0),
+    "GUY": StateSpec("GUY", capture_hz=10.0, timeout=15.0),
+    "QUIT": StateSpec("QUIT"),
+}
+
+DEFAULT_TRANSITIONS = [
+    # Menus own the controller: stop steering as soon as one shows up
+    Transition("GAMEPLAY", ANY, "suspend_steering", immediate=True),
+    Transition(ANY, "LEVEL_UP", "level_up"),
+    Transition(ANY, "TREASURE_START", "open_treasure"),
+    Transition(ANY, "TREASURE_DONE", "collect_treasure"),
+    Transition(ANY, "REVIVE", "revive"),
+    Transition(ANY, "GUY", "guy"),
+    Transition(ANY, "QUIT", "quit"),
+]
+
+def load_states(raw: Optional[dict] = None) -> Dict[str, StateSpec]:
+    """Default state table overlaid with the ui_flow.states section of config.yaml."""
+    raw = config.get("ui_flow.states", {}) if raw is None else raw
+    states = dict(DEFAULT_STATES)
+    for name, fields in (raw or {}).items():
+        name = name.upper()
+        base = states.get(name, StateSpec(name))
+        states[name] = StateSpec(
+            name,
+            capture_hz=float(fields.get("capture_hz", base.capture_hz)),
+            timeout=float(fields.get("timeout", base.timeout)),
+            rearm=bool(fields.get("rearm", base.rearm)),
+            on_frame=fields.get("on_frame", base.on_frame),
+        )
+    return states
+
+class UIStateMachine:
+    """
+    Declarative UI flow. Each frame's classified state is fed to step(); a transition's
+    action fires on the first frame the new state appears rather than after a fixed sleep.
+    States set their own capture rate (idle screens are throttled) and a timeout after
+    which the state is re-entered, e.g. to press A again on a stuck chest.
+    """
+    def __init__(self, actions: Dict[str, Action], states: Optional[Dict[str, StateSpec]] = None,
+                 transitions: Optional[Iterable[Transition]] = None):
+        self.actions = actions
+        self.states = states if states is not None else load_states()
+        self.transitions: List[Transition] = list(transitions if transitions is not None else DEFAULT_TRANSITIONS)
+
+        for t in self.transitions:
+            if t.action not in actions:
+                raise ValueError(f"Transition {t.source} -> {t.target} uses unknown action '{t.action}'")
+
+        self.current: Optional[str] = None # State whose entry has been handled (None = armed)
+        self.observed: Optional[str] = None # State seen on the latest frame
+        self.entered_at = 0.0
+        self.pending: Optional[Future] = None
+        self.transition_count = 0
+
+    def spec(self, state: Optional[str]) -> StateSpec:
+        return self.states.get(state) or StateSpec(state or "")
+
+    def capture_interval(self) -> float:
+        """Seconds between captures in the currently observed state."""
+        hz = self.spec(self.observed).capture_hz
+        return 1.0 / hz if hz > 0 else 0.0
+
+    def busy(self) -> bool:
+        return self.pending is not None and not self.pending.done()
+
+    def step(self, ui_state: str, frame=None, now: Optional[float] = None):
+        now = time.perf_counter() if now is None else now
+
+        if self.pending is not None and self.pending.done():
+            self.pending = None
+            if self.spec(self.current).rearm:
+                # The menu may still be up (e.g. back-to-back level-ups): handle it again
+                self.current = None
+
+        if self.busy():
+            # A handler whose Future never resolves would otherwise hold the state forever
+            timeout = self.spec(self.current).timeout
+            if timeout and now - self.entered_at > timeout:
+                logger.warning(f"{self.current} inputs still pending after {timeout:.0f}s, dropping them and re-entering.")
+                self.pending.cancel()
+                self.pending = None
+                self.current = None
+
+        if ui_state != self.observed:
+            if ui_state not in self.states:
+                logger.warning(f"Unknown UI State: {ui_state}")
+            self._fire(self.observed, ui_state, frame, immediate=True)
+            self.observed = ui_state
+
+        if not self.busy():
+            if ui_state != self.current:
+                logger.debug(f"UI transition: {self.current} -> {ui_state}")
+                source, self.current, self.entered_at = self.current, ui_state, now
+                self.transition_count += 1
+                self._fire(source, ui_state, frame, immediate=False)
+            else:
+                timeout = self.spec(ui_state).timeout
+                if timeout and now - self.entered_at > timeout:
+                    logger.warning(f"{ui_state} timed out after {timeout:.0f}s, re-entering.")
+                    self.current = None
+
+        on_frame = self.spec(ui_state).on_frame
+        if on_frame:
+            self._run(on_frame, frame)
+
+    def _fire(self, source: Optional[str], target: str, frame, immediate: bool):
+        for t in self.transitions:
+            if t.immediate == immediate and t.matches(source, target):
+                self._run(t.action, frame)
+
+    def _run(self, name: str, frame):
+        result = self.actions[name](frame)
+        if isinstance(result, Future):
+            self.pending = result
@@ -0,0 +1,220 @@
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from bot.system.logger import logger
+
+BUTTON_NAMES = ("A", "B", "DPAD_UP", "DPAD_DOWN", "DPAD_LEFT", "DPAD_RIGHT")
+
+class GamepadBackend:
+    """
+    Minimal virtual gamepad interface used by InputController.
+    State changes (press/release/stick) are buffered until flush(), which sends one report.
+    """
+    name = "base"
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Blocks until the OS sees the device (or timeout). Returns True if it is ready."""
+        return True
+
+    def press(self, button: str):
+        raise NotImplementedError
+
+    def release(self, button: str):
+        raise NotImplementedError
+
+    def set_left_stick(self, x: int, y: int):
+        raise NotImplementedError
+
+    def reset(self):
+        raise NotImplementedError
+
+    def flush(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class VGamepadBackend(GamepadBackend):
+    """Xbox 360 pad through ViGEmBus (Windows)."""
+    name = "vgamepad"
+
+    def __init__(self):
+        import vgamepad as vg
+        self._buttons = {
+            "A": vg.XUSB_BUTTON.XUSB_GAMEPAD_A,
+            "B": vg.XUSB_BUTTON.XUSB_GAMEPAD_B,
+            "DPAD_UP": vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP,
+            "DPAD_DOWN": vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN,
+            "DPAD_LEFT": vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT,
+            "DPAD_RIGHT": vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT,
+        }
+        self._slots_before = _xinput_connected_slots()
+        self.gamepad = vg.VX360Gamepad()
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Polls XInput until a new controller slot appears for our pad."""
+        if self._slots_before is None:
+            # XInput not available: fall back to a fixed wait
+            time.sleep(timeout)
+            return True
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if _xinput_connected_slots() - self._slots_before:
+                return True
+            time.sleep(0.05)
+        return False
+
+    def press(self, button: str):
+        self.gamepad.press_button(button=self._buttons[button])
+
+    def release(self, button: str):
+        self.gamepad.release_button(button=self._buttons[button])
+
+    def set_left_stick(self, x: int, y: int):
+        self.gamepad.left_joystick(x_value=x, y_value=y)
+
+    def reset(self):
+        self.gamepad.reset()
+
+    def flush(self):
+        self.gamepad.update()
+
+def _xinput_connected_slots() -> Optional[set]:
+    """Indices of connected XInput controllers, or None if XInput can't be queried."""
+    try:
+        import ctypes
+
+        class XINPUT_GAMEPAD(ctypes.Structure):
+            _fields_ = [("wButtons", ctypes.c_ushort), ("bLeftTrigger", ctypes.c_ubyte), ("bRightTrigger", ctypes.c_ubyte),
+                        ("sThumbLX", ctypes.c_short), ("sThumbLY", ctypes.c_short),
+                        ("sThumbRX", ctypes.c_short), ("sThumbRY", ctypes.c_short)]
+
+        class XINPUT_STATE(ctypes.Structure):
+            _fields_ = [("dwPacketNumber", ctypes.c_uint), ("Gamepad", XINPUT_GAMEPAD)]
+
+        xinput = ctypes.windll.xinput1_4
+    except (ImportError, AttributeError, OSError):
+        return None
+
+    state = XINPUT_STATE()
+    return {i for i in range(4) if xinput.XInputGetState(i, ctypes.byref(state)) == 0}
+
+class MemoryBackend(GamepadBackend):
+    """
+    Pure in-memory pad: keeps the current state and timestamps every change and every
+    flushed report. Used for tests and for measuring the input pipeline on any OS.
+    """
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.buttons: Dict[str, bool] = {b: False for b in BUTTON_NAMES}
+        self.stick: Tuple[int, int] = (0, 0)
+        # (perf_counter, kind, value)
+        self.events: List[Tuple[float, str, object]] = []
+        self.reports: List[Tuple[float, Tuple[int, int], Tuple[str, ...]]] = []
+
+    def _record(self, kind: str, value):
+        self.events.append((time.perf_counter(), kind, value))
+
+    def press(self, button: str):
+        with self._lock:
+            self.buttons[button] = True
+            self._record("press", button)
+
+    def release(self, button: str):
+        with self._lock:
+            self.buttons[button] = False
+            self._record("release", button)
+
+    def set_left_stick(self, x: int, y: int):
+        with self._lock:
+            self.stick = (x, y)
+            self._record("stick", (x, y))
+
+    def reset(self):
+        with self._lock:
+            self.buttons = {b: False for b in BUTTON_NAMES}
+            self.stick = (0, 0)
+            self._record("reset", None)
+
+    def flush(self):
+        with self._lock:
+            pressed = tuple(b for b, down in self.buttons.items() if down)
+            self.reports.append((time.perf_counter(), self.stick, pressed))
+
+    def events_of(self, kind: str) -> List[Tuple[float, object]]:
+        with self._lock:
+            return [(t, v) for t, k, v in self.events if k == kind]
+
+class UInputBackend(GamepadBackend):
+    """Linux virtual gamepad through /dev/uinput (requires python-evdev and write access)."""
+    name = "uinput"
+
+    def __init__(self):
+        from evdev import AbsInfo, UInput, ecodes
+        self._ecodes = ecodes
+        self._buttons = {
+            "A": ecodes.BTN_A,
+            "B": ecodes.BTN_B,
+            "DPAD_UP": ecodes.BTN_DPAD_UP,
+            "DPAD_DOWN": ecodes.BTN_DPAD_DOWN,
+            "DPAD_LEFT": ecodes.BTN_DPAD_LEFT,
+            "DPAD_RIGHT": ecodes.BTN_DPAD_RIGHT,
+        }
+        axis = AbsInfo(value=0, min=-32768, max=32767, fuzz=16, flat=128, resolution=0)
+        capabilities = {
+            ecodes.EV_KEY: list(self._buttons.values()),
+            ecodes.EV_ABS: [(ecodes.ABS_X, axis), (ecodes.ABS_Y, axis)],
+        }
+        # Same name as the Xbox 360 pad so SDL/Steam pick a standard mapping
+        self.device = UInput(capabilities, name="Microsoft X-Box 360 pad", vendor=0x045E, product=0x028E)
+        self._pending: List[Tuple[int, int, int]] = []
+
+    def wait_ready(self, timeout: float) -> bool:
+        import os
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if self.device.device and os.path.exists(self.device.device.path):
+                return True
+            time.sleep(0.05)
+        return False
+
+    def press(self, button: str):
+        self._pending.append((self._ecodes.EV_KEY, self._buttons[button], 1))
+
+    def release(self, button: str):
+        self._pending.append((self._ecodes.EV_KEY, self._buttons[button], 0))
+
+    def set_left_stick(self, x: int, y: int):
+        # XInput's Y axis points up, evdev's points down
+        self._pending.append((self._ecodes.EV_ABS, self._ecodes.ABS_X, x))
+        self._pending.append((self._ecodes.EV_ABS, self._ecodes.ABS_Y, -y - 1))
+
+    def reset(self):
+        for code in self._buttons.values():
+            self._pending.append((self._ecodes.EV_KEY, code, 0))
+        self._pending.append((self._ecodes.EV_ABS, self._ecodes.ABS_X, 0))
+        self._pending.append((self._ecodes.EV_ABS, self._ecodes.ABS_Y, 0))
+
+    def flush(self):
+        for event in self._pending:
+            self.device.write(*event)
+        self._pending.clear()
+        self.device.syn()
+
+    def close(self):
+        self.device.close()
+
+BACKENDS = {
+    "vgamepad": VGamepadBackend,
+    "memory": MemoryBackend,
+    "uinput": UInputBackend,
+}
+
+def create_backend(name: str) -> GamepadBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown input backend '{name}' (expected one of {sorted(BACKENDS)})")
+    logger.info(f"Creating {name} gamepad backend...")
+    return BACKENDS[name]()
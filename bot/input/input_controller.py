@@ -1,19 +1,77 @@
+import heapq
+import itertools
+import threading
 import time
-import vgamepad as vg
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from bot.input.backends import BUTTON_NAMES, GamepadBackend, create_backend
+from bot.system.config import config
 from bot.system.logger import logger
 
+# A macro step is a button name to tap, or ("wait", seconds)
+Step = Union[str, Tuple[str, float]]
+
 class InputController:
-    def __init__(self):
+    """
+    Virtual gamepad driven by a dedicated input thread.
+
+    Button taps and macros are scheduled on a timed command queue with precise
+    press/release durations and return a Future that resolves once they have played
+    out, so callers never block on input. Stick updates are coalesced: only the latest
+    value is sent on each driver tick.
+    The pad itself is a GamepadBackend (input.backend: vgamepad, uinput or memory).
+    """
+    def __init__(self, backend: Optional[GamepadBackend] = None):
         logger.info("Creating virtual gamepad... (Drivers initializing)")
-        self.gamepad = vg.VX360Gamepad()
-        time.sleep(3) # Wait for driver to connect
-        logger.info("Virtual gamepad ready.")
-    
-    def update_movement(self, fx: float, fy: float):
+        self.gamepad = backend or create_backend(config.get("input.backend", "vgamepad"))
+        ready_timeout = config.get("input.ready_timeout", 3.0)
+        start = time.perf_counter()
+        if self.gamepad.wait_ready(ready_timeout): # Poll for the driver instead of a fixed sleep
+            logger.info(f"Virtual gamepad ready ({self.gamepad.name}, {time.perf_counter() - start:.2f}s).")
+        else:
+            logger.warning(f"Virtual gamepad not confirmed by the OS after {ready_timeout}s, continuing anyway.")
+
+        # Timing
+        self.tap_hold = config.get("input.tap_hold", 0.3) # seconds a button stays pressed
+        self.tap_gap = config.get("input.tap_gap", 0.3) # seconds released before the next tap
+        self.tick = 1.0 / config.get("input.driver_hz", 250)
+
+        # Command Queue: (due, seq, action, future)
+        self._queue: List[Tuple[float, int, Callable[[], None], Optional[Future]]] = []
+        self._seq = itertools.count()
+        self._cursor = 0.0 # When the last scheduled macro finishes
+        self._cond = threading.Condition()
+
+        # Coalesced Stick State
+        self._stick: Optional[Tuple[int, int]] = None # Pending value, None if already sent
+        self._stick_frame_time: Optional[float] = None # Capture time of the frame behind it
+        self._sent_stick: Tuple[int, int] = (0, 0)
+
+        # Metrics
+        self._started = time.perf_counter()
+        self.stick_requests = 0
+        self.stick_sent = 0
+        self.commands_executed = 0
+        self.reports_sent = 0
+        self.latencies = deque(maxlen=1000) # frame capture -> stick sent (seconds)
+
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._driver, name="InputDriver", daemon=True)
+        self._thread.start()
+
+    # --- Movement ---
+
+    def update_movement(self, fx: float, fy: float, frame_time: Optional[float] = None):
         """
         Updates the virtual controller stick position based on a normalized force vector.
         fx, fy: floats roughly in range [-1.0, 1.0] (clamped to 1.0 magnitude outside if needed, 
                 but we clamp to integer range here).
+        Coalesced: the value is sent on the next driver tick, superseding any unsent one.
+        frame_time: perf_counter capture time of the frame this is based on (latency stats).
         """
         # NitroGen / vgamepad scaling logic
         # Max integer value for joystick
@@ -35,54 +93,154 @@ class InputController:
         # Clamp again after inversion just to be safe, though math should hold
         y_val_converted = max(-32768, min(32767, y_val_converted))
 
-        self.gamepad.left_joystick(x_value=x_val, y_value=y_val_converted)
-        self.gamepad.update()
+        with self._cond:
+            self._stick = (x_val, y_val_converted)
+            self._stick_frame_time = frame_time
+            self.stick_requests += 1
 
     def stop_movement(self):
-        self.gamepad.reset()
-        self.gamepad.update()
+        """Centers the stick immediately (pending stick updates are dropped)."""
+        with self._cond:
+            self._stick = None
+            self._sent_stick = (0, 0)
+            self.gamepad.set_left_stick(0, 0)
+            self.gamepad.flush()
+
+    # --- Buttons & Macros ---
+
+    def tap(self, button: str, hold: Optional[float] = None, gap: Optional[float] = None) -> Future:
+        """Schedules a press/release of a button after any queued macros."""
+        return self.sequence([button], hold=hold, gap=gap)
+
+    def sequence(self, steps: Sequence[Step], hold: Optional[float] = None, gap: Optional[float] = None) -> Future:
+        """
+        Schedules a macro after any queued macros, e.g. ["DPAD_DOWN", "A", ("wait", 0.5)].
+        Returns a Future resolved when its last step has played out.
+        """
+        hold = self.tap_hold if hold is None else hold
+        gap = self.tap_gap if gap is None else gap
+        future: Future = Future()
+
+        with self._cond:
+            t = max(time.perf_counter(), self._cursor)
+            for step in steps:
+                if isinstance(step, tuple):
+                    _, duration = step
+                    t += duration
+                    continue
+                if step not in BUTTON_NAMES:
+                    raise ValueError(f"Unknown button '{step}'")
+                self._push(t, lambda b=step: self.gamepad.press(b))
+                self._push(t + hold, lambda b=step: self.gamepad.release(b))
+                t += hold + gap
+            self._push(t, None, future)
+            self._cursor = t
+            self._cond.notify()
+        return future
 
-    def press_a(self):
+    def cancel_all(self):
+        """Drops every queued command and releases all buttons."""
+        with self._cond:
+            for _, _, _, future in self._queue:
+                if future:
+                    future.cancel()
+            self._queue.clear()
+            self._cursor = 0.0
+            self._stick = None
+            self.gamepad.reset()
+            self.gamepad.flush()
+
+    def is_busy(self) -> bool:
+        with self._cond:
+            return bool(self._queue)
+
+    def close(self):
+        self.cancel_all()
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify()
+        self._thread.join(timeout=1.0)
+        self.gamepad.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Command rate, stick coalescing efficiency and frame -> stick latency."""
+        with self._cond:
+            elapsed = max(time.perf_counter() - self._started, 1e-9)
+            latencies = np.array(self.latencies) * 1000 if self.latencies else None
+            return {
+                "commands_per_s": self.commands_executed / elapsed,
+                "reports_per_s": self.reports_sent / elapsed,
+                "stick_requests": self.stick_requests,
+                "stick_sent": self.stick_sent,
+                # Share of stick requests that were superseded before being sent
+                "coalescing_efficiency": 1 - self.stick_sent / self.stick_requests if self.stick_requests else 0.0,
+                "latency_ms_p50": float(np.percentile(latencies, 50)) if latencies is not None else None,
+                "latency_ms_p95": float(np.percentile(latencies, 95)) if latencies is not None else None,
+            }
+
+    def press_a(self) -> Future:
         """Presses and releases the A button."""
-        self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_A)
-        self.gamepad.update()
-        time.sleep(0.3)
-        self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_A)
-        self.gamepad.update()
-        time.sleep(0.3)
-
-    def press_dpad_up(self):
+        return self.tap("A")
+
+    def press_dpad_up(self) -> Future:
         """Presses and releases D-pad Up."""
-        self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP)
-        self.gamepad.update()
-        time.sleep(0.3)
-        self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_UP)
-        self.gamepad.update()
-        time.sleep(0.3)
-
-    def press_dpad_down(self):
+        return self.tap("DPAD_UP")
+
+    def press_dpad_down(self) -> Future:
         """Presses and releases D-pad Down."""
-        self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN)
-        self.gamepad.update()
-        time.sleep(0.3)
-        self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_DOWN)
-        self.gamepad.update()
-        time.sleep(0.3)
-
-    def press_dpad_left(self):
+        return self.tap("DPAD_DOWN")
+
+    def press_dpad_left(self) -> Future:
         """Presses and releases D-pad Left."""
-        self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT)
-        self.gamepad.update()
-        time.sleep(0.3)
-        self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_LEFT)
-        self.gamepad.update()
-        time.sleep(0.3)
-
-    def press_dpad_right(self):
+        return self.tap("DPAD_LEFT")
+
+    def press_dpad_right(self) -> Future:
         """Presses and releases D-pad Right."""
-        self.gamepad.press_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT)
-        self.gamepad.update()
-        time.sleep(0.3)
-        self.gamepad.release_button(button=vg.XUSB_BUTTON.XUSB_GAMEPAD_DPAD_RIGHT)
-        self.gamepad.update()
-        time.sleep(0.3)
+        return self.tap("DPAD_RIGHT")
+
+    # --- Driver Thread ---
+
+    def _push(self, due: float, action: Optional[Callable[[], None]], future: Optional[Future] = None):
+        heapq.heappush(self._queue, (due, next(self._seq), action, future))
+
+    def _driver(self):
+        while not self._stop_event.is_set():
+            with self._cond:
+                now = time.perf_counter()
+                dirty = False
+                futures = []
+
+                # Run every command that is due
+                while self._queue and self._queue[0][0] <= now:
+                    _, _, action, future = heapq.heappop(self._queue)
+                    if action:
+                        action()
+                        self.commands_executed += 1
+                        dirty = True
+                    if future:
+                        futures.append(future)
+
+                # Coalesced stick: only the latest value goes out
+                if self._stick is not None:
+                    if self._stick != self._sent_stick:
+                        self.gamepad.set_left_stick(*self._stick)
+                        self._sent_stick = self._stick
+                        self.stick_sent += 1
+                        dirty = True
+                        if self._stick_frame_time is not None:
+                            self.latencies.append(now - self._stick_frame_time)
+                    self._stick = None
+
+                if dirty:
+                    self.gamepad.flush()
+                    self.reports_sent += 1
+
+                # Sleep until the next command or tick
+                timeout = self.tick
+                if self._queue:
+                    timeout = min(timeout, max(0.0, self._queue[0][0] - time.perf_counter()))
+                self._cond.wait(timeout)
+
+            for future in futures:
+                if future.set_running_or_notify_cancel():
+                    future.set_result(None)
@@ -0,0 +1,140 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Optional, Set
+
+if TYPE_CHECKING:
+    from bot.knowledge_base.evolution_index import Evolution
+
+@dataclass(frozen=True, slots=True)
+class Recipe:
+    evolution: "Evolution"
+    weapons: FrozenSet[str] # weapon components; more than one makes it a union
+    slots_freed: int # weapon slots given back when the components merge
+
+class EvolutionGraph:
+    """
+    Evolutions and unions as hyperedges from their components (base weapons plus required
+    items) to the result. Static: built once per knowledge base; EvolutionTracker keeps
+    the per-inventory state.
+    """
+    def __init__(self, evolutions: Iterable["Evolution"], item_types: Dict[str, str]):
+        self.recipes: List[Recipe] = []
+        self.by_item: Dict[str, List[int]] = defaultdict(list) # component -> recipe ids
+        self.by_result: Dict[str, List[int]] = defaultdict(list)
+        for evolution in evolutions:
+            weapons = frozenset(c for c in evolution.components if item_types.get(c) == "weapon")
+            i = len(self.recipes)
+            self.recipes.append(Recipe(evolution, weapons, max(len(weapons) - 1, 0)))
+            for component in evolution.components:
+                self.by_item[component].append(i)
+            self.by_result[evolution.name].append(i)
+
+    def tracker(self, items: Iterable[str] = ()) -> "EvolutionTracker":
+        tracker = EvolutionTracker(self)
+        for item in items:
+            tracker.add(item)
+        return tracker
+
+class EvolutionTracker:
+    """
+    Evolution progress for one inventory, updated in O(degree) per item added or
+    removed, so every query below is a dict lookup:
+
+    - completes(item): evolutions the item would finish (everything else already owned)
+    - one_away(): evolutions missing exactly one item, and which
+    - slots_freed(item): weapon slots the unions it completes would give back
+    - is_dead_end(item): the item advances no evolution whose result isn't owned yet
+    - ready(): evolutions with every component owned (waiting on max level or a chest)
+
+    sync() diffs a weapons/passives snapshot against the tracked inventory, so a caller
+    that only sees lists (the policy, the prompt builder) still pays only for changes.
+    """
+    def __init__(self, graph: EvolutionGraph):
+        self.graph = graph
+        self.owned: Set[str] = set()
+        self.missing: List[int] = [len(r.evolution.components) for r in graph.recipes]
+        self._done: List[bool] = [False] * len(graph.recipes) # result already owned
+        self._completers: Dict[str, Set[int]] = defaultdict(set) # missing item -> one-away recipes
+        self._one_away: Dict[int, str] = {}
+        self._ready: Set[int] = set()
+        for i, missing in enumerate(self.missing):
+            if missing <= 1: # Single-component recipes start one away
+                self._refresh(i)
+
+    def _missing_item(self, i: int) -> Optional[str]:
+        for component in self.graph.recipes[i].evolution.components:
+            if component not in self.owned:
+                return component
+        return None
+
+    def _refresh(self, i: int):
+        """Re-files recipe i after its missing count or done flag changed."""
+        previous = self._one_away.pop(i, None)
+        if previous is not None:
+            self._completers[previous].discard(i)
+            if not self._completers[previous]:
+                del self._completers[previous]
+        self._ready.discard(i)
+        if self._done[i]:
+            return
+        if self.missing[i] == 1:
+            item = self._missing_item(i)
+            self._one_away[i] = item
+            self._completers[item].add(i)
+        elif self.missing[i] == 0:
+            self._ready.add(i)
+
+    def add(self, item: str):
+        if not item or item in self.owned:
+            return
+        self.owned.add(item)
+        for i in self.graph.by_item.get(item, ()):
+            self.missing[i] -= 1
+            self._refresh(i)
+        for i in self.graph.by_result.get(item, ()):
+            self._done[i] = True
+            self._refresh(i)
+
+    def remove(self, item: str):
+        if item not in self.owned:
+            return
+        self.owned.discard(item)
+        for i in self.graph.by_item.get(item, ()):
+            self.missing[i] += 1
+            self._refresh(i)
+        for i in self.graph.by_result.get(item, ()):
+            self._done[i] = False
+            self._refresh(i)
+
+    def sync(self, items: Iterable[str]):
+        items = set(items)
+        for item in self.owned - items:
+            self.remove(item)
+        for item in items - self.owned:
+            self.add(item)
+
+    # Queries
+
+    def completes(self, item: str) -> List["Evolution"]:
+        return [self.graph.recipes[i].evolution for i in sorted(self._completers.get(item, ()))]
+
+    def slots_freed(self, item: str) -> int:
+        return sum(self.graph.recipes[i].slots_freed for i in self._completers.get(item, ()))
+
+    def one_away(self, min_owned: int = 1) -> Dict[str, str]:
+        """Evolution name -> the item still missing, for evolutions with min_owned components in hand."""
+        recipes = self.graph.recipes
+        return {recipes[i].evolution.name: item for i, item in sorted(self._one_away.items())
+                if len(recipes[i].evolution.components) - 1 >= min_owned}
+
+    def ready(self) -> List["Evolution"]:
+        return [self.graph.recipes[i].evolution for i in sorted(self._ready)]
+
+    def progress(self, item: str) -> int:
+        """Open evolutions the item is a missing component of."""
+        if item in self.owned:
+            return 0
+        return sum(1 for i in self.graph.by_item.get(item, ()) if not self._done[i])
+
+    def is_dead_end(self, item: str) -> bool:
+        return all(self._done[i] for i in self.graph.by_item.get(item, ()))
@@ -0,0 +1,116 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from bot.knowledge_base.evolution_graph import EvolutionGraph, EvolutionTracker
+from bot.knowledge_base.kb_artifact import KBArtifact, load_artifact
+from bot.knowledge_base.name_index import NameIndex
+from bot.system.logger import logger
+
+@dataclass(frozen=True, slots=True)
+class Evolution:
+    name: str
+    components: FrozenSet[str] # base weapon(s) plus required items
+    max_level: bool # base weapon must be maxed first
+
+class KnowledgeBase:
+    """
+    items.json, evolutions.json and sample_strategy.json in the shapes the policy and the
+    LLM prompt need, queried in place from the compiled artifact (kb_artifact.py) that
+    every process maps instead of parsing the JSON. item_types, evolution_rows and
+    rows_by_item are read-only views of its tables; every evolution/union row is indexed
+    by each item it mentions (base weapons, requirements and the result). names resolves
+    free-form item names, evolved forms to their base; graph/tracker() answer evolution
+    progress for an inventory. The derived structures are built on first use.
+    """
+    def __init__(self, kb_dir: Optional[str] = None, artifact: Optional[KBArtifact] = None):
+        self.artifact = artifact or load_artifact(kb_dir)
+        self.item_types: Mapping[str, str] = self.artifact.item_types()
+        self.evolution_rows: Sequence[Dict[str, str]] = self.artifact.rows()
+        self.rows_by_item: Mapping[str, List[int]] = self.artifact.rows_by_item()
+        self._builds: Optional[List[Dict[str, Any]]] = None
+        self._evolutions: Optional[List[Evolution]] = None
+        self._evolves_from: Optional[Dict[str, List[str]]] = None
+        self._names: Optional[NameIndex] = None
+        self._graph: Optional[EvolutionGraph] = None
+
+    @property
+    def builds(self) -> List[Dict[str, Any]]:
+        if self._builds is None:
+            builds = self.artifact.builds()
+            # "Laurel (Evolves to Crimson Shroud)" -> "Laurel"
+            for build in builds:
+                build["core_items"] = {re.sub(r"\s*\(.*\)$", "", w).strip() for w in build.get("core_weapons", [])}
+                build["core_items"] |= set(build.get("required_passives", []))
+            self._builds = builds
+        return self._builds
+
+    @property
+    def evolutions(self) -> List[Evolution]:
+        """Evolutions whose requirements can be checked from the inventory."""
+        if self._evolutions is None:
+            flags = self.artifact.array("row_flags")
+            evolutions = []
+            for i in np.flatnonzero(flags[:, 0]):
+                # Character or "N passives" requirements can't be checked from the inventory
+                components = frozenset(self.artifact.string(c) for c in self.artifact.csr("row_components", i))
+                evolutions.append(Evolution(self.evolution_rows[i]["evolution"], components, bool(flags[i, 1])))
+            logger.debug(f"[KnowledgeBase] {len(evolutions)} evolutions usable, {len(flags) - len(evolutions)} skipped.")
+            self._evolutions = evolutions
+        return self._evolutions
+
+    @property
+    def evolves_from(self) -> Dict[str, List[str]]:
+        """Evolution -> base weapon(s)."""
+        if self._evolves_from is None:
+            evolves_from = {}
+            for i, row in enumerate(self.evolution_rows):
+                bases = [self.artifact.string(b) for b in self.artifact.csr("row_bases", i)]
+                if bases and row["evolution"]:
+                    evolves_from.setdefault(row["evolution"], bases)
+            self._evolves_from = evolves_from
+        return self._evolves_from
+
+    @property
+    def names(self) -> NameIndex:
+        if self._names is None:
+            self._names = NameIndex(self.item_types, {evolution: bases[0] for evolution, bases in self.evolves_from.items()})
+        return self._names
+
+    @property
+    def graph(self) -> EvolutionGraph:
+        if self._graph is None:
+            self._graph = EvolutionGraph(self.evolutions, self.item_types)
+        return self._graph
+
+    def tracker(self, items: Iterable[str] = ()) -> EvolutionTracker:
+        """Evolution progress for an inventory; keep one per consumer and sync() it."""
+        return self.graph.tracker(items)
+
+    def evolutions_from(self, base: str) -> List[Dict[str, str]]:
+        """Evolution/union rows with this base weapon."""
+        return [self.evolution_rows[i] for i in self.artifact.evolutions_from(base)]
+
+    def weapons_for(self, passive: str) -> List[str]:
+        """Weapons this passive evolves."""
+        return self.artifact.weapons_for(passive)
+
+    def item_type(self, name: str) -> Optional[str]:
+        return self.artifact.item_type(name)
+
+    def relevant_evolution_rows(self, items: Iterable[str]) -> List[Dict[str, str]]:
+        """Evolution/union rows mentioning any of the items, in file order."""
+        hits = sorted({i for item in items if item for i in self.artifact.rows_for(item)})
+        return [self.evolution_rows[i] for i in hits]
+
+    def relevant_builds(self, items: Iterable[str], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Sample builds sharing at least one core item with the given items, most shared
+        first (without the index field).
+        """
+        items = set(items)
+        ranked = sorted((b for b in self.builds if b["core_items"] & items),
+                        key=lambda b: len(b["core_items"] & items), reverse=True)
+        return [{k: v for k, v in build.items() if k != "core_items"} for build in ranked[:limit]]
@@ -0,0 +1,413 @@
+"""
+Compiled knowledge base: items.json, evolutions.json and sample_strategy.json in one
+versioned binary file with prebuilt lookup tables (item -> type, item -> evolution rows,
+base -> evolutions, passive -> weapons). The file is memory-mapped and queried in place,
+so every process using it shares the same pages instead of parsing its own copy of the
+JSON.
+
+Build it next to its sources with:
+
+    python -m bot.knowledge_base.kb_artifact [--kb-dir DIR] [--out PATH]
+
+If that file is missing or older than its sources, the bot compiles one into
+paths.cache_dir instead; it never writes into the source tree at runtime.
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from bot.system.config import config
+from bot.system.logger import logger
+
+MAGIC = b"VSKB"
+FORMAT_VERSION = 2
+SOURCES = ("items.json", "evolutions.json", "sample_strategy.json")
+MAX_LEVEL_PREFIX = "Max level:"
+ARTIFACT_NAME = "kb.bin"
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(MODULE_DIR))
+
+def resolve_kb_dir(kb_dir: Optional[str] = None) -> str:
+    """The knowledge base directory; relative paths are taken from the project root, not the cwd."""
+    kb_dir = kb_dir or config.get("paths.knowledge_base", None)
+    if not kb_dir:
+        return MODULE_DIR
+    return kb_dir if os.path.isabs(kb_dir) else os.path.join(PROJECT_ROOT, kb_dir)
+
+def split_names(text: str, names: Sequence[str]) -> Optional[List[str]]:
+    """
+    Splits a wiki cell that glued several item names together ("Silver RingGold Ring")
+    back into known names. Returns None if the text isn't a concatenation of known names.
+    """
+    text = text.strip()
+    if not text:
+        return []
+    by_first = defaultdict(list)
+    for name in names:
+        by_first[name[0]].append(name)
+
+    # best[i]: split of text[i:], filled right to left
+    best: Dict[int, Optional[List[str]]] = {len(text): []}
+    for i in range(len(text) - 1, -1, -1):
+        best[i] = None
+        for name in sorted(by_first.get(text[i], ()), key=len, reverse=True):
+            rest = best.get(i + len(name)) if text.startswith(name, i) else None
+            if rest is not None:
+                best[i] = [name] + rest
+                break
+    return best[0]
+
+def _source_stamps(kb_dir: str) -> Dict[str, List[int]]:
+    stamps = {}
+    for filename in SOURCES:
+        try:
+            st = os.stat(os.path.join(kb_dir, filename))
+            stamps[filename] = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            stamps[filename] = [-1, 0]
+    return stamps
+
+def _load_json(kb_dir: str, filename: str, default):
+    path = os.path.join(kb_dir, filename)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"[KBArtifact] Could not load {path}: {e}")
+        return default
+
+def _csr(lists: Sequence[Sequence[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(lists) + 1, dtype=np.int32)
+    offsets[1:] = np.cumsum([len(l) for l in lists])
+    values = np.fromiter((v for l in lists for v in l), dtype=np.int32, count=int(offsets[-1]))
+    return offsets, values
+
+def compile_kb(kb_dir: Optional[str] = None) -> bytes:
+    """Reads the JSON sources and returns the artifact bytes."""
+    kb_dir = resolve_kb_dir(kb_dir)
+    stamps = _source_stamps(kb_dir)
+    item_types: Dict[str, str] = _load_json(kb_dir, "items.json", {})
+    rows: List[Dict[str, str]] = _load_json(kb_dir, "evolutions.json", [])
+    builds: List[Dict[str, Any]] = _load_json(kb_dir, "sample_strategy.json", [])
+
+    # String ids: items first (sorted), then any other cell text the rows mention
+    items = sorted(item_types)
+    strings = list(items)
+    ids = {name: i for i, name in enumerate(strings)}
+    def string_id(text: str) -> int:
+        if text not in ids:
+            ids[text] = len(strings)
+            strings.append(text)
+        return ids[text]
+
+    types = sorted(set(item_types.values()))
+    type_codes = np.array([types.index(item_types[name]) + 1 for name in items], dtype=np.uint8)
+
+    row_text = np.zeros((len(rows), 3), dtype=np.int32) # base, requirement, evolution cells
+    row_flags = np.zeros((len(rows), 2), dtype=np.uint8) # usable, max_level
+    row_bases, row_components = [], []
+    mentions = defaultdict(set) # string id -> row ids
+    for i, row in enumerate(rows):
+        base_text, requirement, evolution = row.get("base_weapon", ""), row.get("passive_item", ""), row.get("evolution", "")
+        row_text[i] = [string_id(base_text), string_id(requirement), string_id(evolution)]
+        max_level = requirement.startswith(MAX_LEVEL_PREFIX)
+        if max_level:
+            requirement = requirement[len(MAX_LEVEL_PREFIX):]
+        bases = split_names(base_text, items)
+        required = split_names(requirement, items)
+
+        # Unsplittable cells (characters, "5 passives") are indexed as written
+        mentioned = (bases or [base_text]) + (required if required is not None else [requirement])
+        for text in set(mentioned + [evolution]):
+            if text:
+                mentions[string_id(text)].add(i)
+
+        row_bases.append([ids[b] for b in bases or []])
+        # Character or "N passives" requirements can't be checked from the inventory
+        usable = bool(bases) and required is not None
+        row_components.append(sorted({ids[n] for n in bases + required}) if usable else [])
+        row_flags[i] = [usable, max_level]
+
+    evolutions_by_base = [[] for _ in strings]
+    weapons_by_passive = [set() for _ in strings]
+    for i, bases in enumerate(row_bases):
+        for b in bases:
+            evolutions_by_base[b].append(i)
+        for c in row_components[i]:
+            if c < len(items) and item_types[items[c]] == "passive":
+                weapons_by_passive[c].update(b for b in bases if item_types[items[b]] == "weapon")
+
+    blob = "".join(strings).encode("utf-8")
+    string_offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    string_offsets[1:] = np.cumsum([len(s.encode("utf-8")) for s in strings])
+    # Ids in byte order, so a name is found by binary search over the blob
+    string_order = np.array(sorted(range(len(strings)), key=lambda i: strings[i].encode("utf-8")), dtype=np.int32)
+
+    sections: Dict[str, np.ndarray] = {
+        "string_offsets": string_offsets,
+        "string_blob": np.frombuffer(blob, dtype=np.uint8),
+        "string_order": string_order,
+        "item_type": type_codes,
+        "row_text": row_text,
+        "row_flags": row_flags,
+        "builds": np.frombuffer(json.dumps(builds).encode("utf-8"), dtype=np.uint8),
+    }
+    for name, lists in (("row_bases", row_bases), ("row_components", row_components),
+                        ("rows_by_string", [sorted(mentions.get(i, ())) for i in range(len(strings))]),
+                        ("evolutions_by_base", evolutions_by_base),
+                        ("weapons_by_passive", [sorted(s) for s in weapons_by_passive])):
+        sections[f"{name}.offsets"], sections[f"{name}.values"] = _csr(lists)
+
+    header = {
+        "version": FORMAT_VERSION,
+        "sources": stamps,
+        "types": types,
+        "counts": {"items": len(items), "strings": len(strings), "rows": len(rows)},
+        "sections": {},
+    }
+    # Offsets are relative to the data start (after the 8-aligned header)
+    offset, chunks = 0, []
+    for name, array in sections.items():
+        array = np.ascontiguousarray(array)
+        header["sections"][name] = [offset, array.dtype.str, list(array.shape)]
+        data = array.tobytes()
+        padding = -len(data) % 8
+        chunks.append(data + b"\0" * padding)
+        offset += len(data) + padding
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    header_bytes += b" " * (-(len(header_bytes) + 12) % 8)
+    return MAGIC + struct.pack("<II", FORMAT_VERSION, len(header_bytes)) + header_bytes + b"".join(chunks)
+
+class KBArtifact:
+    """
+    Read-only view of a compiled knowledge base (a memory-mapped file or bytes). Lookups
+    read the mapped tables directly; only the strings they return are decoded.
+    """
+    def __init__(self, buffer, path: Optional[str] = None):
+        self.path = path
+        self._buffer = buffer
+        if bytes(buffer[:4]) != MAGIC:
+            raise ValueError("not a knowledge base artifact")
+        version, header_len = struct.unpack_from("<II", buffer, 4)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"artifact format {version}, expected {FORMAT_VERSION}")
+        self.header = json.loads(bytes(buffer[12:12 + header_len]))
+        self._data_start = 12 + header_len
+        self.counts: Dict[str, int] = self.header["counts"]
+        self.types: List[str] = self.header["types"]
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def open(cls, path: str) -> "KBArtifact":
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), path)
+
+    def array(self, name: str) -> np.ndarray:
+        """A zero-copy view of one section."""
+        if name not in self._arrays:
+            offset, dtype, shape = self.header["sections"][name]
+            count = int(np.prod(shape)) if shape else 1
+            self._arrays[name] = np.frombuffer(self._buffer, dtype=np.dtype(dtype), count=count,
+                                               offset=self._data_start + offset).reshape(shape)
+        return self._arrays[name]
+
+    def csr(self, name: str, i: int) -> np.ndarray:
+        offsets = self.array(f"{name}.offsets")
+        return self.array(f"{name}.values")[offsets[i]:offsets[i + 1]]
+
+    def is_current(self, kb_dir: str) -> bool:
+        return self.header["sources"] == _source_stamps(kb_dir)
+
+    def _string_bytes(self, i: int) -> bytes:
+        # Offsets are in bytes, so non-ASCII names ("Tirajisú") split correctly
+        offsets = self.array("string_offsets")
+        return self.array("string_blob")[offsets[i]:offsets[i + 1]].tobytes()
+
+    def string(self, i: int) -> str:
+        return self._string_bytes(int(i)).decode("utf-8")
+
+    def string_id(self, text: str) -> Optional[int]:
+        key = text.encode("utf-8")
+        order = self.array("string_order")
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._string_bytes(order[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(order) and self._string_bytes(order[lo]) == key:
+            return int(order[lo])
+        return None
+
+    def item_names(self) -> Iterator[str]:
+        return (self.string(i) for i in range(self.counts["items"]))
+
+    def item_types(self) -> "ItemTypes":
+        return ItemTypes(self)
+
+    def item_type(self, name: str) -> Optional[str]:
+        i = self.string_id(name)
+        return self.types[self.array("item_type")[i] - 1] if i is not None and i < self.counts["items"] else None
+
+    def row(self, i: int) -> Dict[str, str]:
+        base, requirement, evolution = self.array("row_text")[i]
+        return {"base_weapon": self.string(base), "passive_item": self.string(requirement),
+                "evolution": self.string(evolution)}
+
+    def rows(self) -> "EvolutionRows":
+        return EvolutionRows(self)
+
+    def rows_by_item(self) -> "RowsByItem":
+        return RowsByItem(self)
+
+    def rows_for(self, text: str) -> List[int]:
+        """Evolution rows mentioning an item (or raw cell text)."""
+        i = self.string_id(text)
+        return self.csr("rows_by_string", i).tolist() if i is not None else []
+
+    def evolutions_from(self, base: str) -> List[int]:
+        i = self.string_id(base)
+        return self.csr("evolutions_by_base", i).tolist() if i is not None else []
+
+    def weapons_for(self, passive: str) -> List[str]:
+        i = self.string_id(passive)
+        return [self.string(w) for w in self.csr("weapons_by_passive", i)] if i is not None else []
+
+    def builds(self) -> List[Dict[str, Any]]:
+        return json.loads(self.array("builds").tobytes())
+
+class ItemTypes(Mapping):
+    """item -> type, read from the artifact on each lookup."""
+    def __init__(self, artifact: KBArtifact):
+        self.artifact = artifact
+
+    def __getitem__(self, name: str) -> str:
+        item_type = self.artifact.item_type(name) if isinstance(name, str) else None
+        if item_type is None:
+            raise KeyError(name)
+        return item_type
+
+    def __iter__(self) -> Iterator[str]:
+        return self.artifact.item_names()
+
+    def __len__(self) -> int:
+        return self.artifact.counts["items"]
+
+class EvolutionRows(Sequence):
+    """The evolutions.json rows in file order, decoded on access."""
+    def __init__(self, artifact: KBArtifact):
+        self.artifact = artifact
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.artifact.row(j) for j in range(*i.indices(len(self)))]
+        return self.artifact.row(range(len(self))[i])
+
+    def __len__(self) -> int:
+        return self.artifact.counts["rows"]
+
+class RowsByItem(Mapping):
+    """Item (or raw cell text) -> ids of the evolution rows mentioning it."""
+    def __init__(self, artifact: KBArtifact):
+        self.artifact = artifact
+
+    def __getitem__(self, text: str) -> List[int]:
+        rows = self.artifact.rows_for(text) if isinstance(text, str) else []
+        if not rows:
+            raise KeyError(text)
+        return rows
+
+    def _ids(self) -> np.ndarray:
+        return np.flatnonzero(np.diff(self.artifact.array("rows_by_string.offsets")))
+
+    def __iter__(self) -> Iterator[str]:
+        return (self.artifact.string(i) for i in self._ids())
+
+    def __len__(self) -> int:
+        return len(self._ids())
+
+_loaded: Dict[str, KBArtifact] = {}
+_load_lock = threading.Lock()
+
+def default_artifact_path(kb_dir: str) -> str:
+    return os.path.join(kb_dir, ARTIFACT_NAME) # the build step's output, next to its sources
+
+def resolve_cache_dir(cache_dir: Optional[str] = None) -> str:
+    cache_dir = cache_dir or config.get("paths.cache_dir", None)
+    if not cache_dir:
+        cache_dir = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "vampire-bot")
+    return os.path.expanduser(cache_dir)
+
+def cached_artifact_path(kb_dir: str, cache_dir: Optional[str] = None) -> str:
+    """Where the bot compiles the artifact at runtime: one file per knowledge base directory."""
+    digest = hashlib.sha1(os.path.realpath(kb_dir).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(resolve_cache_dir(cache_dir), f"kb-{digest}.bin")
+
+def build_artifact(kb_dir: Optional[str] = None, out: Optional[str] = None) -> str:
+    """Compiles the artifact and writes it atomically. Returns its path."""
+    kb_dir = resolve_kb_dir(kb_dir)
+    out = out or default_artifact_path(kb_dir)
+    data = compile_kb(kb_dir)
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    tmp = f"{out}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, out) # Readers keep their mapping of the old file
+    logger.info(f"[KBArtifact] Wrote {out} ({len(data) / 1024:.1f} KiB)")
+    return out
+
+def _open_current(path: str, kb_dir: str) -> Optional[KBArtifact]:
+    try:
+        artifact = KBArtifact.open(path)
+    except (OSError, ValueError) as e:
+        if os.path.exists(path):
+            logger.info(f"[KBArtifact] Ignoring {path}: {e}")
+        return None
+    if not artifact.is_current(kb_dir):
+        logger.info(f"[KBArtifact] {path} is older than its sources.")
+        return None
+    return artifact
+
+def load_artifact(kb_dir: Optional[str] = None, cache_dir: Optional[str] = None) -> KBArtifact:
+    """
+    The process-wide artifact for kb_dir, mapped on first use: the built kb.bin if it is
+    current, else a copy compiled into the cache directory. Falls back to an in-memory
+    build if neither can be used.
+    """
+    kb_dir = resolve_kb_dir(kb_dir)
+    with _load_lock:
+        artifact = _loaded.get(kb_dir)
+        if artifact is not None:
+            return artifact
+        artifact = _open_current(default_artifact_path(kb_dir), kb_dir)
+        if artifact is None:
+            path = cached_artifact_path(kb_dir, cache_dir)
+            artifact = _open_current(path, kb_dir)
+            if artifact is None:
+                try:
+                    artifact = KBArtifact.open(build_artifact(kb_dir, path))
+                except OSError as e:
+                    logger.warning(f"[KBArtifact] Could not write {path} ({e}), keeping it in memory.")
+                    artifact = KBArtifact(compile_kb(kb_dir))
+        _loaded[kb_dir] = artifact
+        return artifact
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kb-dir", default=None, help="Directory with the JSON sources")
+    parser.add_argument("--out", default=None, help=f"Artifact path (default: <kb-dir>/{ARTIFACT_NAME})")
+    args = parser.parse_args()
+    artifact = KBArtifact.open(build_artifact(args.kb_dir, args.out))
+    print(f"{artifact.counts['items']} items, {artifact.counts['rows']} evolution rows, "
+          f"{artifact.counts['strings']} strings, format {FORMAT_VERSION}")
@@ -0,0 +1,109 @@
+import re
+import threading
+import unicodedata
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from bot.system.config import config
+
+def normalize(name: str) -> str:
+    """'Skull O'Maniac' / 'skull-o-maniac' / 'Tirajisú' -> 'skullomaniac' / 'tirajisu'."""
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+def trigrams(key: str) -> List[str]:
+    padded = f"^{key}$"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)] or [padded]
+
+@dataclass(frozen=True, slots=True)
+class NameMatch:
+    name: str # canonical item name
+    score: float # 1.0 for exact and alias hits, trigram Dice coefficient otherwise
+    via: str # "exact", "alias" or "fuzzy"
+
+class NameIndex:
+    """
+    Resolves free-form item names (LLM output, OCR, sprite file names) to canonical
+    items.json keys. Exact lookups go through the normalized form (case, accents and
+    punctuation ignored), then the alias table (evolved forms that aren't items themselves
+    to their base item), then a character-trigram inverted index
+    scored by Dice coefficient. Results are deterministic (ties broken by name) and
+    memoized.
+    """
+    def __init__(self, names: Iterable[str], aliases: Optional[Mapping[str, str]] = None,
+                 cutoff: Optional[float] = None, memo_size: int = 1024):
+        self.names: List[str] = sorted(set(names))
+        self.cutoff = cutoff if cutoff is not None else config.get("names.fuzzy_cutoff", 0.5)
+        self.by_key: Dict[str, str] = {}
+        for name in self.names:
+            self.by_key.setdefault(normalize(name), name)
+        # Real items are never aliased: most evolution results (Holy Wand, Hollow Heart) are items too
+        self.aliases: Dict[str, str] = {normalize(a): target for a, target in (aliases or {}).items()
+                                        if target in self.names and normalize(a) not in self.by_key}
+
+        # Fuzzy candidates: every canonical name and alias, keyed by normalized form
+        self._keys: List[str] = sorted(set(self.by_key) | set(self.aliases))
+        self._sizes: List[int] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for i, key in enumerate(self._keys):
+            grams = set(trigrams(key))
+            self._sizes.append(len(grams))
+            for gram in grams:
+                self._postings[gram].append(i)
+
+        self._memo: "OrderedDict[Tuple[str, int, bool], Tuple[NameMatch, ...]]" = OrderedDict()
+        self._memo_size = memo_size
+        self._lock = threading.Lock()
+
+    def _target(self, key: str, aliases: bool) -> Optional[Tuple[str, str]]:
+        if key in self.by_key:
+            return self.by_key[key], "exact"
+        if aliases and key in self.aliases:
+            return self.aliases[key], "alias"
+        return None
+
+    def candidates(self, name: str, k: int = 5, aliases: bool = True) -> Tuple[NameMatch, ...]:
+        """Up to k distinct items scoring at least cutoff, best first."""
+        memo_key = (name, k, aliases)
+        with self._lock:
+            if memo_key in self._memo:
+                self._memo.move_to_end(memo_key)
+                return self._memo[memo_key]
+
+        key = normalize(name)
+        hit = self._target(key, aliases) if key else None
+        if hit:
+            results = (NameMatch(hit[0], 1.0, hit[1]),)
+        else:
+            results = self._fuzzy(key, k, aliases) if key else ()
+
+        with self._lock:
+            self._memo[memo_key] = results
+            if len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+        return results
+
+    def _fuzzy(self, key: str, k: int, aliases: bool) -> Tuple[NameMatch, ...]:
+        grams = set(trigrams(key))
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for i in self._postings.get(gram, ()):
+                shared[i] += 1
+
+        best: Dict[str, NameMatch] = {}
+        for i, count in shared.items():
+            score = 2 * count / (len(grams) + self._sizes[i])
+            if score < self.cutoff:
+                continue
+            candidate = self._keys[i]
+            if not aliases and candidate not in self.by_key:
+                continue
+            target, _ = self._target(candidate, aliases)
+            if target not in best or score > best[target].score:
+                best[target] = NameMatch(target, round(score, 4), "fuzzy")
+        return tuple(sorted(best.values(), key=lambda m: (-m.score, m.name))[:k])
+
+    def resolve(self, name: str, aliases: bool = True) -> Optional[NameMatch]:
+        matches = self.candidates(name, k=1, aliases=aliases)
+        return matches[0] if matches else None
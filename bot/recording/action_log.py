@@ -0,0 +1,159 @@
+import argparse
+import json
+import os
+import struct
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+# Bit i of the buttons field, in the order of the JSONL schema
+BUTTONS = (
+    "SOUTH", "EAST", "WEST", "NORTH", "LEFT_SHOULDER", "RIGHT_SHOULDER", "BACK", "START",
+    "LEFT_THUMB", "RIGHT_THUMB", "GUIDE", "DPAD_UP", "DPAD_DOWN", "DPAD_LEFT", "DPAD_RIGHT",
+)
+BUTTON_BITS = {name: 1 << i for i, name in enumerate(BUTTONS)}
+
+ACTION_DTYPE = np.dtype([
+    ("step", "<u4"),
+    ("time", "<f8"), # seconds since the epoch
+    ("buttons", "<u2"),
+    ("left_x", "<i2"), ("left_y", "<i2"), ("right_x", "<i2"), ("right_y", "<i2"), # -32767..32767
+    ("left_trigger", "u1"), ("right_trigger", "u1"), # 0..255
+])
+
+# Controller state as polled: (buttons, left_x, left_y, right_x, right_y, left_trigger, right_trigger)
+InputState = Tuple[int, int, int, int, int, int, int]
+
+MAGIC = b"VSACTLOG"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIIdd") # magic, version, record size, fps, start time
+CHUNK_RECORDS = 1024
+
+def _read_header(f) -> Tuple[float, float]:
+    raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise ValueError("Action log is truncated (no header)")
+    magic, version, record_size, fps, start = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError("Not an action log")
+    if version != FORMAT_VERSION or record_size != ACTION_DTYPE.itemsize:
+        raise ValueError(f"Action log format {version} ({record_size} B records) is not supported")
+    return fps, start
+
+class ActionLogWriter:
+    """
+    Appends fixed-width controller records (ACTION_DTYPE) to a binary file: a HEADER then
+    the records back to back. Records fill an in-memory chunk that is written out whole
+    every CHUNK_RECORDS frames, so the capture loop does no per-frame I/O or encoding.
+    Opening an existing log appends to it; a record cut short by a crash is discarded.
+    """
+    def __init__(self, path: str, fps: float = 60.0, chunk_records: int = CHUNK_RECORDS):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._chunk = np.zeros(chunk_records, dtype=ACTION_DTYPE)
+        self._count = 0
+        self.written = 0
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._file = open(path, "r+b")
+            self.fps, self.start_time = _read_header(self._file)
+            records = (os.path.getsize(path) - HEADER.size) // ACTION_DTYPE.itemsize
+            self._file.truncate(HEADER.size + records * ACTION_DTYPE.itemsize)
+            self._file.seek(0, os.SEEK_END)
+        else:
+            self._file = open(path, "wb")
+            self.fps, self.start_time = fps, time.time()
+            self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, ACTION_DTYPE.itemsize, fps, self.start_time))
+
+    def write(self, step: int, timestamp: float, state: InputState):
+        self._chunk[self._count] = (step, timestamp, *state)
+        self._count += 1
+        if self._count == len(self._chunk):
+            self.flush()
+
+    def flush(self):
+        if self._count:
+            self._file.write(self._chunk[:self._count].tobytes())
+            self.written += self._count
+            self._count = 0
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ActionLogReader:
+    """Memory-mapped view of an action log; records is a structured array of ACTION_DTYPE."""
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self.fps, self.start_time = _read_header(f)
+        count = (os.path.getsize(path) - HEADER.size) // ACTION_DTYPE.itemsize
+        if count:
+            self.records = np.memmap(path, dtype=ACTION_DTYPE, mode="r", offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=ACTION_DTYPE)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def pressed(self, button: str) -> np.ndarray:
+        """Per-record bool array for one button."""
+        return (self.records["buttons"] & BUTTON_BITS[button]) != 0
+
+    def iter_json(self, chunk_records: int = 65536) -> Iterator[Dict[str, Any]]:
+        """Records in the JSONL capture schema, a chunk of the map at a time."""
+        for start in range(0, len(self.records), chunk_records):
+            chunk = np.array(self.records[start:start + chunk_records]) # one sequential read
+            for row in chunk.tolist():
+                yield to_json_record(row[0], row[2:])
+
+def to_json_record(step: int, state: InputState) -> Dict[str, Any]:
+    """The JSONL capture schema (NitroGen): buttons as 0/1, axes and triggers as one-element lists."""
+    buttons, left_x, left_y, right_x, right_y, left_trigger, right_trigger = state
+    record: Dict[str, Any] = {"step": int(step)}
+    for name, bit in BUTTON_BITS.items():
+        record[name] = 1 if buttons & bit else 0
+    record["LEFT_TRIGGER"] = [int(left_trigger)]
+    record["RIGHT_TRIGGER"] = [int(right_trigger)]
+    record["AXIS_LEFTX"] = [int(left_x)]
+    record["AXIS_LEFTY"] = [int(left_y)]
+    record["AXIS_RIGHTX"] = [int(right_x)]
+    record["AXIS_RIGHTY"] = [int(right_y)]
+    return record
+
+def convert_to_jsonl(path: str, out_path: Optional[str] = None) -> str:
+    """Streams a binary action log into the JSONL capture format; returns the output path."""
+    out_path = out_path or os.path.splitext(path)[0] + ".jsonl"
+    reader = ActionLogReader(path)
+    with open(out_path, "w", encoding="utf-8") as f:
+        for record in reader.iter_json():
+            f.write(json.dumps(record) + "\n")
+    return out_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert binary controller recordings to the JSONL capture format.")
+    parser.add_argument("logs", nargs="+", help="Action logs (.bin)")
+    parser.add_argument("--out", help="Output path (single input only); defaults to <log>.jsonl")
+    args = parser.parse_args()
+    if args.out and len(args.logs) > 1:
+        parser.error("--out needs a single input")
+    for path in args.logs:
+        out = convert_to_jsonl(path, args.out)
+        print(f"Wrote {len(ActionLogReader(path))} records to {out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from bot.system.config import config
+from bot.system.logger import logger
+
+class OpenCVSink:
+    """cv2.VideoWriter (mp4v by default)."""
+    def __init__(self, path: str, fps: float, size: Tuple[int, int], fourcc: str = "mp4v"):
+        self.path = path
+        self._writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, size)
+
+    def write(self, frame: np.ndarray):
+        self._writer.write(frame)
+
+    def close(self):
+        self._writer.release()
+
+class FFmpegSink:
+    """Raw BGR frames piped into an ffmpeg process (x264/x265 presets, CRF rate control)."""
+    def __init__(self, path: str, fps: float, size: Tuple[int, int], codec: str = "libx264",
+                 preset: str = "veryfast", crf: int = 23, executable: str = "ffmpeg"):
+        self.path = path
+        self.command = [
+            executable, "-loglevel", "error", "-y",
+            "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{size[0]}x{size[1]}", "-r", str(fps), "-i", "-",
+            "-c:v", codec, "-preset", preset, "-crf", str(crf), "-pix_fmt", "yuv420p", path,
+        ]
+        self._process = subprocess.Popen(self.command, stdin=subprocess.PIPE)
+
+    def write(self, frame: np.ndarray):
+        self._process.stdin.write(memoryview(np.ascontiguousarray(frame)).cast("B"))
+
+    def close(self):
+        try:
+            self._process.stdin.close()
+        finally:
+            if self._process.wait() != 0:
+                logger.error(f"[Encoder] ffmpeg exited with {self._process.returncode} for {self.path}")
+
+def make_sink(path: str, fps: float, size: Tuple[int, int]):
+    """Video sink from capture.encoder; falls back to OpenCV when ffmpeg isn't installed."""
+    settings = config.get("capture.encoder", {}) or {}
+    if settings.get("backend", "opencv") == "ffmpeg":
+        executable = shutil.which(settings.get("ffmpeg", "ffmpeg"))
+        if executable:
+            return FFmpegSink(path, fps, size, codec=settings.get("codec", "libx264"),
+                              preset=settings.get("preset", "veryfast"), crf=settings.get("crf", 23),
+                              executable=executable)
+        logger.warning("[Encoder] ffmpeg not found, encoding with OpenCV instead.")
+    return OpenCVSink(path, fps, size, fourcc=settings.get("fourcc", "mp4v"))
+
+class FrameEncoder:
+    """
+    Encodes frames on its own thread so a slow encode never stalls the capture loop.
+    Frames are copied into a fixed pool of preallocated buffers; submit() never blocks and
+    drops the frame (returning False) when every buffer is still waiting to be encoded.
+    """
+    def __init__(self, sink, shape: Tuple[int, int, int], buffers: Optional[int] = None):
+        self.sink = sink
+        count = buffers or config.get("capture.encoder.buffers", 32)
+        self._buffers = np.empty((count, *shape), dtype=np.uint8)
+        self._free: "queue.SimpleQueue[int]" = queue.SimpleQueue()
+        for i in range(count):
+            self._free.put(i)
+        self._ready: "queue.SimpleQueue[Optional[int]]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._queued = 0
+
+        self.submitted = 0
+        self.encoded = 0
+        self.dropped = 0
+        self.high_water = 0 # most frames waiting at once
+        self.encode_time = 0.0
+        self.max_encode_time = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="FrameEncoder", daemon=True)
+        self._thread.start()
+
+    def submit(self, frame: np.ndarray) -> bool:
+        try:
+            i = self._free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        np.copyto(self._buffers[i], frame)
+        with self._lock:
+            self.submitted += 1
+            self._queued += 1
+            self.high_water = max(self.high_water, self._queued)
+        self._ready.put(i)
+        return True
+
+    def _run(self):
+        while (i := self._ready.get()) is not None:
+            start = time.perf_counter()
+            try:
+                self.sink.write(self._buffers[i])
+            except Exception as e:
+                logger.error(f"[Encoder] Frame write failed: {e}")
+            elapsed = time.perf_counter() - start
+            self.encode_time += elapsed
+            self.max_encode_time = max(self.max_encode_time, elapsed)
+            self.encoded += 1
+            with self._lock:
+                self._queued -= 1
+            self._free.put(i)
+
+    def close(self):
+        """Encodes every queued frame, then closes the sink."""
+        self._ready.put(None)
+        self._thread.join()
+        self.sink.close()
+
+    def get_stats(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "encoded": self.encoded,
+            "dropped": self.dropped,
+            "high_water": self.high_water,
+            "buffers": len(self._buffers),
+            "avg_encode_ms": round(1000 * self.encode_time / self.encoded, 2) if self.encoded else 0.0,
+            "max_encode_ms": round(1000 * self.max_encode_time, 2),
+        }
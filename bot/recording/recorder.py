@@ -1,7 +1,5 @@
 import os
 import time
-import json
-import cv2
 import multiprocessing
 import pygame
 import psutil
@@ -12,6 +10,9 @@ import dxcam
 import warnings
 from bot.system.config import config
 from bot.system.logger import logger, setup_logger
+from bot.system.log_writer import LogWriter
+from bot.recording.encoder import FrameEncoder, make_sink
+from bot.recording.action_log import BUTTON_BITS, BUTTONS, ActionLogWriter, InputState, to_json_record
 
 def _normalize_trigger(value):
     val = max(-1.0, min(1.0, value))
@@ -21,53 +22,37 @@ def _normalize_stick(value):
     val = max(-1.0, min(1.0, value))
     return int(val * 32767.0)
 
-def _get_input_state(joystick, step_index):
+def _poll_input(joystick) -> InputState:
+    """Current controller state as one ACTION_DTYPE record's fields."""
     pygame.event.pump() 
     
-    state = {
-        "step": step_index,
-        "SOUTH": joystick.get_button(0),
-        "EAST": joystick.get_button(1),
-        "WEST": joystick.get_button(2),
-        "NORTH": joystick.get_button(3),
-        "LEFT_SHOULDER": joystick.get_button(4),
-        "RIGHT_SHOULDER": joystick.get_button(5),
-        "BACK": joystick.get_button(6),
-        "START": joystick.get_button(7),
-        "LEFT_THUMB": joystick.get_button(8),
-        "RIGHT_THUMB": joystick.get_button(9),
-        "GUIDE": 0, 
-        "DPAD_UP": 0, "DPAD_DOWN": 0, "DPAD_LEFT": 0, "DPAD_RIGHT": 0,
-        "LEFT_TRIGGER": 0, "RIGHT_TRIGGER": 0,
-        "AXIS_LEFTX": 0, "AXIS_LEFTY": 0, "AXIS_RIGHTX": 0, "AXIS_RIGHTY": 0
-    }
+    buttons = 0
+    for i, name in enumerate(BUTTONS[:10]): # SOUTH .. RIGHT_THUMB are pygame buttons 0-9
+        if joystick.get_button(i):
+            buttons |= BUTTON_BITS[name]
 
     if joystick.get_numhats() > 0:
         hat_x, hat_y = joystick.get_hat(0)
-        state["DPAD_LEFT"] = 1 if hat_x == -1 else 0
-        state["DPAD_RIGHT"] = 1 if hat_x == 1 else 0
-        state["DPAD_UP"] = 1 if hat_y == 1 else 0
-        state["DPAD_DOWN"] = 1 if hat_y == -1 else 0
+        if hat_x == -1: buttons |= BUTTON_BITS["DPAD_LEFT"]
+        if hat_x == 1: buttons |= BUTTON_BITS["DPAD_RIGHT"]
+        if hat_y == 1: buttons |= BUTTON_BITS["DPAD_UP"]
+        if hat_y == -1: buttons |= BUTTON_BITS["DPAD_DOWN"]
     
     # Axis mapping
-    state["AXIS_LEFTX"] = [_normalize_stick(joystick.get_axis(0))]
-    state["AXIS_LEFTY"] = [_normalize_stick(joystick.get_axis(1))]
+    left_x = _normalize_stick(joystick.get_axis(0))
+    left_y = _normalize_stick(joystick.get_axis(1))
     
+    right_x = right_y = 0
     if joystick.get_numaxes() >= 4:
-            state["AXIS_RIGHTX"] = [_normalize_stick(joystick.get_axis(2))]
-            state["AXIS_RIGHTY"] = [_normalize_stick(joystick.get_axis(3))]
-    else:
-            state["AXIS_RIGHTX"] = [0]
-            state["AXIS_RIGHTY"] = [0]
+        right_x = _normalize_stick(joystick.get_axis(2))
+        right_y = _normalize_stick(joystick.get_axis(3))
     
+    left_trigger = right_trigger = 0
     if joystick.get_numaxes() >= 6:
-        state["LEFT_TRIGGER"] = [_normalize_trigger(joystick.get_axis(4))]
-        state["RIGHT_TRIGGER"] = [_normalize_trigger(joystick.get_axis(5))]
-    else:
-        state["LEFT_TRIGGER"] = [0]
-        state["RIGHT_TRIGGER"] = [0]
+        left_trigger = _normalize_trigger(joystick.get_axis(4))
+        right_trigger = _normalize_trigger(joystick.get_axis(5))
         
-    return state
+    return buttons, left_x, left_y, right_x, right_y, left_trigger, right_trigger
 
 def _get_game_window(process_name_fragment="Vampire"):
 
@@ -147,8 +132,6 @@ def _capture_process(stop_event, video_filename, action_filename, fps):
             proc_logger.error("[Recorder] Could not find game window. Aborting capture.")
             return
 
-        width = bbox[2] - bbox[0]
-        height = bbox[3] - bbox[1]
         width = bbox[2] - bbox[0]
         height = bbox[3] - bbox[1]
         proc_logger.info(f"[Recorder] Capture Region: {bbox} ({width}x{height})")
@@ -167,14 +150,23 @@ def _capture_process(stop_event, video_filename, action_filename, fps):
         # or grab repeatedly. If we want exact sync with loop, just grab.
         camera.start(target_fps=fps, video_mode=True, region=bbox)
 
-        # Init Video Writer
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v') 
-        video_writer = cv2.VideoWriter(video_filename, fourcc, fps, (width, height))
+        # Encoded on its own thread from a pool of preallocated frame buffers (capture.encoder)
+        encoder = FrameEncoder(make_sink(video_filename, fps, (width, height)), (height, width, 3))
         
-        jsonl_file = open(action_filename, 'w')
+        if action_filename.endswith(".bin"):
+            # Fixed-width records, written a chunk at a time (python -m bot.recording.action_log for JSONL)
+            actions = ActionLogWriter(action_filename, fps)
+        else:
+            # Written off the capture loop by a writer of its own (no other stream shares its queue); never rotated.
+            # A line is only dropped when that queue is full: it is counted as a lost frame, and the
+            # remaining lines still match their video frames through "step".
+            writer = LogWriter()
+            actions = writer.open(action_filename, max_bytes=0)
         
         frame_duration = 1.0 / fps
         step_index = 0
+        overruns = 0 # Loop iterations that took longer than frame_duration
+        lost_frames = 0 # Encoded frames whose action line was dropped
         
         proc_logger.info("[Recorder] Recording started (Process).")
         
@@ -192,24 +184,28 @@ def _capture_process(stop_event, video_filename, action_filename, fps):
                 continue
 
             # Poll inputs
-            inputs = _get_input_state(joystick, step_index)
+            inputs = _poll_input(joystick)
             
             # Save
             # Resize if needed (dxcam region might be slightly off if we adjusted width/height for evenness)
             if frame.shape[1] != width or frame.shape[0] != height:
                  frame = frame[:height, :width]
 
-            video_writer.write(frame)
-            json.dump(inputs, jsonl_file)
-            jsonl_file.write('\n')
-            
-            step_index += 1
+            # A frame dropped because the encoder is behind drops its action line too
+            if encoder.submit(frame):
+                if isinstance(actions, ActionLogWriter):
+                    actions.write(step_index, time.time(), inputs)
+                elif not actions.write(to_json_record(step_index, inputs)):
+                    lost_frames += 1
+                step_index += 1
             
             # Sleep to maintain FPS
             elapsed = time.perf_counter() - start_time
             sleep_time = frame_duration - elapsed
             if sleep_time > 0:
                 time.sleep(sleep_time)
+            else:
+                overruns += 1
                 
     except Exception as e:
         proc_logger.error(f"[Recorder] Error in capture process: {e}")
@@ -220,10 +216,17 @@ def _capture_process(stop_event, video_filename, action_filename, fps):
         if 'camera' in locals() and camera:
             try: camera.stop() 
             except: pass
-        if 'video_writer' in locals():
-            video_writer.release()
-        if 'jsonl_file' in locals():
-            jsonl_file.close()
+        if 'encoder' in locals():
+            encoder.close()
+            proc_logger.info(f"[Recorder] Video: {encoder.get_stats()}, {overruns} capture overruns, "
+                             f"{lost_frames} frames without an action line.")
+        if isinstance(locals().get('actions'), ActionLogWriter):
+            actions.close()
+            proc_logger.info(f"[Recorder] Action log: {actions.written} records.")
+        if 'writer' in locals():
+            writer.close()
+            stats = writer.get_stats()
+            proc_logger.info(f"[Recorder] Action log: {stats['written']} written, {stats['dropped']} dropped.")
         pygame.quit()
 
 class Recorder:
@@ -243,7 +246,8 @@ class Recorder:
 
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         self.video_filename = os.path.join(self.output_dir, f"capture_{timestamp}.mp4")
-        self.action_filename = os.path.join(self.output_dir, f"capture_{timestamp}.jsonl")
+        action_format = config.get('capture.action_format', 'binary')
+        self.action_filename = os.path.join(self.output_dir, f"capture_{timestamp}.{'bin' if action_format == 'binary' else 'jsonl'}")
         
     def start(self):
         if not self.enabled:
@@ -7,7 +7,8 @@ import numpy as np
 from typing import List, Tuple, Dict, Optional
 from bot.system.config import config
 from bot.system.logger import logger
-from bot.vision.types import Detection
+from bot.vision.types import Detection, detection_to_row
+from bot.system.log_writer import shared_writer
 
 class Visualizer(threading.Thread):
     def __init__(self):
@@ -28,6 +29,7 @@ class Visualizer(threading.Thread):
         # User requested 60fps recording, so let's override config if needed or respect it.
         # "i do want to save this visualization at 60fps" -> Enforce 60
         self.record_fps = 60 
+        self.detections_file = None # Per-frame detection replay (for offline Pilot sweeps)
         
         # Output Resolution
         # "make it teh same size as the input (1280x720)"
@@ -57,6 +59,11 @@ class Visualizer(threading.Thread):
             self.writer = cv2.VideoWriter(filename, fourcc, self.record_fps, self.output_size)
             logger.info(f"Visualizer recording enabled: {filename} @ {self.record_fps} FPS")
 
+            if config.get("debug_recording.detections", False):
+                replay_filename = os.path.join(self.output_dir, f"detections_{timestamp}.jsonl")
+                self.detections_file = shared_writer().open(replay_filename, max_bytes=0)
+                logger.info(f"Visualizer detection replay enabled: {replay_filename}")
+
     def start(self):
         logger.info("Visualizer thread starting...")
         super().start()
@@ -67,6 +74,8 @@ class Visualizer(threading.Thread):
         self.join()
         if self.writer:
             self.writer.release()
+        if self.detections_file:
+            self.detections_file.writer.flush()
         cv2.destroyAllWindows()
 
     def update(self, frame, detections, pilot_state, class_names):
@@ -86,7 +95,7 @@ class Visualizer(threading.Thread):
                     self.queue.get_nowait()
                 except queue.Empty:
                     pass
-            self.queue.put((frame, detections, pilot_state, class_names), block=False)
+            self.queue.put((frame, detections, pilot_state, class_names, time.perf_counter()), block=False)
         except queue.Full:
             pass # Should not happen with get_nowait
 
@@ -101,7 +110,9 @@ class Visualizer(threading.Thread):
             try:
                 # Try to get new data
                 data = self.queue.get_nowait()
-                self.last_frame, self.last_detections, self.last_pilot_state, self.class_names = data
+                self.last_frame, self.last_detections, self.last_pilot_state, self.class_names, frame_time = data
+                if self.detections_file:
+                    self._write_detections(self.last_detections, frame_time)
             except queue.Empty:
                 # No new data, persist last state
                 pass
@@ -116,7 +127,7 @@ class Visualizer(threading.Thread):
                 # Detections are likely in Model Resolution (960x608 specified in config/main)
                 # We need to map them to self.output_size (1280x720)
                 # Get model resolution from config for scaling ratio
-                model_size = tuple(config.get("game.image_size", (960, 608)))
+                model_size = config.snapshot.game.image_size
                 
                 scale_x = self.output_size[0] / model_size[0]
                 scale_y = self.output_size[1] / model_size[1]
@@ -145,6 +156,10 @@ class Visualizer(threading.Thread):
             import traceback
             traceback.print_exc()
 
+    def _write_detections(self, detections, frame_time):
+        self.detections_file.write(
+            lambda: {"t": round(frame_time, 4), "detections": [detection_to_row(d) for d in detections]})
+
     # --- Drawing Helpers (Consolidated from annotations.py and debug.py) ---
 
     def _draw_state(self, frame, detections, pilot_state, scale_x, scale_y):
@@ -0,0 +1,100 @@
+import json
+import math
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bot.vision.types import Detection, detection_to_row
+
+# Same label mapping as ObjectDetector
+CLASS_NAMES = {0: "monster", 1: "rune"}
+MONSTER, RUNE = 0, 1
+
+BOX_SIZE = 20
+
+Frames = List[List[Detection]]
+
+def _boxes(centers: np.ndarray, label: int) -> List[Detection]:
+    half = BOX_SIZE // 2
+    return [
+        Detection(position=(int(x) - half, int(y) - half, int(x) + half, int(y) + half), label=label, confidence=1.0)
+        for x, y in centers
+    ]
+
+def _chase(positions: np.ndarray, center: np.ndarray, speed: float, dt: float) -> np.ndarray:
+    """Moves every position towards the center by speed * dt."""
+    offsets = center - positions
+    dists = np.maximum(np.hypot(offsets[:, 0], offsets[:, 1]), 1e-6)
+    step = np.minimum(speed * dt, dists)
+    return positions + offsets / dists[:, None] * step[:, None]
+
+def uniform_swarm(count: int, frames: int, rng: np.random.Generator,
+                  size: Tuple[int, int] = (960, 608), speed: float = 60.0, dt: float = 1 / 30) -> Frames:
+    """Monsters scattered uniformly over the screen, all walking towards the player."""
+    center = np.array(size, dtype=float) / 2
+    positions = rng.uniform((0, 0), size, size=(count, 2))
+    out = []
+    for _ in range(frames):
+        out.append(_boxes(positions, MONSTER))
+        positions = _chase(positions, center, speed, dt)
+    return out
+
+def closing_ring(count: int, frames: int, rng: np.random.Generator,
+                 size: Tuple[int, int] = (960, 608), start_radius: float = 250.0,
+                 speed: float = 90.0, dt: float = 1 / 30) -> Frames:
+    """A ring of monsters around the player, shrinking every frame."""
+    center = np.array(size, dtype=float) / 2
+    angles = np.linspace(0, 2 * math.pi, count, endpoint=False) + rng.uniform(0, 2 * math.pi)
+    out = []
+    for i in range(frames):
+        radius = max(start_radius - speed * dt * i, BOX_SIZE)
+        positions = center + radius * np.stack([np.cos(angles), np.sin(angles)], axis=1)
+        out.append(_boxes(positions, MONSTER))
+    return out
+
+def gem_field(count: int, frames: int, rng: np.random.Generator,
+              size: Tuple[int, int] = (960, 608), clusters: int = 4) -> Frames:
+    """Static runes grouped in a few gaussian clusters, no monsters."""
+    centers = rng.uniform((0, 0), size, size=(clusters, 2))
+    positions = centers[rng.integers(0, clusters, count)] + rng.normal(0, 40, size=(count, 2))
+    positions = np.clip(positions, 0, np.array(size) - 1)
+    return [_boxes(positions, RUNE) for _ in range(frames)]
+
+def mixed(count: int, frames: int, rng: np.random.Generator,
+          size: Tuple[int, int] = (960, 608), monster_ratio: float = 0.7) -> Frames:
+    """A chasing swarm plus a gem field, split by monster_ratio."""
+    n_monsters = int(count * monster_ratio)
+    swarm = uniform_swarm(n_monsters, frames, rng, size=size)
+    gems = gem_field(count - n_monsters, frames, rng, size=size)
+    return [s + g for s, g in zip(swarm, gems)]
+
+SCENES: Dict[str, Callable[..., Frames]] = {
+    "uniform_swarm": uniform_swarm,
+    "closing_ring": closing_ring,
+    "gem_field": gem_field,
+    "mixed": mixed,
+}
+
+def generate(name: str, count: int, frames: int, seed: Optional[int] = 0, **kwargs) -> Frames:
+    """Generates a named synthetic scene as a list of per-frame detection lists."""
+    return SCENES[name](count, frames, np.random.default_rng(seed), **kwargs)
+
+def save_replay(frames: Frames, path: str, dt: float = 1 / 30):
+    """Writes frames as JSONL: {"t": seconds, "detections": [[x1, y1, x2, y2, label, confidence], ...]}."""
+    with open(path, "w") as f:
+        for i, detections in enumerate(frames):
+            f.write(json.dumps({"t": i * dt, "detections": [detection_to_row(d) for d in detections]}) + "\n")
+
+def load_replay(path: str) -> Tuple[Frames, List[float]]:
+    """Reads a detection replay written by save_replay() or the Visualizer. Returns (frames, timestamps)."""
+    frames, timestamps = [], []
+    with open(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            timestamps.append(entry["t"])
+            frames.append([
+                Detection(position=tuple(row[:4]), label=int(row[4]), confidence=float(row[5]))
+                for row in entry["detections"]
+            ])
+    return frames, timestamps
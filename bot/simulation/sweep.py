@@ -0,0 +1,263 @@
+"""
+Offline parameter sweep for Pilot force constants.
+
+Runs every combination of the given config overrides through the Pilot on a process
+pool and ranks them on steering proxies:
+  - min_clearance: closest any monster got to the player (px, higher is better)
+  - gem_rate:      gems collected per second (synthetic) / mean stick speed towards
+                   the nearest rune (replay)
+  - jerk:          mean second difference of the stick output (lower is better)
+
+Synthetic scenarios are simulated closed-loop (the player moves with the stick and
+monsters chase it); recorded detection replays (debug_recording.detections) are
+scored open-loop.
+
+    python -m bot.simulation.sweep \\
+        --param pilot.forces.repel_monster=400,700,1000 \\
+        --param pilot.forces.attract_target=100,150,200 \\
+        --param pilot.prediction.tau=0.2,0.4 \\
+        --scenario mixed:300 --scenario closing_ring:40 \\
+        --output sweep_results.csv
+"""
+import argparse
+import csv
+import itertools
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import yaml
+
+from bot.simulation.scenes import CLASS_NAMES, MONSTER, RUNE, generate, load_replay
+from bot.vision.types import Detection
+
+SCREEN_SIZE = (960, 608)
+FRAME_DT = 1 / 30
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    count: int
+    frames: int = 300
+    seed: int = 0
+    replay_path: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        if self.replay_path:
+            return os.path.basename(self.replay_path)
+        return f"{self.name}:{self.count}"
+
+@dataclass(frozen=True)
+class SimSettings:
+    player_speed: float = 120.0 # px/s at full stick
+    monster_speed: float = 60.0 # px/s
+    pickup_radius: float = 30.0 # px
+    clearance_cap: float = 100.0 # clearance above this scores the same
+
+def _new_pilot(params: Dict[str, Any]):
+    # Config is a per-process singleton, so overrides are safe inside a pool worker
+    from bot.system.config import config
+    from bot.core.pilot import Pilot
+    for path, value in params.items():
+        config.set(path, value)
+    return Pilot((SCREEN_SIZE[0] // 2, SCREEN_SIZE[1] // 2))
+
+def _unit_stick(fx: float, fy: float) -> np.ndarray:
+    magnitude = math.hypot(fx, fy)
+    if magnitude > 1.0:
+        return np.array([fx / magnitude, fy / magnitude])
+    return np.array([fx, fy])
+
+def _jerk(sticks: List[np.ndarray]) -> float:
+    if len(sticks) < 3:
+        return 0.0
+    s = np.asarray(sticks)
+    second_diff = s[2:] - 2 * s[1:-1] + s[:-2]
+    return float(np.hypot(second_diff[:, 0], second_diff[:, 1]).mean())
+
+def _to_screen(world: np.ndarray, player: np.ndarray, label: int) -> List[Detection]:
+    center = np.array(SCREEN_SIZE, dtype=float) / 2
+    screen = world - player + center
+    visible = (screen[:, 0] >= 0) & (screen[:, 0] < SCREEN_SIZE[0]) & (screen[:, 1] >= 0) & (screen[:, 1] < SCREEN_SIZE[1])
+    return [Detection((int(x) - 10, int(y) - 10, int(x) + 10, int(y) + 10), label, 1.0) for x, y in screen[visible]]
+
+def _world_from(detections: List[Detection], label: int) -> np.ndarray:
+    boxes = np.array([d.position for d in detections if d.label == label], dtype=float).reshape(-1, 4)
+    return (boxes[:, :2] + boxes[:, 2:]) / 2
+
+def simulate(params: Dict[str, Any], scenario: Scenario, sim: SimSettings = SimSettings()) -> Dict[str, float]:
+    """Closed-loop run of a synthetic scenario: the player moves with the stick."""
+    pilot = _new_pilot(params)
+    layout = generate(scenario.name, scenario.count, 1, seed=scenario.seed)[0]
+    monsters = _world_from(layout, MONSTER)
+    gems = _world_from(layout, RUNE)
+    player = np.array(SCREEN_SIZE, dtype=float) / 2
+
+    min_clearance = float("inf")
+    collected = 0
+    sticks = []
+    for i in range(scenario.frames):
+        detections = _to_screen(monsters, player, MONSTER) + _to_screen(gems, player, RUNE)
+        pilot.update(detections, CLASS_NAMES, timestamp=i * FRAME_DT)
+        stick = _unit_stick(*pilot.get_force_vector(detections, CLASS_NAMES))
+        sticks.append(stick)
+
+        player = player + stick * sim.player_speed * FRAME_DT
+        if len(monsters):
+            offsets = player - monsters
+            dists = np.maximum(np.hypot(offsets[:, 0], offsets[:, 1]), 1e-6)
+            min_clearance = min(min_clearance, float(dists.min()))
+            monsters = monsters + offsets / dists[:, None] * np.minimum(sim.monster_speed * FRAME_DT, dists)[:, None]
+        if len(gems):
+            picked = np.hypot(*(gems - player).T) < sim.pickup_radius
+            collected += int(picked.sum())
+            gems = gems[~picked]
+
+    return {
+        "min_clearance": min(min_clearance, sim.clearance_cap),
+        "gem_rate": collected / (scenario.frames * FRAME_DT),
+        "jerk": _jerk(sticks),
+    }
+
+def replay(params: Dict[str, Any], scenario: Scenario, sim: SimSettings = SimSettings()) -> Dict[str, float]:
+    """Open-loop run over recorded detections: scores where one step of the stick would take us."""
+    pilot = _new_pilot(params)
+    frames, timestamps = load_replay(scenario.replay_path)
+    center = np.array(pilot.center, dtype=float)
+
+    min_clearance = float("inf")
+    approach = []
+    sticks = []
+    for i, (detections, t) in enumerate(zip(frames, timestamps)):
+        pilot.update(detections, CLASS_NAMES, timestamp=t)
+        stick = _unit_stick(*pilot.get_force_vector(detections, CLASS_NAMES))
+        sticks.append(stick)
+
+        dt = timestamps[i + 1] - t if i + 1 < len(timestamps) else FRAME_DT
+        stepped = center + stick * sim.player_speed * dt
+        monsters = _world_from(detections, MONSTER)
+        if len(monsters):
+            min_clearance = min(min_clearance, float(np.hypot(*(monsters - stepped).T).min()))
+        runes = _world_from(detections, RUNE)
+        if len(runes):
+            offsets = runes - center
+            nearest = offsets[np.argmin(np.hypot(offsets[:, 0], offsets[:, 1]))]
+            norm = np.hypot(*nearest)
+            if norm > 0:
+                approach.append(float(stick @ (nearest / norm)))
+
+    return {
+        "min_clearance": min(min_clearance, sim.clearance_cap),
+        "gem_rate": float(np.mean(approach)) if approach else 0.0,
+        "jerk": _jerk(sticks),
+    }
+
+def evaluate(task: Tuple[Dict[str, Any], List[Scenario], SimSettings]) -> Dict[str, Any]:
+    """Pool worker: scores one parameter combination over all scenarios."""
+    params, scenarios, sim = task
+    runs = [replay(params, s, sim) if s.replay_path else simulate(params, s, sim) for s in scenarios]
+    return {
+        "params": params,
+        "min_clearance": min(r["min_clearance"] for r in runs),
+        "gem_rate": float(np.mean([r["gem_rate"] for r in runs])),
+        "jerk": float(np.mean([r["jerk"] for r in runs])),
+    }
+
+def score(result: Dict[str, Any], weights: Dict[str, float], sim: SimSettings) -> float:
+    return (weights["clearance"] * result["min_clearance"] / sim.clearance_cap
+            + weights["gems"] * result["gem_rate"]
+            - weights["jerk"] * result["jerk"])
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+def run_sweep(grid: Dict[str, List[Any]], scenarios: List[Scenario], weights: Dict[str, float],
+              sim: SimSettings = SimSettings(), workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Evaluates every combination in parallel and returns results ranked best-first."""
+    combos = expand_grid(grid)
+    workers = workers or os.cpu_count() or 1
+    tasks = [(params, scenarios, sim) for params in combos]
+    chunksize = max(1, len(tasks) // (workers * 8))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(evaluate, tasks, chunksize=chunksize))
+
+    for r in results:
+        r["score"] = score(r, weights, sim)
+    return sorted(results, key=lambda r: r["score"], reverse=True)
+
+def write_table(results: List[Dict[str, Any]], path: str):
+    keys = list(results[0]["params"]) if results else []
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["rank", "score", "min_clearance", "gem_rate", "jerk"] + keys)
+        for rank, r in enumerate(results, 1):
+            writer.writerow([rank, f"{r['score']:.4f}", f"{r['min_clearance']:.1f}", f"{r['gem_rate']:.3f}",
+                             f"{r['jerk']:.4f}"] + [r["params"][k] for k in keys])
+
+def _parse_param(spec: str) -> Tuple[str, List[Any]]:
+    path, _, values = spec.partition("=")
+    return path.strip(), [yaml.safe_load(v) for v in values.split(",")]
+
+def _parse_scenario(spec: str, frames: int, seed: int) -> Scenario:
+    if os.path.exists(spec):
+        return Scenario(name="replay", count=0, replay_path=spec)
+    name, _, count = spec.partition(":")
+    return Scenario(name=name, count=int(count or 200), frames=frames, seed=seed)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--param", action="append", default=[], help="dotted.config.path=v1,v2,... (repeatable)")
+    parser.add_argument("--grid", help="YAML file mapping dotted config paths to value lists")
+    parser.add_argument("--scenario", action="append", default=[],
+                        help="scene:count (uniform_swarm, closing_ring, gem_field, mixed) or a detections_*.jsonl replay")
+    parser.add_argument("--frames", type=int, default=300, help="Frames per synthetic scenario")
+    parser.add_argument("--seeds", type=int, default=1, help="Random layouts per synthetic scenario")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: all cores)")
+    parser.add_argument("--w-clearance", type=float, default=1.0)
+    parser.add_argument("--w-gems", type=float, default=1.0)
+    parser.add_argument("--w-jerk", type=float, default=1.0)
+    parser.add_argument("--output", default="sweep_results.csv")
+    parser.add_argument("--top", type=int, default=10, help="Rows to print")
+    args = parser.parse_args(argv)
+
+    grid: Dict[str, List[Any]] = {}
+    if args.grid:
+        with open(args.grid, "r") as f:
+            grid.update(yaml.safe_load(f))
+    grid.update(dict(_parse_param(p) for p in args.param))
+    if not grid:
+        parser.error("Nothing to sweep: pass --param or --grid")
+
+    specs = args.scenario or ["mixed:300", "closing_ring:40", "uniform_swarm:150"]
+    scenarios = []
+    for spec in specs:
+        for seed in range(args.seeds):
+            scenario = _parse_scenario(spec, args.frames, seed)
+            if scenario.replay_path and seed > 0:
+                continue
+            scenarios.append(scenario)
+
+    weights = {"clearance": args.w_clearance, "gems": args.w_gems, "jerk": args.w_jerk}
+    combos = len(expand_grid(grid))
+    print(f"Sweeping {combos} configs x {len(scenarios)} scenarios on {args.workers or os.cpu_count()} workers...")
+
+    start = time.perf_counter()
+    results = run_sweep(grid, scenarios, weights, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    write_table(results, args.output)
+
+    print(f"Done in {elapsed:.1f}s ({combos / elapsed:.1f} configs/s). Ranked table: {args.output}")
+    for rank, r in enumerate(results[:args.top], 1):
+        print(f"{rank:>3}. score={r['score']:.3f} clearance={r['min_clearance']:.1f} "
+              f"gems/s={r['gem_rate']:.3f} jerk={r['jerk']:.4f} {r['params']}")
+
+if __name__ == "__main__":
+    sys.exit(main())
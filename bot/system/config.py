@@ -1,9 +1,129 @@
 import yaml
 import os
+import copy
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+# --- Typed Snapshot ---
+# Hot paths bind these frozen views once per frame instead of walking the YAML dict
+# on every Config.get call. Defaults mirror the fallbacks used across the code base.
+
+@dataclass(frozen=True, slots=True)
+class GameSettings:
+    dimensions: Tuple[int, int] = (1245, 768)
+    image_size: Tuple[int, int] = (960, 608)
+
+@dataclass(frozen=True, slots=True)
+class ForceSettings:
+    attract_target: float = 150.0
+    attract_rune: float = 10.0
+    repel_monster: float = 500.0
+    repulsion_cap: float = 500.0
+    repulsion_range: float = 100.0
+    critical_repulsion_range: float = 50.0
+    critical_boost: float = 2.0
+
+@dataclass(frozen=True, slots=True)
+class PredictionSettings:
+    horizon: float = 1.0
+    tau: float = 0.4
+    max_match_distance: float = 40.0
+    max_monster_speed: float = 150.0
+    max_frame_gap: float = 0.5
+    velocity_smoothing: float = 0.5
+
+@dataclass(frozen=True, slots=True)
+class StickyTargetSettings:
+    min_runes: int = 2
+    better_cluster_multiplier: float = 1.5
+
+@dataclass(frozen=True, slots=True)
+class PilotSettings:
+    grid_cols: int = 4
+    grid_rows: int = 3
+    center_exclusion_radius_sq: float = 2500.0
+    forces: ForceSettings = field(default_factory=ForceSettings)
+    prediction: PredictionSettings = field(default_factory=PredictionSettings)
+    sticky_target: StickyTargetSettings = field(default_factory=StickyTargetSettings)
+
+@dataclass(frozen=True, slots=True)
+class DetectionThresholds:
+    confidence: float
+    iou: float
+
+@dataclass(frozen=True, slots=True)
+class DetectionSettings:
+    enemy: DetectionThresholds = DetectionThresholds(0.4, 0.5)
+    gem: DetectionThresholds = DetectionThresholds(0.6, 0.5)
+
+@dataclass(frozen=True, slots=True)
+class ControlSettings:
+    enabled: bool = False
+    rate_hz: float = 120.0
+    smoothing: float = 0.35
+    max_extrapolation: float = 0.25
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    game: GameSettings = field(default_factory=GameSettings)
+    pilot: PilotSettings = field(default_factory=PilotSettings)
+    detection: DetectionSettings = field(default_factory=DetectionSettings)
+    control: ControlSettings = field(default_factory=ControlSettings)
+
+def _section(cls, raw: Optional[Dict[str, Any]], **nested):
+    """Builds a settings dataclass from a YAML mapping, coercing each field to its default's type."""
+    raw = raw or {}
+    defaults = cls()
+    values = {}
+    for name in cls.__slots__:
+        if name in nested:
+            values[name] = nested[name]
+            continue
+        default = getattr(defaults, name)
+        if name not in raw:
+            values[name] = default
+        elif isinstance(default, tuple):
+            values[name] = tuple(type(d)(v) for d, v in zip(default, raw[name]))
+        else:
+            values[name] = type(default)(raw[name])
+    return cls(**values)
+
+def _thresholds(raw: Optional[Dict[str, Any]], default: DetectionThresholds) -> DetectionThresholds:
+    raw = raw or {}
+    return DetectionThresholds(float(raw.get("confidence", default.confidence)), float(raw.get("iou", default.iou)))
+
+def compile_settings(raw: Dict[str, Any]) -> Settings:
+    """Compiles the raw YAML dict into a typed, immutable Settings snapshot."""
+    pilot = raw.get("pilot") or {}
+    grid = pilot.get("grid") or {}
+    detection = raw.get("detection") or {}
+    defaults = DetectionSettings()
+    return Settings(
+        game=_section(GameSettings, raw.get("game")),
+        pilot=_section(
+            PilotSettings,
+            {"center_exclusion_radius_sq": pilot.get("center_exclusion_radius_sq", PilotSettings().center_exclusion_radius_sq),
+             "grid_cols": grid.get("cols", PilotSettings().grid_cols),
+             "grid_rows": grid.get("rows", PilotSettings().grid_rows)},
+            forces=_section(ForceSettings, pilot.get("forces")),
+            prediction=_section(PredictionSettings, pilot.get("prediction")),
+            sticky_target=_section(StickyTargetSettings, pilot.get("sticky_target")),
+        ),
+        detection=DetectionSettings(
+            enemy=_thresholds(detection.get("enemy"), defaults.enemy),
+            gem=_thresholds(detection.get("gem"), defaults.gem),
+        ),
+        control=_section(ControlSettings, raw.get("control")),
+    )
 
 class Config:
     _instance = None
     _config = None
+    _path = None
+    _mtime = None
+    snapshot: Settings = Settings()
 
     def __new__(cls):
         if cls._instance is None:
@@ -22,6 +142,9 @@ class Config:
             if os.path.exists(path):
                 with open(path, 'r') as f:
                     self._config = yaml.safe_load(f)
+                self._path = path
+                self._mtime = os.path.getmtime(path)
+                self.snapshot = compile_settings(self._config)
                 return
         
         if self._config is None:
@@ -29,6 +152,34 @@ class Config:
              pass
              self._config = {}
 
+    def reload(self) -> bool:
+        """
+        Re-reads config.yaml and atomically swaps in a new snapshot.
+        On a parse or type error the previous config stays active.
+        """
+        if not self._path:
+            return False
+        try:
+            mtime = os.path.getmtime(self._path)
+            with open(self._path, 'r') as f:
+                raw = yaml.safe_load(f) or {}
+            snapshot = compile_settings(raw)
+        except (OSError, yaml.YAMLError, TypeError, ValueError) as e:
+            logging.getLogger("VS_Bot").error(f"[Config] Reload failed, keeping previous config: {e}")
+            return False
+
+        self._config = raw
+        self.snapshot = snapshot
+        self._mtime = mtime
+        logging.getLogger("VS_Bot").info(f"[Config] Reloaded {self._path}")
+        return True
+
+    def changed_on_disk(self) -> bool:
+        try:
+            return self._path is not None and os.path.getmtime(self._path) != self._mtime
+        except OSError:
+            return False
+
     def get(self, path=None, default=None):
         if not path:
             return self._config
@@ -42,5 +193,35 @@ class Config:
         except (KeyError, TypeError):
             return default
 
+    def set(self, path, value):
+        """Overrides a dotted config path in memory (e.g. for offline parameter sweeps)."""
+        raw = copy.deepcopy(self._config)
+        keys = path.split('.')
+        node = raw
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        node[keys[-1]] = value
+        self.snapshot = compile_settings(raw)
+        self._config = raw
+
+class ConfigWatcher(threading.Thread):
+    """Polls config.yaml and hot-reloads it when the file changes."""
+    def __init__(self, config: Config, interval: float = 1.0):
+        super().__init__()
+        self.daemon = True
+        self.config = config
+        self.interval = interval
+        self.stop_event = threading.Event()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.is_alive():
+            self.join()
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            if self.config.changed_on_disk():
+                self.config.reload()
+
 # Global instance
 config = Config()
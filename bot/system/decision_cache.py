@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+from bot.system.config import config
+from bot.system.logger import logger
+
+def make_key(weapons: Sequence[str], passives: Sequence[str], options: Sequence[Optional[str]],
+             resources: Optional[Dict[str, int]] = None) -> str:
+    """
+    Canonical hash of a level-up situation. Inventory order doesn't matter; option order
+    does, since decisions refer to slots.
+    """
+    payload = {
+        "weapons": sorted(weapons),
+        "passives": sorted(passives),
+        "options": list(options),
+        "resources": dict(sorted((resources or {}).items())),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+class DecisionCache:
+    """
+    Two-tier cache of level-up decisions: an in-memory LRU in front of a SQLite table that
+    persists across runs. Entries older than the TTL are dropped; the table is trimmed to
+    max_rows by least recent use.
+    """
+    def __init__(self, path: Optional[str] = None, capacity: Optional[int] = None,
+                 ttl: Optional[float] = None, max_rows: Optional[int] = None):
+        self.path = path or config.get("llm.cache.path", "training_data/decision_cache.sqlite")
+        self.capacity = capacity or config.get("llm.cache.memory_entries", 512)
+        self.ttl = ttl if ttl is not None else config.get("llm.cache.ttl_days", 30) * 86400
+        self.max_rows = max_rows or config.get("llm.cache.max_rows", 20000)
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict() # key -> (decision, created)
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "expired": 0, "evicted": 0}
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS decisions (
+                key TEXT PRIMARY KEY,
+                decision TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS decisions_last_used ON decisions (last_used)")
+        self._purge_expired()
+        self._db.commit()
+
+    def _purge_expired(self):
+        if self.ttl > 0:
+            cursor = self._db.execute("DELETE FROM decisions WHERE created < ?", (time.time() - self.ttl,))
+            self.stats["expired"] += cursor.rowcount
+
+    def _fresh(self, created: float) -> bool:
+        return self.ttl <= 0 or time.time() - created < self.ttl
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and self._fresh(entry[1]):
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return dict(entry[0])
+
+            row = self._db.execute("SELECT decision, created FROM decisions WHERE key = ?", (key,)).fetchone()
+            if row and self._fresh(row[1]):
+                decision = json.loads(row[0])
+                self._db.execute("UPDATE decisions SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+                self._db.commit()
+                self._remember(key, decision, row[1])
+                self.stats["disk_hits"] += 1
+                return dict(decision)
+
+            if row or entry:
+                self._memory.pop(key, None)
+                self._db.execute("DELETE FROM decisions WHERE key = ?", (key,))
+                self._db.commit()
+                self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, key: str, decision: Dict[str, Any]):
+        now = time.time()
+        with self._lock:
+            self._remember(key, dict(decision), now)
+            self._db.execute("INSERT OR REPLACE INTO decisions (key, decision, created, last_used) VALUES (?, ?, ?, ?)",
+                             (key, json.dumps(decision), now, now))
+            excess = self._db.execute("SELECT COUNT(*) FROM decisions").fetchone()[0] - self.max_rows
+            if excess > 0:
+                self._db.execute("DELETE FROM decisions WHERE key IN (SELECT key FROM decisions ORDER BY last_used LIMIT ?)", (excess,))
+                self.stats["evicted"] += excess
+            self._db.commit()
+            self.stats["stores"] += 1
+
+    def _remember(self, key: str, decision: Dict[str, Any], created: float):
+        self._memory[key] = (decision, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            return dict(self.stats, lookups=lookups, hit_rate=hits / lookups if lookups else 0.0,
+                        memory_entries=len(self._memory))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+        logger.debug(f"[DecisionCache] Closed: {self.stats}")
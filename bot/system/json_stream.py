@@ -0,0 +1,66 @@
+import json
+from typing import Any, Dict, Optional
+
+class ObjectExtractor:
+    """
+    Incremental scanner for a streamed JSON document. feed() text chunks as they arrive;
+    it returns the parsed value of the top-level object member `key` as soon as that
+    object's closing brace has been seen, long before the rest of the document is done.
+    String contents (including escaped quotes and braces) are skipped correctly.
+    """
+    def __init__(self, key: str):
+        self.key = key
+        self.text = ""
+        self.pos = 0 # Characters scanned so far
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.string_start = -1
+        self.last_string: Optional[str] = None # Most recent complete string at depth 1
+        self.awaiting_value = False # Saw `"key":` at depth 1
+        self.value_start = -1
+        self.result: Optional[Dict[str, Any]] = None
+
+    def feed(self, chunk: str) -> Optional[Dict[str, Any]]:
+        self.text += chunk
+        if self.result is not None:
+            return None
+        text = self.text
+
+        for i in range(self.pos, len(text)):
+            c = text[i]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif c == "\\":
+                    self.escape = True
+                elif c == '"':
+                    self.in_string = False
+                    if self.depth == 1:
+                        self.last_string = text[self.string_start + 1:i]
+                continue
+
+            if c == '"':
+                self.in_string = True
+                self.string_start = i
+            elif c == ":" and self.depth == 1:
+                self.awaiting_value = self.last_string == self.key
+            elif c in "{[":
+                if c == "{" and self.depth == 1 and self.awaiting_value:
+                    self.value_start = i
+                self.awaiting_value = False
+                self.depth += 1
+            elif c in "}]":
+                self.depth -= 1
+                if self.depth == 1 and self.value_start >= 0:
+                    self.pos = i + 1
+                    try:
+                        self.result = json.loads(text[self.value_start:i + 1])
+                    except ValueError:
+                        self.value_start = -1
+                        continue
+                    return self.result
+            elif c == "," and self.depth == 1:
+                self.awaiting_value = False
+        self.pos = len(text)
+        return None
@@ -1,11 +1,10 @@
 import os
 import json
 import logging
-from typing import Optional, Dict, Any, List
+import threading
+from typing import Optional, Dict, Any, List, Callable, Tuple
 from PIL import Image
 from dotenv import load_dotenv
-import base64
-import io
 from litellm import completion
 import time
 
@@ -23,13 +22,58 @@ logging.getLogger("LiteLLM").setLevel(logging.WARNING) # Case sensitive fix
 logger = logging.getLogger(__name__)
 
 from bot.system.config import config
+from bot.knowledge_base.evolution_index import KnowledgeBase
+from bot.system.decision_cache import DecisionCache, make_key
+from bot.system.llm_payload import PayloadSettings, encode_image
+from bot.system.json_stream import ObjectExtractor
+from bot.system.llm_router import Endpoint, LLMRouter
+from bot.system.log_writer import shared_writer
 import warnings
 
 # Suppress Pydantic serialization warnings typically caused by LiteLLM interactions
 warnings.filterwarnings("ignore", category=UserWarning, module="pydantic")
 
+# Schema Definition (OpenAI Structured Outputs Format). The decision comes first so a
+# streamed response can be acted on before the analysis prose is generated.
+DECISION_SCHEMA = {
+    "name": "game_decision",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "decision": {
+                "type": "object",
+                "properties": {
+                    "action": {"type": "string", "enum": ["select", "reroll", "skip", "banish"]},
+                    "slot": {"type": "integer"},
+                    "item_name": {"type": "string"}
+                },
+                "required": ["action", "slot", "item_name"],
+                "additionalProperties": False
+            },
+            "analysis": {
+                "type": "object",
+                "properties": {
+                    "visible_options": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "List the names of the 3 or 4 items visible in the screenshot, from top to bottom."
+                    },
+                    "strategy_fit": {"type": "string"},
+                    "slot_management": {"type": "string"},
+                    "survival_vs_optimization": {"type": "string"}
+                },
+                "required": ["visible_options", "strategy_fit", "slot_management", "survival_vs_optimization"],
+                "additionalProperties": False
+            }
+        },
+        "required": ["decision", "analysis"],
+        "additionalProperties": False
+    }
+}
+
 class LLMClient:
-    def __init__(self):
+    def __init__(self, kb: Optional[KnowledgeBase] = None):
         self.model_name = config.get("llm.model", "gemini/gemini-1.5-flash")
         self.api_key_env_var = config.get("llm.api_key_env_var", "GOOGLE_API_KEY")
         self.api_base = config.get("llm.api_base", None)
@@ -38,19 +82,11 @@ class LLMClient:
         if not self.api_key and "ollama" not in self.model_name: # Ollama might not need a key
              logger.warning(f"{self.api_key_env_var} not found in environment variables.")
 
-        # Load evolution knowledge base
-        self.evolutions = []
-        try:
-            with open("bot/knowledge_base/evolutions.json", "r") as f:
-                self.evolutions = json.load(f)
-        except FileNotFoundError:
-            logger.warning("evolutions.json not found. Running without evolution context.")
-
-        try:
-            with open("bot/knowledge_base/sample_strategy.json", "r") as f:
-                self.sample_strategy = json.load(f)
-        except FileNotFoundError:
-            logger.warning("sample_strategy.json not found. Running without sample strategy context.")
+        # Evolution chart and sample builds, indexed by item so each request only
+        # carries the rows touching the inventory and the options on screen
+        self.kb = kb or KnowledgeBase()
+        self.evolutions = self.kb.tracker() # synced to each request's inventory
+        self._evolutions_lock = threading.Lock()
 
         # Logging Setup
         self.log_enabled = True # Could drive from config
@@ -60,26 +96,36 @@ class LLMClient:
             
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         self.log_filename = os.path.join(self.output_dir, f"decisions_{timestamp}.jsonl")
+        self._log_stream = None # Opened on the shared writer with the first decision
+        self._log_stream_name = None
+
+        # Screenshot payload (crop / downscale / encoding) and optional frame dump for
+        # tests/bench_llm_payload.py
+        self.payload_settings = PayloadSettings.from_config()
+        self.last_payload: Dict[str, Any] = {}
+        self.frames_dir = os.path.join(self.output_dir, "level_up_frames") if config.get("llm.save_frames", False) else None
 
         # Initialize Static System Content for Caching
         self.static_system_content = self._get_system_content()
 
-    def _image_to_base64(self, image: Image.Image) -> str:
-        buffered = io.BytesIO()
-        image.save(buffered, format="JPEG")
-        return base64.b64encode(buffered.getvalue()).decode("utf-8")
+        # Decisions for situations seen before (inventory + recognised options)
+        self.cache = DecisionCache() if config.get("llm.cache.enabled", True) else None
 
-    def _get_system_content(self) -> str:
-        """Returns the static part of the prompt that can be cached."""
-        evolutions_str = json.dumps(self.evolutions[:50], indent=2) # Limit context if large
-        sample_strategy_str = json.dumps(self.sample_strategy, indent=2)
+        # Act on the decision as soon as it has streamed in
+        self.stream = config.get("llm.stream", True)
 
+        # Several endpoints (remote model, local LM Studio/Ollama): route to the fastest
+        # and hedge onto the next when it is slow. Otherwise the single llm.model is used.
+        endpoints = [Endpoint.from_config(raw) for raw in config.get("llm.endpoints", None) or []]
+        self.router = LLMRouter(endpoints) if endpoints else None
+
+    def _get_system_content(self) -> str:
+        """Returns the static part of the prompt that can be cached (no per-run data)."""
         return f"""
         You are the Grand Strategist AI for Vampire Survivors. Your objective is to build an invincible endgame loadout by mastering "Slot Economy" and "Pool Pruning."
 
         ### STRATEGIC INTELLIGENCE
-        - **Samples of Target Builds/Strategies you COULD follow**: {sample_strategy_str}
-        - **Evolution & Union Chart**: {evolutions_str}
+        - **Evolution & Union Chart** and **Sample Builds**: each request lists the rows that involve your inventory or the options on screen.
         - **The Union Rule**: Remember that Unions (e.g., Peachone + Ebony Wings) merge two weapons into ONE slot, liberating a slot for a future weapon.
 
         ### DECISION HIERARCHY (Priority Order)
@@ -96,23 +142,23 @@ class LLMClient:
         Analyze the number of options on the Level Up screen. You must decide: 
         Is it better to **COMMIT** to a new item, **UPGRADE** an existing one, or **PRUNE** the pool to protect your future build?
 
-        **Output Format (JSON)**:
+        **Output Format (JSON)** - write "decision" FIRST, then explain it in "analysis":
         {{
+            "decision": {{
+                "action": "select" | "reroll" | "skip" | "banish",
+                "slot": int (1-4),
+                "item_name": "Name of item"
+            }},
             "analysis": {{
                 "visible_options": ["List of items seen on screen (Top to Bottom)"],
                 "strategy_fit": "Does anything on screen complete an evolution or fit the long-term plan?",
                 "slot_management": "How many slots remain, and can a Union free one up later?",
                 "survival_vs_optimization": "Comparison of the value of an incremental upgrade vs. the value of a Banish/Skip."
-            }},
-            "decision": {{
-                "action": "select" | "reroll" | "skip" | "banish",
-                "slot": int (1-4),
-                "item_name": "Name of item"
             }}
         }}
         """
 
-    def _get_user_content(self, game_state: Dict[str, Any]) -> str:
+    def _get_user_content(self, game_state: Dict[str, Any], options: Optional[List[Optional[str]]] = None) -> str:
         """Returns the dynamic part of the prompt based on current game state."""
         inventory_str = json.dumps(game_state, indent=2)
         
@@ -144,18 +190,90 @@ class LLMClient:
         - If you see an item on screen that you already have, selecting it means **UPGRADING** it.
         - If you see an item you don't have, selecting it means **ACQUIRING** it.
         - **Evolved Weapons** (like Holy Wand, Death Spiral) NEVER appear on Level Up screens. If you think you see one, look closer; it's likely the base weapon or something else.
+        """ + self._get_knowledge_content(game_state, options) + self._get_options_content(options)
+
+    def _get_knowledge_content(self, game_state: Dict[str, Any], options: Optional[List[Optional[str]]]) -> str:
+        """Evolution/union rows and sample builds touching owned or offered items."""
+        items = list(game_state.get("weapons", [])) + list(game_state.get("passives", [])) + [o for o in options or [] if o]
+        rows = self.kb.relevant_evolution_rows(items)
+        builds = self.kb.relevant_builds(items, limit=config.get("llm.prompt.max_builds", 2))
+
+        chart = "\n".join(f"        - {r['base_weapon']} + {r['passive_item'] or '(nothing)'} -> {r['evolution']}" for r in rows)
+        return f"""
+        ### RELEVANT KNOWLEDGE
+        - **Evolution & Union Chart** (base + requirement -> result):
+{chart or "        - (none for your current items)"}
+        - **Matching Sample Builds**: {json.dumps(builds) if builds else "none yet; pick items that start a strong evolution"}
+        """ + self._get_evolution_status(game_state, options)
+
+    def _get_evolution_status(self, game_state: Dict[str, Any], options: Optional[List[Optional[str]]]) -> str:
+        """What each option does for evolutions, precomputed so the model doesn't have to work it out."""
+        owned = list(game_state.get("weapons", [])) + list(game_state.get("passives", []))
+        with self._evolutions_lock:
+            self.evolutions.sync(owned)
+            one_away = self.evolutions.one_away()
+            ready = [e.name for e in self.evolutions.ready()]
+            verdicts = []
+            for name in dict.fromkeys(o for o in options or [] if o):
+                completed = [e.name for e in self.evolutions.completes(name)]
+                freed = self.evolutions.slots_freed(name)
+                if completed:
+                    verdict = f"COMPLETES {', '.join(completed)}" + (f" (union, frees {freed} weapon slot)" if freed else "")
+                elif self.evolutions.is_dead_end(name):
+                    verdict = "dead end (no evolution left to build with it)"
+                else:
+                    verdict = f"part of {self.evolutions.progress(name)} open evolution(s)"
+                verdicts.append(f"        - {name}: {verdict}")
+
+        lines = verdicts + [f"        - One item away: {evo} needs {item}" for evo, item in one_away.items()]
+        lines += [f"        - Ready to evolve (max level + chest): {', '.join(ready)}"] if ready else []
+        if not lines:
+            return ""
+        return """
+        ### EVOLUTION STATUS
+""" + "\n".join(lines) + "\n"
+
+    def _get_options_content(self, options: Optional[List[Optional[str]]]) -> str:
+        """Options read locally from the card icons, so the model doesn't have to OCR them."""
+        if not options:
+            return ""
+        lines = "\n".join(f"        {i}. {name or 'UNREADABLE (check the screenshot)'}" for i, name in enumerate(options, 1))
+        return f"""
+        ### RECOGNISED OPTIONS (Slot: Item, top to bottom)
+{lines}
         """
 
-    def get_decision(self, frame_image: Image.Image, game_state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _cache_key(self, game_state: Dict[str, Any], options: Optional[List[Optional[str]]],
+                   resources: Optional[Dict[str, int]]) -> Optional[str]:
+        # Only fully recognised screens identify the situation
+        if self.cache is None or not options or None in options:
+            return None
+        return make_key(game_state.get("weapons", []), game_state.get("passives", []), options, resources)
+
+    def get_decision(self, frame_image: Image.Image, game_state: Dict[str, Any],
+                     options: Optional[List[Optional[str]]] = None,
+                     resources: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
         """
         Sends the screenshot and game state to the LLM to get a level-up decision.
-        Uses Context Caching for the system prompt.
+        Uses Context Caching for the system prompt. options: locally recognised item names;
+        with resources (reroll/skip/banish left) they key the decision cache, which is
+        checked before any request is made. Cache hits come back with source "cache".
         """
-        user_prompt = self._get_user_content(game_state)
+        cache_key = self._cache_key(game_state, options, resources)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached and cached.get("action") == "select":
+                logger.info(f"Cached decision: {cached}")
+                return dict(cached, source="cache")
+
+        user_prompt = self._get_user_content(game_state, options)
         
+        if self.frames_dir:
+            os.makedirs(self.frames_dir, exist_ok=True)
+            frame_image.save(os.path.join(self.frames_dir, f"{time.time():.3f}.png"))
+
         # Prepare content for LiteLLM (Standard OpenAI Multimodal Format)
-        base64_image = self._image_to_base64(frame_image)
-        image_url = f"data:image/jpeg;base64,{base64_image}"
+        image_url, self.last_payload = encode_image(frame_image, self.payload_settings)
         
         messages = [
             {
@@ -180,107 +298,146 @@ class LLMClient:
             }
         ]
         
-        # Schema Definition (OpenAI Structured Outputs Format)
-        decision_schema = {
-            "name": "game_decision",
-            "strict": True,
-            "schema": {
-                "type": "object",
-                "properties": {
-                    "analysis": {
-                        "type": "object",
-                        "properties": {
-                            "visible_options": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                                "description": "List the names of the 3 or 4 items visible in the screenshot, from top to bottom."
-                            },
-                            "strategy_fit": {"type": "string"},
-                            "slot_management": {"type": "string"},
-                            "survival_vs_optimization": {"type": "string"}
-                        },
-                        "required": ["visible_options", "strategy_fit", "slot_management", "survival_vs_optimization"],
-                        "additionalProperties": False
-                    },
-                    "decision": {
-                        "type": "object",
-                        "properties": {
-                            "action": {"type": "string", "enum": ["select", "reroll", "skip", "banish"]},
-                            "slot": {"type": "integer"},
-                            "item_name": {"type": "string"}
-                        },
-                        "required": ["action", "slot", "item_name"],
-                        "additionalProperties": False
-                    }
-                },
-                "required": ["analysis", "decision"],
-                "additionalProperties": False
-            }
-        }
-
-        # LiteLLM Arguments
+        # LiteLLM Arguments (model, key and base come from the endpoint)
         kwargs = {
-            "model": self.model_name,
             "messages": messages,
-            "response_format": { "type": "json_schema", "json_schema": decision_schema } 
+            "response_format": { "type": "json_schema", "json_schema": DECISION_SCHEMA } 
         }
-        
-        if self.api_key:
-            kwargs["api_key"] = self.api_key
-        
-        if self.api_base:
-            kwargs["api_base"] = self.api_base
+        request = self._stream_decision if self.stream else self._complete_decision
 
+        start = time.perf_counter()
         try:
-            response = completion(**kwargs)
-            
-            # Log usage for verification if available
-            token_usage_Log = {}
-            if hasattr(response, 'usage'):
-                usage = response.usage
-                # logger.info(f"Token Usage: {usage}")
-                
-                # Extract Usage Stats safely
-                token_usage_Log = {
-                    "prompt_tokens": getattr(usage, "prompt_tokens", 0),
-                    "completion_tokens": getattr(usage, "completion_tokens", 0),
-                    "total_tokens": getattr(usage, "total_tokens", 0),
-                    "cached_tokens": 0
-                }
-                
-                # Handle Prompt Token Details for Caching
-                if hasattr(usage, "prompt_tokens_details"):
-                     details = usage.prompt_tokens_details
-                     token_usage_Log["cached_tokens"] = getattr(details, "cached_tokens", 0)
-
-            content = response.choices[0].message.content   
-            result = json.loads(content)
-            
-            # Schema guarantees 'decision' key exists and is valid
-            if "decision" in result:
-                logger.info(f"LLM Analysis: {result['decision']}")
-                
-                # [NEW] Log to JSONL
-                if self.log_enabled:
-                    try:
-                        inventory_str = json.dumps(game_state, indent=2)
-                        log_entry = {
-                            "timestamp": time.time(),
-                            "inventory_str": inventory_str,
-                            "llm_output": result,
-                            "token_usage": token_usage_Log 
-                        }
-                        with open(self.log_filename, "a", encoding='utf-8') as f:
-                            json.dump(log_entry, f)
-                            f.write('\n')
-                    except Exception as loc_e:
-                        logger.error(f"Failed to log LLM decision: {loc_e}")
-
-                return result["decision"]
-            
-            logger.error(f"Schema violation: 'decision' key missing in {result}")
-            return None
-            
+            if self.router:
+                (decision, finish), endpoint = self.router.call(
+                    lambda endpoint, cancel: request(endpoint, kwargs, game_state, cancel))
+            else:
+                endpoint = Endpoint("default", self.model_name, self.api_base, self.api_key)
+                decision, finish = request(endpoint, kwargs, game_state, threading.Event())
         except Exception as e:
             logger.error(f"LLM call failed: {e}")
             return None
+
+        # Canonical items.json spelling, so the cache, policy and inventory agree
+        match = self.kb.names.resolve(decision.get("item_name") or "")
+        if match:
+            decision["item_name"] = match.name
+        logger.info(f"LLM Decision ({endpoint.name}, {time.perf_counter() - start:.2f}s): {decision}")
+        finish()
+        # Reroll/skip/banish depend on resources left, which aren't read yet (not in the key)
+        if cache_key and decision.get("action") == "select":
+            self.cache.put(cache_key, decision)
+        return decision
+
+    @staticmethod
+    def _endpoint_kwargs(endpoint: Endpoint) -> Dict[str, Any]:
+        kwargs = {"model": endpoint.model}
+        if endpoint.api_key:
+            kwargs["api_key"] = endpoint.api_key
+        if endpoint.api_base:
+            kwargs["api_base"] = endpoint.api_base
+        return kwargs
+
+    def _complete_decision(self, endpoint: Endpoint, kwargs: Dict[str, Any], game_state: Dict[str, Any],
+                           cancel: threading.Event) -> Tuple[Dict[str, Any], Callable[[], None]]:
+        """
+        One blocking request. Returns the decision and a callback that logs the full
+        response, run only for the request whose answer is used. Raises on failure so the
+        router can fall back to another endpoint.
+        """
+        response = completion(**kwargs, **self._endpoint_kwargs(endpoint))
+        usage = getattr(response, "usage", None)
+        result = json.loads(response.choices[0].message.content)
+        if not isinstance(result.get("decision"), dict):
+            raise ValueError(f"Schema violation: 'decision' key missing in {result}")
+        return result["decision"], lambda: self._log_decision(game_state, result, self._usage_log(usage))
+
+    def _stream_decision(self, endpoint: Endpoint, kwargs: Dict[str, Any], game_state: Dict[str, Any],
+                         cancel: threading.Event) -> Tuple[Dict[str, Any], Callable[[], None]]:
+        """
+        Streams the response and returns the decision as soon as its object closes (the
+        schema puts it first). The callback keeps reading the analysis on a background
+        thread and writes it to the decision log when complete. Stops reading (and closes
+        the stream) once cancel is set, i.e. another endpoint answered first.
+        """
+        chunks = iter(completion(**kwargs, **self._endpoint_kwargs(endpoint),
+                                 stream=True, stream_options={"include_usage": True}))
+        extractor = ObjectExtractor("decision")
+        usage = [None]
+        decision = None
+        for chunk in chunks:
+            if cancel.is_set():
+                close = getattr(chunks, "close", None)
+                if close:
+                    close()
+                raise RuntimeError(f"{endpoint.name} cancelled")
+            decision = self._feed_chunk(chunk, extractor, usage)
+            if decision:
+                break
+
+        def drain() -> Optional[Dict[str, Any]]:
+            try:
+                for chunk in chunks:
+                    self._feed_chunk(chunk, extractor, usage)
+                return json.loads(extractor.text)
+            except Exception as e:
+                logger.error(f"LLM stream ended badly after {len(extractor.text)} chars: {e}")
+                return None
+
+        def log(result: Optional[Dict[str, Any]]):
+            if result:
+                self._log_decision(game_state, result, self._usage_log(usage[0]))
+
+        if decision:
+            return decision, lambda: threading.Thread(target=lambda: log(drain()), name="LLMStreamDrain",
+                                                      daemon=True).start()
+
+        # Stream ended without a decision object closing early: parse the whole document
+        result = drain()
+        if not result or not isinstance(result.get("decision"), dict):
+            raise ValueError(f"Schema violation: 'decision' key missing in {extractor.text[:200]}")
+        return result["decision"], lambda: log(result)
+
+    @staticmethod
+    def _feed_chunk(chunk, extractor: ObjectExtractor, usage: list) -> Optional[Dict[str, Any]]:
+        if getattr(chunk, "usage", None):
+            usage[0] = chunk.usage
+        if not chunk.choices:
+            return None
+        delta = getattr(chunk.choices[0].delta, "content", None)
+        return extractor.feed(delta) if delta else None
+
+    def _usage_log(self, usage) -> Dict[str, Any]:
+        """Token usage for the decision log (also recorded in last_payload)."""
+        if usage is None:
+            return {}
+        token_usage_Log = {
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+            "completion_tokens": getattr(usage, "completion_tokens", 0),
+            "total_tokens": getattr(usage, "total_tokens", 0),
+            "cached_tokens": 0
+        }
+        self.last_payload["prompt_tokens"] = token_usage_Log["prompt_tokens"]
+        
+        # Handle Prompt Token Details for Caching
+        details = getattr(usage, "prompt_tokens_details", None)
+        if details is not None:
+            token_usage_Log["cached_tokens"] = getattr(details, "cached_tokens", 0)
+        return token_usage_Log
+
+    def _log_decision(self, game_state: Dict[str, Any], result: Dict[str, Any], token_usage: Dict[str, Any]):
+        """Queues the entry on the background log writer; serialization happens there."""
+        if not self.log_enabled:
+            return
+        if self._log_stream is None or self._log_stream_name != self.log_filename:
+            self._log_stream, self._log_stream_name = shared_writer().open(self.log_filename), self.log_filename
+        # Copy what the game loop keeps mutating after the decision is applied
+        inventory = {k: list(v) if isinstance(v, list) else v for k, v in game_state.items()}
+        payload = dict(self.last_payload)
+        timestamp = time.time()
+        self._log_stream.write(lambda: {
+            "timestamp": timestamp,
+            "inventory_str": json.dumps(inventory, indent=2),
+            "llm_output": result,
+            "token_usage": token_usage,
+            "payload": payload
+        })
@@ -0,0 +1,66 @@
+import base64
+import io
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image
+
+from bot.system.config import config
+
+MIME_TYPES = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp"}
+
+@dataclass(frozen=True, slots=True)
+class PayloadSettings:
+    crop: Optional[Tuple[float, float, float, float]] = None # x, y, w, h as fractions of the frame
+    max_side: int = 0 # 0 = keep resolution
+    format: str = "JPEG"
+    quality: int = 75
+
+    @classmethod
+    def from_config(cls, raw: Optional[Dict[str, Any]] = None) -> "PayloadSettings":
+        raw = config.get("llm.payload", {}) if raw is None else raw
+        crop = raw.get("crop")
+        return cls(
+            crop=tuple(float(v) for v in crop) if crop else None,
+            max_side=int(raw.get("max_side", 0)),
+            format=str(raw.get("format", "JPEG")).upper(),
+            quality=int(raw.get("quality", 75)),
+        )
+
+def encode_image(image: Image.Image, settings: PayloadSettings) -> Tuple[str, Dict[str, Any]]:
+    """
+    Crops the frame to the level-up panel, downscales it so its longest side is at most
+    max_side and encodes it. Returns the data URL and per-call payload stats.
+    """
+    start = time.perf_counter()
+    source_size = image.size
+
+    if settings.crop:
+        x, y, w, h = settings.crop
+        width, height = image.size
+        image = image.crop((int(x * width), int(y * height), int((x + w) * width), int((y + h) * height)))
+
+    if settings.max_side and max(image.size) > settings.max_side:
+        scale = settings.max_side / max(image.size)
+        image = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+                             Image.BICUBIC, reducing_gap=3.0) # box-reduce first, then filter
+
+    if settings.format not in MIME_TYPES:
+        raise ValueError(f"Unsupported payload format '{settings.format}' (expected one of {sorted(MIME_TYPES)})")
+    if settings.format == "JPEG" and image.mode != "RGB":
+        image = image.convert("RGB")
+
+    buffered = io.BytesIO()
+    options = {} if settings.format == "PNG" else {"quality": settings.quality}
+    image.save(buffered, format=settings.format, **options)
+    encoded = base64.b64encode(buffered.getvalue()).decode("utf-8")
+
+    stats = {
+        "source_size": list(source_size),
+        "sent_size": list(image.size),
+        "image_bytes": buffered.tell(),
+        "base64_bytes": len(encoded),
+        "encode_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+    return f"data:{MIME_TYPES[settings.format]};base64,{encoded}", stats
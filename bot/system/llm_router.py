@@ -0,0 +1,168 @@
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from bot.system.config import config
+from bot.system.logger import logger
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    model: str
+    api_base: Optional[str] = None
+    api_key: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, raw: Dict[str, Any]) -> "Endpoint":
+        key_var = raw.get("api_key_env_var")
+        return cls(
+            name=raw.get("name") or raw["model"],
+            model=raw["model"],
+            api_base=raw.get("api_base"),
+            api_key=os.environ.get(key_var) if key_var else None,
+        )
+
+class EndpointStats:
+    """Rolling latency samples and recent errors for one endpoint."""
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window) # completed requests only
+        self.censored = deque(maxlen=window) # elapsed time of cancelled ones: lower bounds
+        self.requests = 0
+        self.wins = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.last_error = -math.inf
+
+    def quantile(self, q: float) -> Optional[float]:
+        return float(np.quantile(self.latencies, q)) if self.latencies else None
+
+    def rank_latency(self) -> float:
+        """
+        Median of completed requests. Cancelled requests were cut short, so their elapsed
+        times are only lower bounds: an endpoint that never finished ranks at the longest
+        of them rather than as unmeasured (fastest).
+        """
+        if self.latencies:
+            return self.quantile(0.5)
+        return max(self.censored) if self.censored else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        p50, p95 = self.quantile(0.5), self.quantile(0.95)
+        return {
+            "requests": self.requests, "wins": self.wins, "errors": self.errors, "cancelled": self.cancelled,
+            "p50_s": round(p50, 3) if p50 is not None else None,
+            "p95_s": round(p95, 3) if p95 is not None else None,
+        }
+
+class LLMRouter:
+    """
+    Latency-aware routing with hedged requests. Each call goes to the endpoint with the
+    lowest rolling median latency (endpoints that errored recently go last). If it hasn't
+    answered within its own p95 latency, the same request is also sent to the next
+    endpoint; the first successful answer wins and the others are told to cancel.
+
+    The request function receives (endpoint, cancel_event). A blocking HTTP call can't be
+    aborted mid-flight, but a streaming one should stop reading once cancel_event is set.
+    """
+    def __init__(self, endpoints: List[Endpoint], hedge_delay: Optional[float] = None,
+                 hedge_quantile: Optional[float] = None, min_samples: Optional[int] = None,
+                 cooldown: Optional[float] = None, window: Optional[int] = None):
+        if not endpoints:
+            raise ValueError("LLMRouter needs at least one endpoint")
+        self.endpoints = list(endpoints)
+        self.default_hedge_delay = hedge_delay if hedge_delay is not None else config.get("llm.router.hedge_delay", 3.0)
+        self.min_hedge_delay = config.get("llm.router.min_hedge_delay", 0.05)
+        self.hedge_quantile = hedge_quantile if hedge_quantile is not None else config.get("llm.router.hedge_quantile", 0.95)
+        self.min_samples = min_samples if min_samples is not None else config.get("llm.router.min_samples", 5)
+        self.cooldown = cooldown if cooldown is not None else config.get("llm.router.error_cooldown", 30.0)
+        window = window or config.get("llm.router.window", 50)
+
+        self._lock = threading.Lock()
+        self.stats = {e.name: EndpointStats(window) for e in self.endpoints}
+        self._executor = ThreadPoolExecutor(max_workers=2 * len(self.endpoints), thread_name_prefix="LLMRouter")
+
+    def ranked(self) -> List[Endpoint]:
+        """Healthy endpoints first, then by median latency (unmeasured ones count as fastest)."""
+        now = time.perf_counter()
+        with self._lock:
+            def key(e: Endpoint):
+                s = self.stats[e.name]
+                cooling = now - s.last_error < self.cooldown
+                return (cooling, s.rank_latency())
+            return sorted(self.endpoints, key=key)
+
+    def hedge_delay(self, endpoint: Endpoint) -> float:
+        with self._lock:
+            s = self.stats[endpoint.name]
+            if len(s.latencies) < self.min_samples:
+                return self.default_hedge_delay
+            return max(s.quantile(self.hedge_quantile), self.min_hedge_delay)
+
+    def _record(self, endpoint: Endpoint, outcome: str, elapsed: float):
+        with self._lock:
+            s = self.stats[endpoint.name]
+            if outcome == "win":
+                s.wins += 1
+                s.latencies.append(elapsed)
+            elif outcome == "cancelled":
+                s.cancelled += 1
+                s.censored.append(elapsed) # It took at least this long; kept out of the quantiles
+            else:
+                s.errors += 1
+                s.last_error = time.perf_counter()
+
+    def call(self, request: Callable[[Endpoint, threading.Event], Any]) -> Tuple[Any, Endpoint]:
+        """Runs request on the best endpoint, hedging onto the next ones. Returns (result, endpoint)."""
+        queue = self.ranked()
+        running: Dict[Future, Tuple[Endpoint, threading.Event, float]] = {}
+        last_error: Optional[BaseException] = None
+
+        def launch() -> float:
+            endpoint = queue.pop(0)
+            cancel = threading.Event()
+            with self._lock:
+                self.stats[endpoint.name].requests += 1
+            running[self._executor.submit(request, endpoint, cancel)] = (endpoint, cancel, time.perf_counter())
+            return time.perf_counter() + self.hedge_delay(endpoint)
+
+        hedge_at = launch()
+        while running:
+            timeout = max(hedge_at - time.perf_counter(), 0.0) if queue else None
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                logger.info(f"[LLMRouter] No answer after {self.hedge_delay(running[next(iter(running))][0]):.2f}s, hedging to {queue[0].name}")
+                hedge_at = launch()
+                continue
+
+            for future in done:
+                endpoint, _, started = running.pop(future)
+                elapsed = time.perf_counter() - started
+                error = future.exception()
+                if error is None:
+                    self._record(endpoint, "win", elapsed)
+                    for loser, (other, cancel, other_started) in running.items():
+                        cancel.set()
+                        loser.cancel()
+                        self._record(other, "cancelled", time.perf_counter() - other_started)
+                    return future.result(), endpoint
+
+                logger.warning(f"[LLMRouter] {endpoint.name} failed after {elapsed:.2f}s: {error}")
+                self._record(endpoint, "error", elapsed)
+                last_error = error
+                if queue and not running:
+                    hedge_at = launch() # Fail over right away
+        raise last_error or RuntimeError("All LLM endpoints failed")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: s.summary() for name, s in self.stats.items()}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,241 @@
+import atexit
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Union
+
+from bot.system.config import config
+from bot.system.logger import logger
+
+Record = Union[str, Dict[str, Any], Callable[[], Union[str, Dict[str, Any]]]]
+
+FSYNC_POLICIES = ("never", "flush", "close")
+
+class LogStream:
+    """
+    One JSON-lines file written by a LogWriter. Rotates to path.1 ... path.<backups> once
+    max_bytes of records have gone into the current file; with compress the file is a
+    gzip stream (path ends in .gz) written incrementally.
+    """
+    def __init__(self, writer: "LogWriter", path: str, max_bytes: int = 0, backups: int = 3,
+                 compress: bool = False):
+        if compress and not path.endswith(".gz"):
+            path += ".gz"
+        self.writer = writer
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.compress = compress
+        self.written = 0
+        self.rotations = 0
+        self._file = None
+        self._size = 0 # Bytes of records in the current file
+
+    def write(self, record: Record) -> bool:
+        """Queues a record (dict, line or callable building one). Never blocks; False if dropped."""
+        return self.writer.submit(self, record)
+
+    # Everything below runs on the writer thread
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = gzip.open(self.path, "ab") if self.compress else open(self.path, "ab")
+        self._size = 0 if self.compress else self._file.tell()
+
+    def _write(self, data: bytes):
+        if self._file is None:
+            self._open()
+        elif self.max_bytes and self._size + len(data) > self.max_bytes and self._size:
+            self._rotate()
+        self._file.write(data)
+        self._size += len(data)
+
+    def _rotate(self):
+        self._close(fsync=self.writer.fsync != "never")
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.rotations += 1
+        self._open()
+
+    def _flush(self, fsync: bool):
+        if self._file is None:
+            return
+        self._file.flush()
+        if fsync:
+            raw = self._file.fileobj if self.compress else self._file
+            os.fsync(raw.fileno())
+
+    def _close(self, fsync: bool):
+        if self._file is None:
+            return
+        self._flush(fsync)
+        self._file.close()
+        self._file = None
+
+class LogWriter:
+    """
+    Background writer for JSON-lines logs, so disk I/O never runs on the control thread.
+    Records go through one bounded queue (a full queue drops the record rather than
+    blocking), are serialized on the writer thread and written in batches. Streams are
+    flushed every flush_interval seconds; fsync follows the policy: "never", on every
+    "flush", or only on "close".
+    """
+    def __init__(self, queue_size: Optional[int] = None, batch_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None, fsync: Optional[str] = None):
+        self.queue_size = queue_size or config.get("logging.writer.queue_size", 4096)
+        self.batch_size = batch_size or config.get("logging.writer.batch_size", 256)
+        self.flush_interval = flush_interval if flush_interval is not None else config.get("logging.writer.flush_interval", 1.0)
+        self.fsync = fsync or config.get("logging.writer.fsync", "close")
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{self.fsync}' (expected one of {FSYNC_POLICIES})")
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        self._streams = []
+        self._lock = threading.Lock()
+        self.stats = {"queued": 0, "written": 0, "dropped": 0, "errors": 0, "batches": 0, "flushes": 0,
+                      "bytes": 0, "max_queue": 0}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+        self._thread.start()
+
+    def open(self, path: str, max_bytes: Optional[int] = None, backups: Optional[int] = None,
+             compress: Optional[bool] = None) -> LogStream:
+        stream = LogStream(
+            self, path,
+            max_bytes=max_bytes if max_bytes is not None else config.get("logging.writer.max_bytes", 0),
+            backups=backups if backups is not None else config.get("logging.writer.backups", 3),
+            compress=compress if compress is not None else config.get("logging.writer.compress", False),
+        )
+        with self._lock:
+            self._streams.append(stream)
+        return stream
+
+    def submit(self, stream: LogStream, record: Record) -> bool:
+        if self._closed:
+            self.stats["dropped"] += 1
+            return False
+        try:
+            self._queue.put_nowait((stream, record))
+        except queue.Full:
+            self.stats["dropped"] += 1
+            return False
+        self.stats["queued"] += 1
+        self.stats["max_queue"] = max(self.stats["max_queue"], self._queue.qsize())
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Blocks until everything queued so far is written and flushed."""
+        if self._closed:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put((None, done), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """Writes what is queued, flushes (and fsyncs, unless the policy is "never") and stops."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._queue.put((None, None), timeout=timeout)
+        except queue.Full:
+            logger.warning("[LogWriter] Queue still full at close; pending records are lost.")
+            return
+        self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["pending"] = self._queue.qsize()
+        stats["rotations"] = sum(s.rotations for s in self._streams)
+        return stats
+
+    @staticmethod
+    def _serialize(record: Record) -> bytes:
+        if callable(record):
+            record = record()
+        line = record if isinstance(record, str) else json.dumps(record)
+        return (line.rstrip("\n") + "\n").encode("utf-8")
+
+    def _run(self):
+        dirty = set()
+        dirty_since = 0.0 # When the oldest unflushed record was written
+        while True:
+            timeout = max(dirty_since + self.flush_interval - time.monotonic(), 0.0) if dirty else None
+            try:
+                batch = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch:
+                self.stats["batches"] += 1
+
+            markers = [] # flush() events, None for close()
+            for stream, record in batch:
+                if stream is None:
+                    markers.append(record)
+                    continue
+                try:
+                    data = self._serialize(record)
+                    stream._write(data)
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    logger.error(f"[LogWriter] Failed to write to {stream.path}: {e}")
+                    continue
+                if not dirty:
+                    dirty_since = time.monotonic()
+                dirty.add(stream)
+                stream.written += 1
+                self.stats["written"] += 1
+                self.stats["bytes"] += len(data)
+
+            if dirty and (markers or time.monotonic() - dirty_since >= self.flush_interval):
+                for stream in dirty:
+                    try:
+                        stream._flush(fsync=self.fsync == "flush")
+                    except OSError as e:
+                        logger.error(f"[LogWriter] Failed to flush {stream.path}: {e}")
+                self.stats["flushes"] += 1
+                dirty.clear()
+
+            closing = None in markers
+            if closing:
+                with self._lock:
+                    for stream in self._streams:
+                        try:
+                            stream._close(fsync=self.fsync != "never")
+                        except OSError as e:
+                            logger.error(f"[LogWriter] Failed to close {stream.path}: {e}")
+            for marker in markers:
+                if marker is not None:
+                    marker.set()
+            if closing:
+                return
+
+_shared: Optional[LogWriter] = None
+_shared_lock = threading.Lock()
+
+def shared_writer() -> LogWriter:
+    """The process-wide writer (created on first use, closed at exit)."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = LogWriter()
+            atexit.register(_shared.close)
+        return _shared
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from bot.system.config import config
+from bot.system.logger import logger
+from bot.vision.item_icons import IconIndex, icon_features
+
+Rect = Tuple[float, float, float, float]
+
+class InventoryReader:
+    """
+    Reads the inventory from the HUD: the weapon and passive icon strips in the top-left
+    corner are split into equal slot cells and each cell's hash is looked up in the icon
+    index. Strip rects are fractions of the captured frame (x, y, w, h).
+    """
+    def __init__(self, index: IconIndex, weapons_rect: Optional[Rect] = None,
+                 passives_rect: Optional[Rect] = None, slots: Optional[int] = None):
+        self.index = index
+        self.strips: Dict[str, Rect] = {
+            "weapon": tuple(weapons_rect or config.get("hud.weapons_rect", [0.002, 0.037, 0.158, 0.036])),
+            "passive": tuple(passives_rect or config.get("hud.passives_rect", [0.002, 0.080, 0.158, 0.028])),
+        }
+        self.slots = slots or config.get("hud.slots", 6)
+        self.background = np.array(config.get("hud.background_bgr", [40, 70, 50]), dtype=np.uint8)
+        self.max_distance = config.get("hud.max_distance", config.get("icons.max_distance", 8))
+        self.tolerance = config.get("hud.background_tolerance", 30)
+        self.empty_max_fill = config.get("hud.empty_max_fill", 0.08)
+
+    def region(self, shape: Tuple[int, ...]) -> Tuple[int, int, int, int]:
+        """Pixel box (x0, y0, x1, y1) covering both strips, the only part of a frame read() looks at."""
+        h, w = shape[:2]
+        x0 = min(r[0] for r in self.strips.values())
+        y0 = min(r[1] for r in self.strips.values())
+        x1 = max(r[0] + r[2] for r in self.strips.values())
+        y1 = max(r[1] + r[3] for r in self.strips.values())
+        return int(x0 * w), int(y0 * h), int(np.ceil(x1 * w)), int(np.ceil(y1 * h))
+
+    def _cells(self, frame: np.ndarray, strip: Rect, frame_shape: Tuple[int, ...], origin: Tuple[int, int]):
+        h, w = frame_shape[:2]
+        sx, sy, sw, sh = strip
+        y0, y1 = int(sy * h) - origin[1], int((sy + sh) * h) - origin[1]
+        for i in range(self.slots):
+            x0 = int((sx + sw * i / self.slots) * w) - origin[0]
+            x1 = int((sx + sw * (i + 1) / self.slots) * w) - origin[0]
+            yield frame[max(y0, 0):y1, max(x0, 0):x1]
+
+    def is_empty(self, cell: np.ndarray) -> bool:
+        """An empty slot shows the map: almost no pixels stand out from the background colour."""
+        if cell.size == 0:
+            return True
+        diff = np.abs(cell.astype(np.int16) - self.background.astype(np.int16)).max(axis=2)
+        return (diff > self.tolerance).mean() <= self.empty_max_fill
+
+    def read(self, frame: np.ndarray, frame_shape: Optional[Tuple[int, ...]] = None,
+             origin: Tuple[int, int] = (0, 0)) -> Dict[str, List[Optional[str]]]:
+        """
+        Item names left to right per strip ("weapon", "passive"), None for an occupied
+        slot whose icon isn't in the index. A strip ends at its first empty slot; one that
+        ends on an unreadable cell keeps that trailing None, so a read that may have missed
+        items is never mistaken for the whole strip. frame may be the region() crop of a
+        frame of frame_shape whose top-left corner is origin.
+        """
+        frame_shape = frame_shape or frame.shape
+        inventory = {}
+        for kind, strip in self.strips.items():
+            items = []
+            for cell in self._cells(frame, strip, frame_shape, origin):
+                if self.is_empty(cell):
+                    break
+                name, distance = self.index.lookup(*icon_features(cell, self.background), self.max_distance)
+                if name is None and items and items[-1] is None:
+                    break # Two unreadable cells in a row: past the last slot, on the map
+                items.append(name)
+            inventory[kind] = items
+        return inventory
+
+class InventoryMonitor(threading.Thread):
+    """
+    Keeps GameState's inventory in sync with the HUD off the capture thread. The game loop
+    offers every gameplay frame; one is read every interval seconds, or settle seconds after
+    request() (called once a chest or level-up has been handled). Only the HUD region is
+    copied out of the offered frame.
+    """
+    def __init__(self, reader: InventoryReader, game_state, interval: Optional[float] = None,
+                 settle: Optional[float] = None):
+        super().__init__()
+        self.daemon = True
+        self.reader = reader
+        self.game_state = game_state
+        self.interval = interval if interval is not None else config.get("hud.interval", 3.0)
+        self.settle = settle if settle is not None else config.get("hud.settle", 0.5)
+        self.stop_event = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._pending: Optional[Tuple[np.ndarray, Tuple[int, ...], Tuple[int, int]]] = None
+        self._due = 0.0
+
+        self.reads = 0
+        self.changes = 0
+        self.read_time = 0.0
+
+    def start(self):
+        logger.info(f"Inventory monitor reading the HUD every {self.interval}s...")
+        super().start()
+
+    def stop(self):
+        self.stop_event.set()
+        self._wake.set()
+        if self.is_alive():
+            self.join()
+
+    def request(self, now: Optional[float] = None):
+        """Reads the first frame offered after the settle delay, e.g. once a menu has closed."""
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            self._due = min(self._due, now + self.settle)
+
+    def offer(self, frame: np.ndarray, now: Optional[float] = None) -> bool:
+        """Called per gameplay frame; returns True if this frame was taken for a read."""
+        now = time.perf_counter() if now is None else now
+        with self._lock:
+            if now < self._due:
+                return False
+            self._due = now + self.interval
+            x0, y0, x1, y1 = self.reader.region(frame.shape)
+            self._pending = (frame[y0:y1, x0:x1].copy(), frame.shape, (x0, y0))
+        self._wake.set()
+        return True
+
+    def run(self):
+        while not self.stop_event.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                pending, self._pending = self._pending, None
+            if pending is None:
+                continue
+            try:
+                start = time.perf_counter()
+                inventory = self.reader.read(*pending)
+                changed = self.game_state.sync_inventory(inventory["weapon"], inventory["passive"])
+                self.read_time += time.perf_counter() - start
+                self.reads += 1
+                self.changes += int(changed)
+            except Exception as e:
+                logger.error(f"[InventoryMonitor] HUD read failed: {e}")
+
+    def get_stats(self) -> dict:
+        return {
+            "reads": self.reads,
+            "changes": self.changes,
+            "avg_read_ms": round(1000 * self.read_time / self.reads, 2) if self.reads else 0.0,
+        }
+
+def load_inventory_reader() -> Optional[InventoryReader]:
+    if not config.get("hud.enabled", False):
+        return None
+    # The level-up card index is composited on the card fill, not the HUD background: its
+    # distances don't hold for HUD cells, so it is never used as a stand-in
+    path = config.get("hud.index_path")
+    if not path:
+        logger.warning("hud.enabled is set without hud.index_path; the inventory is only updated from decisions.")
+        return None
+    if not os.path.exists(path):
+        logger.info(f"Icon index not found at {path}; the inventory is only updated from decisions.")
+        return None
+    return InventoryReader(IconIndex.load(path))
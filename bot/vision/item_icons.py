@@ -0,0 +1,167 @@
+import argparse
+import json
+import os
+import re
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from bot.knowledge_base.name_index import NameIndex, normalize
+from bot.system.config import config
+from bot.system.logger import logger
+
+def normalize_name(name: str) -> str:
+    """'Sprite-Gold_Ring.png' / 'Gold Ring' -> 'goldring'."""
+    name = os.path.splitext(os.path.basename(name))[0].lower()
+    name = re.sub(r"^(file[:_])?(sprite|icon)[-_ ]", "", name)
+    name = re.sub(r"[-_ ](sprite|icon)$", "", name)
+    return normalize(name)
+
+def _trim(image: np.ndarray, background: np.ndarray, tolerance: int) -> np.ndarray:
+    """Crops to the pixels that differ from the card background."""
+    mask = np.abs(image.astype(np.int16) - background.astype(np.int16)).max(axis=2) > tolerance
+    ys, xs = np.nonzero(mask)
+    if len(xs) == 0:
+        return image
+    return image[ys.min():ys.max() + 1, xs.min():xs.max() + 1]
+
+def icon_features(image: np.ndarray, background: np.ndarray, tolerance: int = 30) -> Tuple[int, np.ndarray]:
+    """
+    64-bit difference hash of the trimmed icon plus its mean colour. The hash captures
+    the shape; the colour separates recolours such as Silver Ring / Gold Ring.
+    """
+    icon = _trim(image, background, tolerance)
+    gray = cv2.cvtColor(icon, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    value = int(np.packbits(bits).view(">u8")[0])
+    return value, icon.reshape(-1, 3).mean(axis=0).astype(np.float32)
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    """Set bits per uint64."""
+    return np.unpackbits(values.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+class IconIndex:
+    """
+    Item icons keyed by perceptual hash. A lookup XORs the query against every hash at
+    once and counts the differing bits, so any icon within max_distance is found (a few
+    hundred icons take microseconds).
+    """
+    def __init__(self, hashes: Sequence[int], colors: np.ndarray, names: Sequence[str]):
+        self.hashes = [int(h) for h in hashes]
+        self._hashes = np.array(self.hashes, dtype=np.uint64)
+        self.colors = np.asarray(colors, dtype=np.float32).reshape(-1, 3)
+        self.names = list(names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, value: int, color: np.ndarray, max_distance: int = 8) -> Tuple[Optional[str], int]:
+        """Closest (name, hamming distance), colour breaking ties; (None, -1) if none is within max_distance."""
+        if not self.names:
+            return None, -1
+        distances = _popcount(self._hashes ^ np.uint64(value))
+        candidates = np.flatnonzero(distances <= max_distance)
+        if len(candidates) == 0:
+            return None, -1
+        color_distance = np.abs(self.colors[candidates] - color).sum(axis=1)
+        best = candidates[np.lexsort((color_distance, distances[candidates]))[0]]
+        return self.names[best], int(distances[best])
+
+    @classmethod
+    def build(cls, sprites_dir: str, item_names: Sequence[str], background: np.ndarray) -> "IconIndex":
+        """Indexes every sprite whose file name matches (or nearly matches) an item in items.json."""
+        resolver = NameIndex(item_names, cutoff=config.get("icons.name_cutoff", 0.85))
+        hashes, colors, names = [], [], []
+        for filename in sorted(os.listdir(sprites_dir)):
+            match = resolver.resolve(normalize_name(filename), aliases=False)
+            if not match:
+                continue
+            name = match.name
+            image = cv2.imread(os.path.join(sprites_dir, filename), cv2.IMREAD_UNCHANGED)
+            if image is None:
+                logger.warning(f"[IconIndex] Could not read {filename}")
+                continue
+            if image.ndim == 2:
+                image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+            if image.shape[2] == 4:
+                # Composite onto the card background so sprite and screen crops match
+                alpha = image[:, :, 3:4].astype(np.float32) / 255
+                image = (image[:, :, :3] * alpha + background * (1 - alpha)).astype(np.uint8)
+            value, color = icon_features(image, background)
+            hashes.append(value)
+            colors.append(color)
+            names.append(name)
+        logger.info(f"[IconIndex] Indexed {len(names)} item icons from {sprites_dir}")
+        return cls(hashes, np.array(colors).reshape(-1, 3), names)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(path, hashes=np.array(self.hashes, dtype=np.uint64), colors=self.colors, names=np.array(self.names))
+
+    @classmethod
+    def load(cls, path: str) -> "IconIndex":
+        data = np.load(path)
+        return cls(data["hashes"].tolist(), data["colors"], data["names"].tolist())
+
+class OptionRecognizer:
+    """
+    Reads the item on each level-up card: crops the icon area of the slot cells from the
+    level_up menu layout and looks its hash up in the icon index.
+    """
+    def __init__(self, index: IconIndex):
+        self.index = index
+        cells = (config.get("menu.layouts.level_up") or {}).get("cells", {})
+        self.slots = [tuple(cells[k]["rect"]) for k in sorted(cells) if k.startswith("slot_")]
+        self.icon_rect = tuple(config.get("icons.card_icon_rect", [0.02, 0.1, 0.16, 0.8]))
+        self.background = np.array(config.get("icons.background_bgr", [60, 30, 20]), dtype=np.uint8)
+        self.max_distance = config.get("icons.max_distance", 8)
+        self.min_std = config.get("icons.min_card_std", 12.0)
+
+    def _crop(self, frame: np.ndarray, card: Tuple[float, float, float, float]) -> np.ndarray:
+        h, w = frame.shape[:2]
+        cx, cy, cw, ch = card
+        ix, iy, iw, ih = self.icon_rect
+        x0, y0 = int((cx + ix * cw) * w), int((cy + iy * ch) * h)
+        x1, y1 = int((cx + (ix + iw) * cw) * w), int((cy + (iy + ih) * ch) * h)
+        return frame[y0:y1, x0:x1]
+
+    def recognize(self, frame: np.ndarray) -> List[Optional[str]]:
+        """Item names top to bottom, None for a card whose icon isn't in the index."""
+        options = []
+        for card in self.slots:
+            crop = self._crop(frame, card)
+            if crop.size == 0 or crop.std() < self.min_std:
+                break # No card here: fewer than four options on screen
+            name, distance = self.index.lookup(*icon_features(crop, self.background), self.max_distance)
+            logger.debug(f"[OptionRecognizer] slot {len(options) + 1}: {name} (d={distance})")
+            options.append(name)
+        return options
+
+def load_recognizer() -> Optional[OptionRecognizer]:
+    path = config.get("icons.index_path", "model/item_icons.npz")
+    if not os.path.exists(path):
+        logger.info(f"Icon index not found at {path}; level-up options will be read by the LLM.")
+        return None
+    return OptionRecognizer(IconIndex.load(path))
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the level-up icon index from wiki item sprites.")
+    parser.add_argument("--sprites", default="item_icons", help="Directory of downloaded item sprites")
+    parser.add_argument("--items", default=os.path.join(config.get("paths.knowledge_base", "bot/knowledge_base"), "items.json"))
+    parser.add_argument("--out", default=config.get("icons.index_path", "model/item_icons.npz"))
+    parser.add_argument("--background", type=int, nargs=3, metavar=("B", "G", "R"),
+                        default=config.get("icons.background_bgr", [60, 30, 20]),
+                        help="Colour sprites are composited onto (hud.background_bgr for a HUD index)")
+    args = parser.parse_args()
+
+    with open(args.items, "r", encoding="utf-8") as f:
+        item_names = list(json.load(f))
+    background = np.array(args.background, dtype=np.uint8)
+    index = IconIndex.build(args.sprites, item_names, background)
+    index.save(args.out)
+    print(f"Wrote {len(index)} icons to {args.out}")
+
+if __name__ == "__main__":
+    main()
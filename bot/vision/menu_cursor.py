@@ -0,0 +1,110 @@
+import cv2
+import numpy as np
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from bot.system.config import config
+
+# D-pad button -> (dx, dy) on the menu grid
+DIRECTIONS = {
+    "DPAD_UP": (0, -1),
+    "DPAD_DOWN": (0, 1),
+    "DPAD_LEFT": (-1, 0),
+    "DPAD_RIGHT": (1, 0),
+}
+
+class MenuLayout:
+    """
+    A menu as named cells on a grid. Each cell has a screen rect (fractions of the frame:
+    x, y, w, h) used to spot the highlight, and a grid position (col, row) used to plan
+    d-pad moves.
+    """
+    def __init__(self, name: str, cells: Dict[str, Dict]):
+        self.name = name
+        self.rects: Dict[str, Tuple[float, float, float, float]] = {k: tuple(v["rect"]) for k, v in cells.items()}
+        self.positions: Dict[str, Tuple[int, int]] = {k: tuple(v["pos"]) for k, v in cells.items()}
+        self.neighbours = {cell: self._neighbours(cell) for cell in self.positions}
+
+    def _neighbours(self, cell: str) -> Dict[str, str]:
+        """Where each d-pad press lands: the nearest cell in that direction (primary axis first)."""
+        cx, cy = self.positions[cell]
+        out = {}
+        for button, (dx, dy) in DIRECTIONS.items():
+            best, best_key = None, None
+            for other, (ox, oy) in self.positions.items():
+                along = (ox - cx) * dx + (oy - cy) * dy
+                if other == cell or along <= 0:
+                    continue
+                across = abs((ox - cx) * dy) + abs((oy - cy) * dx)
+                key = (along, across)
+                if best_key is None or key < best_key:
+                    best, best_key = other, key
+            if best:
+                out[button] = best
+        return out
+
+    def shortest_path(self, start: str, target: str) -> Optional[List[str]]:
+        """Minimal list of d-pad presses from start to target (BFS over the cell graph)."""
+        if start == target:
+            return []
+        previous = {start: None}
+        frontier = deque([start])
+        while frontier:
+            cell = frontier.popleft()
+            for button, nxt in self.neighbours[cell].items():
+                if nxt in previous:
+                    continue
+                previous[nxt] = (cell, button)
+                if nxt == target:
+                    path = []
+                    while previous[nxt]:
+                        nxt, button = previous[nxt]
+                        path.append(button)
+                    return path[::-1]
+                frontier.append(nxt)
+        return None
+
+class MenuCursorDetector:
+    """
+    Finds which cell of a menu is highlighted by measuring the share of highlight-coloured
+    pixels along each cell's border.
+    """
+    def __init__(self):
+        lower, upper = config.get("menu.highlight_hsv", [[15, 60, 170], [40, 255, 255]])
+        self.lower = np.array(lower, dtype=np.uint8)
+        self.upper = np.array(upper, dtype=np.uint8)
+        self.border = config.get("menu.border_px", 6)
+        self.min_score = config.get("menu.min_score", 0.2)
+        self.min_margin = config.get("menu.min_margin", 0.1)
+        self.layouts: Dict[str, MenuLayout] = {
+            name: MenuLayout(name, spec["cells"]) for name, spec in (config.get("menu.layouts") or {}).items()
+        }
+
+    def scores(self, frame: np.ndarray, layout: MenuLayout) -> Dict[str, float]:
+        height, width = frame.shape[:2]
+        out = {}
+        for cell, (rx, ry, rw, rh) in layout.rects.items():
+            x1, y1 = int(rx * width), int(ry * height)
+            x2, y2 = int((rx + rw) * width), int((ry + rh) * height)
+            crop = frame[y1:y2, x1:x2]
+            if crop.size == 0:
+                out[cell] = 0.0
+                continue
+            mask = cv2.inRange(cv2.cvtColor(crop, cv2.COLOR_BGR2HSV), self.lower, self.upper)
+            band = np.ones(mask.shape, dtype=bool)
+            b = self.border
+            band[b:-b, b:-b] = False
+            out[cell] = float(np.count_nonzero(mask[band])) / max(1, int(band.sum()))
+        return out
+
+    def detect(self, frame: np.ndarray, layout_name: str) -> Optional[str]:
+        """Returns the highlighted cell, or None if no cell stands out clearly."""
+        layout = self.layouts.get(layout_name)
+        if layout is None or frame is None:
+            return None
+        ranked = sorted(self.scores(frame, layout).items(), key=lambda kv: kv[1], reverse=True)
+        if not ranked or ranked[0][1] < self.min_score:
+            return None
+        if len(ranked) > 1 and ranked[0][1] - ranked[1][1] < self.min_margin:
+            return None
+        return ranked[0][0]
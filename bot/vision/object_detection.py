@@ -2,6 +2,7 @@ from ultralytics import YOLO
 from typing import Tuple, List, Dict
 from bot.vision.types import Detection
 from bot.system.logger import logger
+from bot.system.config import config
 
 class ObjectDetector:
     def __init__(self, enemy_model_path: str, gem_model_path: str, 
@@ -26,8 +27,21 @@ class ObjectDetector:
         # 1: rune (from Gem Model Class 3)
         self.class_names = {0: "monster", 1: "rune"}
 
+        # Thresholds follow config.yaml hot reloads after construction
+        self._detection_settings = config.snapshot.detection
+
+    def _refresh_thresholds(self):
+        settings = config.snapshot.detection
+        if settings is self._detection_settings:
+            return
+        self._detection_settings = settings
+        self.enemy_conf, self.enemy_iou = settings.enemy.confidence, settings.enemy.iou
+        self.gem_conf, self.gem_iou = settings.gem.confidence, settings.gem.iou
+        logger.info(f"Detection thresholds updated: enemy {settings.enemy}, gem {settings.gem}")
+
     def get_detections(self, frame) -> Tuple[List[Detection], Dict[int, str]]:
         detections = []
+        self._refresh_thresholds()
         
         # --- 1. Enemy Detection ---
         # Enemy Model: Class 0 is 'Enemy'
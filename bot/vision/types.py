@@ -2,3 +2,7 @@ from collections import namedtuple
 
 # Shared Detection type to avoid circular imports
 Detection = namedtuple("Detection", ["position", "label", "confidence"])
+
+def detection_to_row(detection: Detection) -> list:
+    """[x1, y1, x2, y2, label, confidence], the row format of detection replays."""
+    return [int(v) for v in detection.position] + [int(detection.label), round(float(detection.confidence), 3)]
@@ -0,0 +1,133 @@
+"""
+LLMClient overhead and throughput benchmark, fully offline against the mock endpoint
+(tests/mock_llm_server.py).
+
+Overhead: sequential level-up replays with no injected latency. For each call the time
+the mock spent handling the request is subtracted from the wall time, leaving what the
+client adds (prompt building, image encoding, litellm request/response handling, schema
+parsing, decision logging). Prompt build and encode are also reported on their own.
+
+Throughput: the same replays issued from N threads at once against a mock with
+injected latency, as several bots (or hedged requests) would.
+
+    python tests/bench_llm_client.py
+    python tests/bench_llm_client.py --calls 100 --latency 0.3 --concurrency 1 4 16
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.core.game_state import GameState
+from bot.system.llm_client import LLMClient
+from bench_llm_payload import synthetic_frames
+from mock_llm_server import MockLLMServer
+
+def make_client(server: MockLLMServer, stream: bool, log_dir: str) -> LLMClient:
+    client = LLMClient()
+    client.model_name, client.api_base, client.api_key = "openai/mock", server.url, "mock"
+    client.router = None
+    client.cache = None # Every call goes to the endpoint
+    client.frames_dir = None
+    client.stream = stream
+    client.log_filename = os.path.join(log_dir, f"decisions_{'stream' if stream else 'plain'}.jsonl")
+    return client
+
+def game_state() -> dict:
+    state = GameState()
+    state.weapons, state.passives = ["Whip", "Magic Wand", "Garlic"], ["Spinach", "Empty Tome"]
+    return state.to_json()
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+def measure_overhead(stream: bool, frames, calls: int, log_dir: str) -> dict:
+    state = game_state()
+    with MockLLMServer() as server:
+        client = make_client(server, stream, log_dir)
+        client.get_decision(frames[0], state) # warm up connections and imports
+        wall, build, encode = [], [], []
+        for i in range(calls):
+            start = time.perf_counter()
+            client._get_user_content(state)
+            build.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            decision = client.get_decision(frames[i % len(frames)], state)
+            wall.append(time.perf_counter() - start)
+            encode.append(client.last_payload["encode_ms"] / 1000)
+            if decision is None:
+                raise RuntimeError("mock endpoint returned no decision")
+        # Streamed responses finish handling after the decision returned; wait for them
+        deadline = time.perf_counter() + 5.0
+        while len(server.handle_times) < calls + 1 and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        handled = server.handle_times[1:]
+        schema_errors = len(server.schema_errors)
+
+    # A streamed decision returns before its handler finishes, so the stream rows slightly
+    # understate the overhead (by the time to send the analysis, small without chunk latency)
+    overhead = [w - min(h, w) for w, h in zip(wall, handled)]
+    return {
+        "wall_ms_p50": round(statistics.median(wall) * 1000, 2),
+        "overhead_ms_p50": round(statistics.median(overhead) * 1000, 2),
+        "overhead_ms_p95": round(percentile(overhead, 0.95) * 1000, 2),
+        "prompt_ms_p50": round(statistics.median(build) * 1000, 3),
+        "encode_ms_p50": round(statistics.median(encode) * 1000, 2),
+        "schema_errors": schema_errors,
+    }
+
+def measure_throughput(stream: bool, frames, calls: int, concurrency: int, latency: float, log_dir: str) -> dict:
+    state = game_state()
+    with MockLLMServer(latency=latency) as server:
+        client = make_client(server, stream, log_dir)
+
+        def replay(i: int) -> float:
+            start = time.perf_counter()
+            client.get_decision(frames[i % len(frames)], state)
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(replay, range(calls)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "calls_per_s": round(calls / elapsed, 1),
+        "ideal_per_s": round(concurrency / latency, 1) if latency else None,
+        "latency_ms_p50": round(statistics.median(latencies) * 1000, 1),
+        "latency_ms_p95": round(percentile(latencies, 0.95) * 1000, 1),
+    }
+
+def print_rows(title: str, rows: dict):
+    print(f"\n{title}")
+    columns = list(next(iter(rows.values())))
+    print(f"{'':<16}" + "".join(f"{c:>16}" for c in columns))
+    for label, row in rows.items():
+        print(f"{label:<16}" + "".join(f"{str(row[c]):>16}" for c in columns))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2, help="Injected server latency for the throughput run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+    logging.getLogger("bot.system.llm_client").setLevel(logging.WARNING)
+
+    frames = synthetic_frames(8)
+    with tempfile.TemporaryDirectory() as log_dir:
+        print_rows("Client overhead per call (no injected latency)", {
+            mode: measure_overhead(mode == "stream", frames, args.calls, log_dir) for mode in ("plain", "stream")
+        })
+        print_rows(f"Throughput ({args.latency * 1000:.0f} ms injected latency, {args.calls} calls)", {
+            f"{mode} x{n}": measure_throughput(mode == "stream", frames, args.calls, n, args.latency, log_dir)
+            for mode in ("plain", "stream") for n in args.concurrency
+        })
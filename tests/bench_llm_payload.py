@@ -0,0 +1,126 @@
+"""
+Level-up screenshot payload benchmark.
+
+Replays saved level-up frames (llm.save_frames: true writes them to
+<capture.output_dir>/level_up_frames) through LLMClient under several payload settings
+against the local mock endpoint (tests/mock_llm_server.py), or any OpenAI-compatible
+--api-base, and reports per setting: payload size, prompt tokens, encode time, request
+latency and agreement with the full-frame reference decision.
+
+    python tests/bench_llm_payload.py
+    python tests/bench_llm_payload.py --frames training_data/level_up_frames
+    python tests/bench_llm_payload.py --api-base http://localhost:1234/v1 --model openai/local-model
+
+Without saved frames, synthetic level-up screens are generated.
+"""
+import argparse
+import glob
+import logging
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.core.game_state import GameState
+from bot.system.config import config
+from bot.system.llm_client import LLMClient
+from bot.system.llm_payload import PayloadSettings
+from mock_llm_server import MockLLMServer
+
+PANEL = (0.25, 0.08, 0.66, 0.84)
+
+# The first entry is the reference: the full frame at PIL's default JPEG quality
+SETTINGS = {
+    "full/jpeg75": PayloadSettings(),
+    "panel/jpeg75": PayloadSettings(crop=PANEL),
+    "panel/1024/jpeg70": PayloadSettings(crop=PANEL, max_side=1024, quality=70),
+    "panel/768/jpeg70": PayloadSettings(crop=PANEL, max_side=768, quality=70),
+    "panel/512/jpeg60": PayloadSettings(crop=PANEL, max_side=512, quality=60),
+    "panel/768/webp70": PayloadSettings(crop=PANEL, max_side=768, format="WEBP", quality=70),
+    "panel/384/jpeg50": PayloadSettings(crop=PANEL, max_side=384, quality=50),
+}
+
+def synthetic_frames(count: int, size=(1245, 768), seed: int = 0):
+    """Noisy dark screens with four option cards, one of them brighter."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(count):
+        frame = rng.integers(0, 60, (size[1], size[0], 3), dtype=np.uint8)
+        bright = rng.integers(0, 4)
+        for slot in range(4):
+            y0 = int((0.20 + 0.15 * slot) * size[1])
+            x0, x1 = int(0.30 * size[0]), int(0.70 * size[0])
+            level = 150 if slot == bright else 90
+            frame[y0:y0 + int(0.14 * size[1]), x0:x1] = rng.integers(level, level + 40, (int(0.14 * size[1]), x1 - x0, 3))
+        frames.append(Image.fromarray(frame))
+    return frames
+
+def load_frames(directory: str, limit: int):
+    paths = sorted(glob.glob(os.path.join(directory, "*.png")))[:limit]
+    return [Image.open(p).convert("RGB") for p in paths]
+
+def make_client(api_base: str, model: str) -> LLMClient:
+    client = LLMClient()
+    client.model_name = model
+    client.api_base = api_base
+    client.api_key = client.api_key or "mock"
+    client.cache = None # Measure the request path, not the cache
+    client.log_enabled = False
+    client.frames_dir = None
+    client.stream = False # Usage arrives with the response, not after it
+    return client
+
+def run_benchmark(client: LLMClient, frames, settings=SETTINGS):
+    state = GameState().to_json()
+    results, reference = {}, None
+    for label, payload in settings.items():
+        client.payload_settings = payload
+        rows = []
+        for frame in frames:
+            start = time.perf_counter()
+            decision = client.get_decision(frame, state)
+            latency = time.perf_counter() - start
+            rows.append((decision, latency, dict(client.last_payload)))
+
+        decisions = [(d or {}).get("slot") for d, _, _ in rows]
+        if reference is None:
+            reference = decisions
+        results[label] = {
+            "base64_kb": round(statistics.mean(p["base64_bytes"] for _, _, p in rows) / 1024, 1),
+            "prompt_tokens": round(statistics.mean(p.get("prompt_tokens", 0) for _, _, p in rows)),
+            "encode_ms": round(statistics.median(p["encode_ms"] for _, _, p in rows), 2),
+            "latency_ms": round(statistics.median(l for _, l, _ in rows) * 1000, 1),
+            "agreement": round(sum(a == b for a, b in zip(decisions, reference)) / len(frames), 3),
+        }
+    return results
+
+def print_table(results):
+    print(f"{'setting':<20}{'b64 kb':>9}{'tokens':>9}{'encode ms':>11}{'latency ms':>12}{'agree':>8}")
+    for label, m in results.items():
+        print(f"{label:<20}{m['base64_kb']:>9}{m['prompt_tokens']:>9}{m['encode_ms']:>11}{m['latency_ms']:>12}{m['agreement']:>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", default=os.path.join(config.get("capture.output_dir", "training_data"), "level_up_frames"))
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--api-base", default=None, help="OpenAI-compatible endpoint (default: start the mock)")
+    parser.add_argument("--model", default="openai/mock")
+    args = parser.parse_args()
+    logging.getLogger("bot.system.llm_client").setLevel(logging.WARNING)
+
+    frames = load_frames(args.frames, args.limit) if os.path.isdir(args.frames) else []
+    if not frames:
+        print(f"No frames in {args.frames}, using synthetic level-up screens.")
+        frames = synthetic_frames(min(args.limit, 20))
+
+    if args.api_base:
+        print_table(run_benchmark(make_client(args.api_base, args.model), frames))
+    else:
+        with MockLLMServer() as server:
+            print_table(run_benchmark(make_client(server.url, args.model), frames))
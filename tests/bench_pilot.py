@@ -0,0 +1,137 @@
+"""
+Pilot hot-path benchmark on synthetic scenes.
+
+Times Pilot.update and Pilot.get_force_vector separately and measures their peak
+allocations (tracemalloc), then compares against tests/pilot_baseline.json.
+
+    python tests/bench_pilot.py                    # check against baseline
+    python tests/bench_pilot.py --update-baseline  # record a new baseline
+
+Tolerances (fraction above baseline) can be overridden with the
+PILOT_BENCH_TIME_TOLERANCE / PILOT_BENCH_MEMORY_TOLERANCE environment variables.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import unittest
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.core.pilot import Pilot
+from bot.simulation.scenes import CLASS_NAMES, SCENES, generate
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "pilot_baseline.json")
+SIZES = [10, 100, 1000, 10000]
+FRAMES = {10: 60, 100: 60, 1000: 20, 10000: 5}
+FRAME_DT = 1 / 30
+SCREEN_CENTER = (480, 304)
+
+TIME_TOLERANCE = float(os.environ.get("PILOT_BENCH_TIME_TOLERANCE", 1.0))
+MEMORY_TOLERANCE = float(os.environ.get("PILOT_BENCH_MEMORY_TOLERANCE", 0.25))
+
+def _time_calls(frames):
+    """Median seconds per update() and per get_force_vector() call over a scene."""
+    pilot = Pilot(SCREEN_CENTER)
+    update_times, force_times = [], []
+    for i, detections in enumerate(frames):
+        start = time.perf_counter()
+        pilot.update(detections, CLASS_NAMES, timestamp=i * FRAME_DT)
+        mid = time.perf_counter()
+        pilot.get_force_vector(detections, CLASS_NAMES)
+        end = time.perf_counter()
+        update_times.append(mid - start)
+        force_times.append(end - mid)
+    return statistics.median(update_times), statistics.median(force_times)
+
+def _peak_allocations(frames):
+    """Largest tracemalloc peak (bytes) seen for a single update() / get_force_vector() call."""
+    pilot = Pilot(SCREEN_CENTER)
+    update_peak, force_peak = 0, 0
+    tracemalloc.start()
+    try:
+        for i, detections in enumerate(frames):
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            pilot.update(detections, CLASS_NAMES, timestamp=i * FRAME_DT)
+            update_peak = max(update_peak, tracemalloc.get_traced_memory()[1] - base)
+
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            pilot.get_force_vector(detections, CLASS_NAMES)
+            force_peak = max(force_peak, tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    return update_peak, force_peak
+
+def run_benchmark(scenes=None, sizes=None):
+    results = {}
+    for scene in scenes or SCENES:
+        results[scene] = {}
+        for size in sizes or SIZES:
+            frames = generate(scene, size, FRAMES[size])
+            update_s, force_s = _time_calls(frames)
+            update_peak, force_peak = _peak_allocations(frames)
+            results[scene][str(size)] = {
+                "update_us": round(update_s * 1e6, 1),
+                "force_us": round(force_s * 1e6, 1),
+                "update_per_s": round(1 / update_s, 1),
+                "force_per_s": round(1 / force_s, 1),
+                "update_peak_kb": round(update_peak / 1024, 1),
+                "force_peak_kb": round(force_peak / 1024, 1),
+            }
+    return results
+
+def compare(results, baseline, time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """Returns a list of human readable regressions (empty if within tolerance)."""
+    regressions = []
+    for scene, sizes in results.items():
+        for size, metrics in sizes.items():
+            expected = baseline.get(scene, {}).get(size)
+            if not expected:
+                continue
+            for key, tolerance in (("update_us", time_tolerance), ("force_us", time_tolerance),
+                                   ("update_peak_kb", memory_tolerance), ("force_peak_kb", memory_tolerance)):
+                # Small absolute slack so tiny scenes don't flap on noise
+                slack = 50.0 if key.endswith("_us") else 4.0
+                limit = expected[key] * (1 + tolerance) + slack
+                if metrics[key] > limit:
+                    regressions.append(f"{scene}[{size}] {key}: {metrics[key]} > {limit:.1f} (baseline {expected[key]})")
+    return regressions
+
+def print_table(results):
+    print(f"{'scene':<15}{'n':>7}{'update us':>12}{'force us':>12}{'update/s':>11}{'force/s':>11}{'upd kb':>9}{'frc kb':>9}")
+    for scene, sizes in results.items():
+        for size, m in sizes.items():
+            print(f"{scene:<15}{size:>7}{m['update_us']:>12}{m['force_us']:>12}{m['update_per_s']:>11}"
+                  f"{m['force_per_s']:>11}{m['update_peak_kb']:>9}{m['force_peak_kb']:>9}")
+
+class TestPilotBenchmark(unittest.TestCase):
+    def test_against_baseline(self):
+        if not os.path.exists(BASELINE_PATH):
+            self.skipTest("No baseline recorded (run with --update-baseline)")
+        with open(BASELINE_PATH, "r") as f:
+            baseline = json.load(f)
+
+        results = run_benchmark()
+        print_table(results)
+        regressions = compare(results, baseline)
+        self.assertFalse(regressions, "Pilot hot path regressed:\n" + "\n".join(regressions))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--update-baseline", action="store_true", help="Record results as the new baseline")
+    args = parser.parse_args()
+
+    if args.update_baseline:
+        results = run_benchmark()
+        print_table(results)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {BASELINE_PATH}")
+    else:
+        unittest.main()
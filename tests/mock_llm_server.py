@@ -0,0 +1,260 @@
+"""
+Local stand-in for an OpenAI-compatible chat completions endpoint.
+
+Answers POST /v1/chat/completions (plain, or server-sent events with "stream": true)
+with a decision in the bot's schema, decision first, and a usage block whose
+prompt_tokens estimate text (4 chars per token) and image tokens (85 + 170 per 512px
+tile, as OpenAI bills high-detail images). The decision is a cheap function of the
+image, the brightest of four horizontal bands, so payload settings that destroy detail
+show up as disagreement in benchmarks.
+
+Responses can instead be scripted (a list of contents served in turn), latency can be
+jittered, and with a json_schema response_format every response is checked against the
+schema; mismatches are counted in schema_errors. Every request body is kept in bodies
+and the time spent in the handler (excluding injected latency) in handle_times, so
+benchmarks can separate client overhead from the server's.
+
+    python tests/mock_llm_server.py --port 8765
+    python tests/mock_llm_server.py --latency 0.8 --jitter 0.2 --script responses.jsonl
+"""
+import argparse
+import base64
+import io
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from PIL import Image
+
+def image_tokens(size) -> int:
+    tiles = math.ceil(size[0] / 512) * math.ceil(size[1] / 512)
+    return 85 + 170 * tiles
+
+def _decide(image: Image.Image) -> dict:
+    gray = np.asarray(image.convert("L"), dtype=np.float32)
+    bands = np.array_split(gray, 4, axis=0)
+    slot = int(np.argmax([band.mean() for band in bands])) + 1
+    return {"action": "select", "slot": slot, "item_name": f"Option {slot}"}
+
+def schema_errors(value, schema: dict, path: str = "$") -> list:
+    """The subset of JSON Schema that structured outputs use: type, enum, properties,
+    required, additionalProperties and items."""
+    types = {"object": dict, "array": list, "string": str, "integer": int, "number": (int, float), "boolean": bool}
+    expected = schema.get("type")
+    if expected in types and (not isinstance(value, types[expected]) or
+                              (expected in ("integer", "number") and isinstance(value, bool))):
+        return [f"{path}: expected {expected}"]
+    errors = []
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{path}: {value!r} not in {schema['enum']}")
+    if isinstance(value, dict):
+        properties = schema.get("properties", {})
+        errors += [f"{path}: missing {key}" for key in schema.get("required", []) if key not in value]
+        if schema.get("additionalProperties") is False:
+            errors += [f"{path}: unexpected {key}" for key in value if key not in properties]
+        for key, sub in properties.items():
+            if key in value:
+                errors += schema_errors(value[key], sub, f"{path}.{key}")
+    if isinstance(value, list) and "items" in schema:
+        for i, item in enumerate(value):
+            errors += schema_errors(item, schema["items"], f"{path}[{i}]")
+    return errors
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "MockLLM/1.0"
+
+    def log_message(self, format, *args):
+        pass # Keep benchmark output clean
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        received = time.perf_counter()
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        with self.server.lock:
+            self.server.bodies.append(body)
+        if self.server.fail_status:
+            self.send_error(self.server.fail_status)
+            return
+
+        text_chars, image, tokens = 0, None, 0
+        for message in body.get("messages", []):
+            content = message.get("content")
+            parts = content if isinstance(content, list) else [{"type": "text", "text": content or ""}]
+            for part in parts:
+                if part.get("type") == "text":
+                    text_chars += len(part.get("text", ""))
+                elif part.get("type") == "image_url":
+                    data = part["image_url"]["url"].split(",", 1)[1]
+                    image = Image.open(io.BytesIO(base64.b64decode(data)))
+                    tokens += image_tokens(image.size)
+        tokens += text_chars // 4
+
+        slept = self.server.latency + random.uniform(0, self.server.jitter)
+        if slept:
+            time.sleep(slept)
+
+        with self.server.lock:
+            self.server.requests += 1
+            script = self.server.script
+            content = script[(self.server.requests - 1) % len(script)] if script else None
+        if content is None:
+            decision = _decide(image) if image is not None else {"action": "skip", "slot": 1, "item_name": ""}
+            content = json.dumps({
+                "decision": decision,
+                "analysis": {"visible_options": [], "strategy_fit": self.server.analysis, "slot_management": "",
+                             "survival_vs_optimization": ""},
+            })
+        elif not isinstance(content, str):
+            content = json.dumps(content)
+        self._check_schema(body, content)
+        usage = {"prompt_tokens": tokens, "completion_tokens": len(content) // 4,
+                 "total_tokens": tokens + len(content) // 4}
+
+        if body.get("stream"):
+            self._stream(body, content, usage)
+            self._record_time(received, slept)
+            return
+
+        response = {
+            "id": f"mock-{self.server.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+            "usage": usage,
+        }
+
+        payload = json.dumps(response).encode("utf-8")
+        self._record_time(received, slept) # before the client can see the response
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _check_schema(self, body: dict, content: str):
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") != "json_schema":
+            return
+        try:
+            errors = schema_errors(json.loads(content), response_format["json_schema"]["schema"])
+        except (ValueError, KeyError) as e:
+            errors = [f"unusable: {e}"]
+        if errors:
+            with self.server.lock:
+                self.server.schema_errors.extend(errors)
+
+    def _record_time(self, received: float, slept: float):
+        """Handler time without the injected latency (streaming chunk delays included)."""
+        with self.server.lock:
+            self.server.handle_times.append(time.perf_counter() - received - slept)
+
+    def _stream(self, body: dict, content: str, usage: dict):
+        """Sends the content as chat.completion.chunk events, chunk_chars at a time."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        def event(delta, finish=None, usage_block=None):
+            chunk = {"id": "mock-stream", "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": body.get("model", "mock"),
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]}
+            if usage_block:
+                chunk["choices"], chunk["usage"] = [], usage_block
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        event({"role": "assistant", "content": ""})
+        step = self.server.chunk_chars
+        for i in range(0, len(content), step):
+            if self.server.chunk_latency:
+                time.sleep(self.server.chunk_latency)
+            event({"content": content[i:i + step]})
+        event({}, finish="stop")
+        if (body.get("stream_options") or {}).get("include_usage"):
+            event({}, usage_block=usage)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+class MockLLMServer:
+    """Runs the mock endpoint on a background thread; use as a context manager."""
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 chunk_latency: float = 0.0, chunk_chars: int = 8, analysis: str = "",
+                 fail_status: int = 0, jitter: float = 0.0, script=None):
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency # before the first byte
+        self.httpd.jitter = jitter # plus uniform(0, jitter)
+        self.httpd.chunk_latency = chunk_latency # between streamed chunks
+        self.httpd.chunk_chars = chunk_chars
+        self.httpd.analysis = analysis # prose padding, makes streaming worthwhile
+        self.httpd.fail_status = fail_status # answer every request with this HTTP error
+        self.httpd.script = list(script or []) # contents (str or JSON value) served in turn
+        self.httpd.requests = 0
+        self.httpd.bodies = []
+        self.httpd.handle_times = []
+        self.httpd.schema_errors = []
+        self.httpd.lock = threading.Lock()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def requests(self) -> int:
+        return self.httpd.requests
+
+    @property
+    def bodies(self) -> list:
+        return self.httpd.bodies
+
+    @property
+    def handle_times(self) -> list:
+        return self.httpd.handle_times
+
+    @property
+    def schema_errors(self) -> list:
+        return self.httpd.schema_errors
+
+    def start(self) -> "MockLLMServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many more seconds, uniformly")
+    parser.add_argument("--chunk-latency", type=float, default=0.0, help="Seconds between streamed chunks")
+    parser.add_argument("--script", help="JSONL file, one response content per line, served in turn")
+    args = parser.parse_args()
+    script = None
+    if args.script:
+        with open(args.script, "r", encoding="utf-8") as f:
+            script = [json.loads(line) for line in f if line.strip()]
+    server = MockLLMServer(port=args.port, latency=args.latency, jitter=args.jitter,
+                           chunk_latency=args.chunk_latency, script=script)
+    print(f"Mock LLM endpoint on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.recording.action_log import (
+    ACTION_DTYPE, BUTTON_BITS, ActionLogReader, ActionLogWriter, convert_to_jsonl, to_json_record,
+)
+
+def state(i):
+    buttons = BUTTON_BITS["SOUTH"] if i % 2 else BUTTON_BITS["DPAD_UP"] | BUTTON_BITS["START"]
+    return buttons, i * 10 - 500, -i, 32767, -32767, i % 256, 255
+
+class TestActionLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "capture.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_record_is_compact(self):
+        self.assertEqual(ACTION_DTYPE.itemsize, 24)
+
+    def test_roundtrip_across_chunks(self):
+        with ActionLogWriter(self.path, fps=60, chunk_records=16) as log:
+            for i in range(100):
+                log.write(i, 1000.0 + i / 60, state(i))
+        reader = ActionLogReader(self.path)
+        self.assertEqual(len(reader), 100)
+        self.assertEqual(reader.fps, 60)
+        self.assertTrue(np.array_equal(reader.records["step"], np.arange(100)))
+        self.assertAlmostEqual(float(reader[99]["time"]), 1000.0 + 99 / 60)
+        self.assertEqual(int(reader.pressed("SOUTH").sum()), 50)
+        self.assertEqual(int(reader[3]["left_x"]), -470)
+
+    def test_append_and_truncated_tail(self):
+        with ActionLogWriter(self.path) as log:
+            for i in range(10):
+                log.write(i, 0.0, state(i))
+        with open(self.path, "ab") as f:
+            f.write(b"\x01\x02\x03") # Partial record from a crash
+        with ActionLogWriter(self.path) as log:
+            for i in range(10, 15):
+                log.write(i, 0.0, state(i))
+        reader = ActionLogReader(self.path)
+        self.assertEqual(reader.records["step"].tolist(), list(range(15)))
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"{\"step\": 0}\n" * 4)
+        with self.assertRaises(ValueError):
+            ActionLogReader(self.path)
+
+    def test_jsonl_schema(self):
+        record = to_json_record(7, state(2))
+        self.assertEqual(list(record)[:2], ["step", "SOUTH"])
+        self.assertEqual(record["step"], 7)
+        self.assertEqual((record["SOUTH"], record["DPAD_UP"], record["START"], record["GUIDE"]), (0, 1, 1, 0))
+        self.assertEqual(record["AXIS_LEFTX"], [-480])
+        self.assertEqual(record["RIGHT_TRIGGER"], [255])
+        self.assertEqual(len(record), 22)
+
+    def test_convert_to_jsonl(self):
+        with ActionLogWriter(self.path) as log:
+            for i in range(5):
+                log.write(i, 0.0, state(i))
+        out = convert_to_jsonl(self.path)
+        with open(out, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(lines, [to_json_record(i, state(i)) for i in range(5)])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import sys
+import os
+import dataclasses
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.system.config import Config, ConfigWatcher, compile_settings, config
+from bot.core.pilot import Pilot
+
+CONFIG_V1 = """
+game:
+  image_size: [960, 608]
+pilot:
+  forces:
+    repel_monster: 700
+  sticky_target:
+    min_runes: 3
+detection:
+  enemy:
+    confidence: 0.4
+"""
+
+def _isolated_config(path):
+    """A Config bound to a temp file, bypassing the global singleton."""
+    cfg = object.__new__(Config)
+    cfg._path = path
+    cfg._mtime = None
+    cfg.reload()
+    return cfg
+
+class TestConfigSnapshot(unittest.TestCase):
+    def test_compile_types_and_defaults(self):
+        settings = compile_settings({"pilot": {"forces": {"repel_monster": 700}}, "game": {"image_size": [640, 480]}})
+        self.assertIsInstance(settings.pilot.forces.repel_monster, float)
+        self.assertEqual(settings.pilot.forces.repel_monster, 700.0)
+        self.assertEqual(settings.pilot.forces.attract_target, 150.0)
+        self.assertEqual(settings.game.image_size, (640, 480))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            settings.pilot.forces.repel_monster = 1.0
+
+    def test_reload_swaps_snapshot_and_keeps_old_on_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "config.yaml")
+            with open(path, "w") as f:
+                f.write(CONFIG_V1)
+            cfg = _isolated_config(path)
+            first = cfg.snapshot
+            self.assertEqual(first.pilot.sticky_target.min_runes, 3)
+
+            with open(path, "w") as f:
+                f.write(CONFIG_V1.replace("700", "450"))
+            os.utime(path, (time.time() + 5, time.time() + 5))
+            self.assertTrue(cfg.changed_on_disk())
+            self.assertTrue(cfg.reload())
+            self.assertEqual(cfg.snapshot.pilot.forces.repel_monster, 450.0)
+            self.assertEqual(first.pilot.forces.repel_monster, 700.0) # Old snapshot untouched
+
+            with open(path, "w") as f:
+                f.write(CONFIG_V1.replace("700", "'lots'"))
+            self.assertFalse(cfg.reload())
+            self.assertEqual(cfg.snapshot.pilot.forces.repel_monster, 450.0)
+
+    def test_watcher_picks_up_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "config.yaml")
+            with open(path, "w") as f:
+                f.write(CONFIG_V1)
+            cfg = _isolated_config(path)
+            watcher = ConfigWatcher(cfg, interval=0.02)
+            watcher.start()
+            try:
+                with open(path, "w") as f:
+                    f.write(CONFIG_V1.replace("0.4", "0.55"))
+                os.utime(path, (time.time() + 5, time.time() + 5))
+                deadline = time.time() + 2
+                while cfg.snapshot.detection.enemy.confidence != 0.55 and time.time() < deadline:
+                    time.sleep(0.02)
+            finally:
+                watcher.stop()
+            self.assertEqual(cfg.snapshot.detection.enemy.confidence, 0.55)
+
+    def test_pilot_rebinds_on_new_snapshot(self):
+        original = config.get("pilot.forces.repel_monster")
+        pilot = Pilot((480, 304))
+        try:
+            config.set("pilot.forces.repel_monster", 123.0)
+            pilot.update([], {})
+            self.assertEqual(pilot.k_repel_monster, 123.0)
+        finally:
+            config.set("pilot.forces.repel_monster", original)
+
+if __name__ == "__main__":
+    unittest.main()
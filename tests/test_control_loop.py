@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+import threading
+import time
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.core.pilot import Pilot
+from bot.core.control_loop import ControlLoop
+from bot.vision.types import Detection
+
+CLASS_NAMES = {0: "monster", 1: "rune"}
+
+class TestControlLoop(unittest.TestCase):
+    def setUp(self):
+        self.controller = MagicMock()
+        self.loop = ControlLoop(Pilot((480, 304)), self.controller)
+
+    def test_idle_until_first_frame(self):
+        self.loop._tick()
+        self.controller.update_movement.assert_not_called()
+
+    def test_ticks_between_frames_and_smooths(self):
+        # Rune to the left -> pull left
+        self.loop.submit([Detection((0, 294, 20, 314), 1, 1.0)], CLASS_NAMES)
+        for _ in range(5):
+            self.loop._tick()
+
+        self.assertEqual(self.controller.update_movement.call_count, 5)
+        xs = [c.args[0] for c in self.controller.update_movement.call_args_list]
+        self.assertTrue(all(a > b for a, b in zip(xs, xs[1:])), "Stick should ease towards the target")
+        self.assertGreaterEqual(xs[-1], -1.0)
+
+    def test_extrapolates_monsters_along_velocity(self):
+        pilot = self.loop.pilot
+        # Monster walking towards the player at 150 px/s, currently just outside range
+        pilot.update([Detection((600, 294, 620, 314), 0, 1.0)], CLASS_NAMES, timestamp=0.0)
+        frame = [Detection((595, 294, 615, 314), 0, 1.0)]
+        pilot.update(frame, CLASS_NAMES, timestamp=1 / 30)
+
+        now_fx, _ = pilot.get_force_vector(frame, CLASS_NAMES)
+        later_fx, _ = pilot.get_force_vector(frame, CLASS_NAMES, lookahead=0.25)
+        self.assertLess(later_fx, now_fx)
+
+    def test_suspend_stops_output(self):
+        self.loop.submit([], CLASS_NAMES)
+        self.loop.suspend()
+        self.controller.stop_movement.assert_called_once()
+        self.loop._tick()
+        self.controller.update_movement.assert_not_called()
+
+    def test_pilot_runs_outside_the_lock(self):
+        entered, release = threading.Event(), threading.Event()
+        pilot = MagicMock()
+        def slow_force(*args, **kwargs):
+            entered.set()
+            release.wait(5)
+            return (1.0, 0.0)
+        pilot.get_force_vector.side_effect = slow_force
+        loop = ControlLoop(pilot, self.controller)
+        loop.submit([], CLASS_NAMES)
+        tick = threading.Thread(target=loop._tick)
+        tick.start()
+        self.assertTrue(entered.wait(5))
+
+        # Neither call waits for the Pilot; a suspend while it runs discards the tick
+        loop.submit([], CLASS_NAMES)
+        loop.suspend()
+        release.set()
+        tick.join(5)
+        self.controller.stop_movement.assert_called_once()
+        self.controller.update_movement.assert_not_called()
+
+    def test_thread_runs_at_rate(self):
+        self.loop.submit([], CLASS_NAMES)
+        self.loop.start()
+        time.sleep(0.25)
+        self.loop.stop()
+        # 120 Hz for 0.25s -> ~30 ticks; allow for scheduler noise
+        self.assertGreater(self.loop.ticks, 15)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+from PIL import Image
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.dirname(__file__))
+
+from bot.system.decision_cache import DecisionCache, make_key
+
+DECISION = {"action": "select", "slot": 2, "item_name": "Hollow Heart"}
+
+class TestDecisionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_is_canonical(self):
+        a = make_key(["Whip", "Garlic"], [], ["Knife", "Axe"])
+        self.assertEqual(a, make_key(["Garlic", "Whip"], [], ["Knife", "Axe"]))
+        self.assertNotEqual(a, make_key(["Whip", "Garlic"], [], ["Axe", "Knife"])) # slots differ
+        self.assertNotEqual(a, make_key(["Whip", "Garlic"], [], ["Knife", "Axe"], {"reroll": 1}))
+
+    def test_memory_then_disk_hits(self):
+        cache = DecisionCache(self.path, capacity=1, ttl=60, max_rows=10)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", DECISION)
+        cache.put("b", DECISION) # pushes "a" out of the LRU
+        self.assertEqual(cache.get("b"), DECISION)
+        self.assertEqual(cache.get("a"), DECISION)
+
+        stats = cache.get_stats()
+        self.assertEqual((stats["memory_hits"], stats["disk_hits"], stats["misses"]), (1, 1, 1))
+        cache.close()
+
+    def test_persists_across_instances(self):
+        cache = DecisionCache(self.path, ttl=60)
+        cache.put("a", DECISION)
+        cache.close()
+
+        cache = DecisionCache(self.path, ttl=60)
+        self.assertEqual(cache.get("a"), DECISION)
+        cache.close()
+
+    def test_ttl_expiry(self):
+        cache = DecisionCache(self.path, ttl=0.05)
+        cache.put("a", DECISION)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get_stats()["expired"], 1)
+        cache.close()
+
+    def test_eviction_by_least_recent_use(self):
+        cache = DecisionCache(self.path, capacity=1, ttl=60, max_rows=2)
+        cache.put("a", DECISION)
+        time.sleep(0.01)
+        cache.put("b", DECISION)
+        time.sleep(0.01)
+        cache.get("a") # from disk, refreshes last_used
+        time.sleep(0.01)
+        cache.put("c", DECISION)
+        cache.close()
+
+        cache = DecisionCache(self.path, ttl=60, max_rows=2)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        cache.close()
+
+class TestClientCaching(unittest.TestCase):
+    def _client(self, server, path):
+        try:
+            from bot.system.llm_client import LLMClient
+        except ImportError as e:
+            self.skipTest(f"LLM client dependencies missing: {e}")
+        client = LLMClient()
+        client.model_name, client.api_base, client.api_key = "openai/mock", server.url, "mock"
+        client.router, client.log_enabled, client.stream = None, False, False
+        client.cache = DecisionCache(path, ttl=60)
+        return client
+
+    def test_only_selections_are_cached(self):
+        from mock_llm_server import MockLLMServer
+        skip = {"decision": {"action": "skip", "slot": 1, "item_name": ""}, "analysis": {}}
+        select = {"decision": DECISION, "analysis": {}}
+        state = {"weapons": ["Whip"], "passives": []}
+        with tempfile.TemporaryDirectory() as tmp, MockLLMServer(script=[skip, select]) as server:
+            client = self._client(server, os.path.join(tmp, "cache.sqlite"))
+            image = Image.new("RGB", (64, 64))
+            for _ in range(2): # skip is asked again, then the selection is stored
+                self.assertNotIn("source", client.get_decision(image, state, options=["Garlic", "Hollow Heart"]))
+            cached = client.get_decision(image, state, options=["Garlic", "Hollow Heart"])
+            self.assertEqual((cached["item_name"], cached["source"]), ("Hollow Heart", "cache"))
+            self.assertEqual(server.requests, 2)
+            client.cache.close()
+
+if __name__ == "__main__":
+    unittest.main()
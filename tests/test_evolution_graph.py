@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+import random
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.core.level_up_policy import LevelUpPolicy
+from bot.knowledge_base.evolution_index import KnowledgeBase
+
+KB_DIR = os.path.join(os.path.dirname(__file__), "..", "bot", "knowledge_base")
+
+class TestEvolutionTracker(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.kb = KnowledgeBase(KB_DIR)
+
+    def test_completes_and_one_away(self):
+        tracker = self.kb.tracker(["Whip", "Magic Wand"])
+        self.assertEqual([e.name for e in tracker.completes("Hollow Heart")], ["Bloody Tear"])
+        self.assertEqual(tracker.one_away()["Holy Wand"], "Empty Tome")
+        tracker.add("Empty Tome")
+        self.assertIn("Holy Wand", [e.name for e in tracker.ready()])
+        self.assertNotIn("Holy Wand", tracker.one_away())
+
+    def test_union_frees_a_slot(self):
+        tracker = self.kb.tracker(["Peachone"])
+        self.assertEqual([e.name for e in tracker.completes("Ebony Wings")], ["Vandalier"])
+        self.assertEqual(tracker.slots_freed("Ebony Wings"), 1)
+        self.assertEqual(self.kb.tracker(["Whip"]).slots_freed("Hollow Heart"), 0)
+
+    def test_owned_result_closes_the_recipe(self):
+        tracker = self.kb.tracker(["Whip", "Bloody Tear"])
+        self.assertEqual(tracker.completes("Hollow Heart"), [])
+        tracker.remove("Bloody Tear")
+        self.assertEqual([e.name for e in tracker.completes("Hollow Heart")], ["Bloody Tear"])
+
+    def test_dead_ends(self):
+        tracker = self.kb.tracker()
+        self.assertFalse(tracker.is_dead_end("Whip"))
+        self.assertTrue(tracker.is_dead_end("Not An Item"))
+        only_whip = [i for i in self.kb.graph.by_item["Hollow Heart"]]
+        tracker.sync(self.kb.graph.recipes[i].evolution.name for i in only_whip)
+        self.assertTrue(tracker.is_dead_end("Hollow Heart"))
+
+    def test_incremental_matches_brute_force(self):
+        rng = random.Random(0)
+        items = sorted(self.kb.graph.by_item)
+        tracker = self.kb.tracker()
+        for _ in range(200):
+            inventory = set(rng.sample(items, rng.randint(0, 12)))
+            tracker.sync(inventory)
+            for option in rng.sample(items, 5):
+                expected = sorted(e.name for e in self.kb.evolutions
+                                  if option not in inventory and e.name not in inventory
+                                  and e.components - inventory == {option})
+                self.assertEqual(sorted(e.name for e in tracker.completes(option)), expected)
+
+    def test_policy_reports_union(self):
+        result = LevelUpPolicy(self.kb).decide(["Garlic", "Ebony Wings"], ["Peachone"], [])
+        self.assertEqual(result.decision["item_name"], "Ebony Wings")
+        self.assertIn("freeing 1 weapon slot", result.reason)
+
+if __name__ == "__main__":
+    unittest.main()
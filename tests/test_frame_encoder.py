@@ -0,0 +1,87 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+
+import cv2
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.recording.encoder import FrameEncoder, OpenCVSink
+
+SHAPE = (48, 64, 3)
+
+class GatedSink:
+    """Records the first pixel of each frame; writes block until the gate opens."""
+    def __init__(self):
+        self.gate = threading.Event()
+        self.frames = []
+        self.closed = False
+
+    def write(self, frame):
+        self.gate.wait()
+        self.frames.append(int(frame[0, 0, 0]))
+
+    def close(self):
+        self.closed = True
+
+def frame(value):
+    return np.full(SHAPE, value, dtype=np.uint8)
+
+class TestFrameEncoder(unittest.TestCase):
+    def test_encodes_in_order(self):
+        sink = GatedSink()
+        sink.gate.set()
+        encoder = FrameEncoder(sink, SHAPE, buffers=4)
+        for i in range(50):
+            while not encoder.submit(frame(i)): # Buffers are reused; wait for one to free up
+                pass
+        encoder.close()
+        self.assertEqual(sink.frames, list(range(50)))
+        self.assertTrue(sink.closed)
+        self.assertEqual(encoder.get_stats()["encoded"], 50)
+
+    def test_drops_when_encoder_stalls(self):
+        sink = GatedSink()
+        encoder = FrameEncoder(sink, SHAPE, buffers=3)
+        # A stalled encode: the capture side never waits, it drops frames past the pool
+        accepted = [encoder.submit(frame(i)) for i in range(10)]
+        self.assertEqual(sum(accepted), 3)
+        sink.gate.set()
+        encoder.close()
+
+        stats = encoder.get_stats()
+        self.assertEqual(stats["dropped"], 7)
+        self.assertEqual(stats["high_water"], 3)
+        self.assertEqual(sink.frames, [i for i, ok in enumerate(accepted) if ok])
+
+    def test_copies_frame_on_submit(self):
+        sink = GatedSink()
+        encoder = FrameEncoder(sink, SHAPE, buffers=2)
+        image = frame(7)
+        encoder.submit(image[:, :]) # Non-contiguous views and later mutation are both fine
+        image[:] = 9
+        sink.gate.set()
+        encoder.close()
+        self.assertEqual(sink.frames, [7])
+
+    def test_opencv_sink_writes_video(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "capture.mp4")
+            encoder = FrameEncoder(OpenCVSink(path, 30, (SHAPE[1], SHAPE[0])), SHAPE, buffers=4)
+            for i in range(10):
+                while not encoder.submit(frame(i * 20)):
+                    pass
+            encoder.close()
+            video = cv2.VideoCapture(path)
+            count = 0
+            while video.read()[0]:
+                count += 1
+            video.release()
+            self.assertEqual(count, 10)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.input.backends import MemoryBackend, create_backend
+from bot.input.input_controller import InputController
+
+class TestInputBackend(unittest.TestCase):
+    def setUp(self):
+        self.backend = MemoryBackend()
+        self.controller = InputController(backend=self.backend)
+
+    def tearDown(self):
+        self.controller.close()
+
+    def test_memory_backend_is_ready_immediately(self):
+        self.assertTrue(MemoryBackend().wait_ready(0.0))
+
+    def test_unknown_backend_rejected(self):
+        with self.assertRaises(ValueError):
+            create_backend("joystick9000")
+
+    def test_tap_hold_duration(self):
+        self.controller.tap("A", hold=0.05).result(timeout=2.0)
+        (t_press, _), = self.backend.events_of("press")
+        (t_release, _), = self.backend.events_of("release")
+        self.assertAlmostEqual(t_release - t_press, 0.05, delta=0.02)
+        self.assertFalse(self.backend.buttons["A"])
+
+    def test_unknown_button_rejected(self):
+        with self.assertRaises(ValueError):
+            self.controller.sequence(["START"])
+
+    def test_stick_updates_are_coalesced(self):
+        # A burst faster than the driver tick should collapse into a single report
+        for i in range(50):
+            self.controller.update_movement(i / 50, 0.0, frame_time=time.perf_counter())
+        time.sleep(0.05)
+
+        stats = self.controller.get_stats()
+        self.assertEqual(stats["stick_requests"], 50)
+        self.assertLess(stats["stick_sent"], 50)
+        self.assertGreater(stats["coalescing_efficiency"], 0.5)
+        self.assertEqual(self.backend.stick[0], self.controller._sent_stick[0])
+
+    def test_latency_probe(self):
+        self.assertIsNone(self.controller.get_stats()["latency_ms_p50"])
+        self.controller.update_movement(1.0, 0.0, frame_time=time.perf_counter() - 0.010)
+        time.sleep(0.05)
+
+        stats = self.controller.get_stats()
+        self.assertGreaterEqual(stats["latency_ms_p50"], 10.0)
+        self.assertLess(stats["latency_ms_p95"], 100.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+from unittest import mock
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.core.game_state import GameState
+from bot.vision.item_icons import IconIndex
+from bot.system.config import config
+from bot.vision.inventory_hud import InventoryMonitor, InventoryReader, load_inventory_reader
+
+HUD_BACKGROUND = np.array([40, 70, 50], dtype=np.uint8)
+SIZE = (722, 1152) # frame h, w
+SPRITES = {
+    "Whip.png": (1, [0, 0, 200]),
+    "Bloody_Tear.png": (2, [0, 0, 120]),
+    "Garlic.png": (3, [230, 230, 230]),
+    "Hollow Heart.png": (4, [40, 40, 220]),
+    "Spinach.png": (5, [30, 200, 30]),
+}
+UNINDEXED = (9, [200, 120, 0]) # an item missing from the icon index
+
+def make_sprite(seed, color):
+    """16x16 pixel-art icon with a transparent border."""
+    rng = np.random.default_rng(seed)
+    sprite = np.zeros((16, 16, 4), dtype=np.uint8)
+    shape = rng.random((12, 12)) > 0.4
+    sprite[2:14, 2:14, :3][shape] = color
+    sprite[2:14, 2:14, 3][shape] = 255
+    sprite[2:14, 2:14, :3][~shape] = [255, 255, 255]
+    sprite[2:14, 2:14, 3][~shape] = 255
+    return sprite
+
+class TestInventoryHUD(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.sprites = {}
+        for filename, (seed, color) in SPRITES.items():
+            cls.sprites[os.path.splitext(filename)[0].replace("_", " ")] = sprite = make_sprite(seed, color)
+            cv2.imwrite(os.path.join(cls.tmp.name, filename), sprite)
+        cls.sprites["Unindexed"] = make_sprite(*UNINDEXED)
+        names = [name for name in cls.sprites]
+        cls.index = IconIndex.build(cls.tmp.name, names, HUD_BACKGROUND)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        self.reader = InventoryReader(self.index, slots=6)
+        self.reader.background = HUD_BACKGROUND
+
+    def frame(self, weapons, passives):
+        """Map-coloured frame with the given icons drawn into the HUD strips."""
+        h, w = SIZE
+        frame = np.empty((h, w, 3), dtype=np.uint8)
+        frame[:] = HUD_BACKGROUND
+        for kind, items in (("weapon", weapons), ("passive", passives)):
+            sx, sy, sw, sh = self.reader.strips[kind]
+            for i, name in enumerate(items):
+                sprite = self.sprites[name]
+                alpha = sprite[:, :, 3:4] / 255
+                icon = (sprite[:, :, :3] * alpha + HUD_BACKGROUND * (1 - alpha)).astype(np.uint8)
+                x, y = int((sx + sw * i / self.reader.slots) * w) + 1, int(sy * h) + 1
+                frame[y:y + 16, x:x + 16] = icon # HUD icons are drawn at sprite scale
+        return frame
+
+    def test_reads_strips_left_to_right(self):
+        frame = self.frame(["Whip", "Garlic"], ["Spinach"])
+        self.assertEqual(self.reader.read(frame), {"weapon": ["Whip", "Garlic"], "passive": ["Spinach"]})
+
+    def test_trailing_miss_is_kept(self):
+        frame = self.frame(["Whip", "Garlic", "Unindexed"], [])
+        self.assertEqual(self.reader.read(frame)["weapon"], ["Whip", "Garlic", None])
+
+    def test_trailing_miss_keeps_known_items(self):
+        state = GameState(inventory_reader=self.reader)
+        for name in ("Whip", "Garlic", "Axe"):
+            state.add_weapon(name)
+        frame = self.frame(["Whip", "Garlic", "Unindexed"], [])
+        state.update_from_treasure(frame)
+        self.assertEqual(state.weapons, ["Whip", "Garlic", "Axe"])
+
+    def test_reads_region_crop(self):
+        frame = self.frame(["Garlic"], ["Hollow Heart", "Spinach"])
+        x0, y0, x1, y1 = self.reader.region(frame.shape)
+        self.assertLess(x1 * y1, frame.shape[0] * frame.shape[1] / 20)
+        self.assertEqual(self.reader.read(frame[y0:y1, x0:x1], frame.shape, (x0, y0)), self.reader.read(frame))
+
+    def test_sync_replaces_evolved_weapon(self):
+        state = GameState()
+        state.add_weapon("Whip")
+        state.add_weapon("Garlic")
+        self.assertTrue(state.sync_inventory(["Bloody Tear", "Garlic"], ["Hollow Heart"]))
+        self.assertEqual(state.weapons, ["Bloody Tear", "Garlic"])
+        self.assertEqual(state.passives, ["Hollow Heart"])
+        self.assertFalse(state.sync_inventory(["Bloody Tear", "Garlic"], ["Hollow Heart"]))
+
+    def test_partial_read_only_adds(self):
+        state = GameState()
+        state.add_weapon("Whip")
+        state.add_passive("Spinach")
+        # Unrecognised slot, and a passive read in the weapon strip: nothing is dropped
+        state.sync_inventory([None, "Garlic", "Spinach"], [])
+        self.assertEqual(state.weapons, ["Whip", "Garlic"])
+        self.assertEqual(state.passives, ["Spinach"])
+
+    def test_update_from_treasure(self):
+        state = GameState(inventory_reader=self.reader)
+        state.add_weapon("Whip")
+        frame = self.frame(["Bloody Tear"], ["Hollow Heart"])
+        image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        self.assertTrue(state.update_from_treasure(image))
+        self.assertEqual(state.weapons, ["Bloody Tear"])
+        self.assertFalse(GameState().update_from_treasure(image)) # No reader: unchanged
+
+    def test_monitor_throttles_and_syncs(self):
+        state = GameState()
+        monitor = InventoryMonitor(self.reader, state, interval=3.0, settle=0.5)
+        frame = self.frame(["Whip"], ["Spinach"])
+        self.assertTrue(monitor.offer(frame, now=10.0))
+        self.assertFalse(monitor.offer(frame, now=11.0))
+        monitor.request(now=11.0)
+        self.assertFalse(monitor.offer(frame, now=11.2))
+        self.assertTrue(monitor.offer(frame, now=11.6))
+
+        monitor.start()
+        try:
+            deadline = time.time() + 2.0
+            while monitor.reads < 1 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            monitor.stop()
+        self.assertEqual(state.weapons, ["Whip"])
+        self.assertEqual(state.passives, ["Spinach"])
+        self.assertEqual(monitor.get_stats()["changes"], 1)
+
+    def test_reader_needs_a_hud_index(self):
+        index_path = os.path.join(self.tmp.name, "icons.npz")
+        self.index.save(index_path)
+        settings = {"hud.enabled": True, "hud.index_path": None, "icons.index_path": index_path}
+        with mock.patch.object(config, "get", side_effect=lambda path, default=None: settings.get(path, default)):
+            self.assertIsNone(load_inventory_reader()) # never falls back to the level-up card index
+            settings["hud.index_path"] = index_path
+            self.assertIsInstance(load_inventory_reader(), InventoryReader)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.vision.item_icons import IconIndex, OptionRecognizer, normalize_name
+
+BACKGROUND = np.array([60, 30, 20], dtype=np.uint8)
+
+def make_sprite(seed, color):
+    """16x16 pixel-art icon with a transparent border."""
+    rng = np.random.default_rng(seed)
+    sprite = np.zeros((16, 16, 4), dtype=np.uint8)
+    shape = rng.random((12, 12)) > 0.4
+    sprite[2:14, 2:14, :3][shape] = color
+    sprite[2:14, 2:14, 3][shape] = 255
+    sprite[2:14, 2:14, :3][~shape] = [255, 255, 255]
+    sprite[2:14, 2:14, 3][~shape] = 255
+    return sprite
+
+class TestItemIcons(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.sprites = {
+            "Sprite-Whip.png": make_sprite(1, [0, 0, 200]),
+            "Silver_Ring.png": make_sprite(2, [200, 200, 200]),
+            "Gold Ring.png": make_sprite(2, [0, 200, 230]), # same shape, other colour
+            "Not An Item.png": make_sprite(3, [0, 200, 0]),
+        }
+        for name, sprite in cls.sprites.items():
+            cv2.imwrite(os.path.join(cls.tmp.name, name), sprite)
+        cls.index = IconIndex.build(cls.tmp.name, ["Whip", "Silver Ring", "Gold Ring"], BACKGROUND)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_normalize_name(self):
+        self.assertEqual(normalize_name("Sprite-Gold_Ring.png"), "goldring")
+        self.assertEqual(normalize_name("Skull O'Maniac"), "skullomaniac")
+
+    def test_index_skips_unknown_sprites(self):
+        self.assertEqual(sorted(self.index.names), ["Gold Ring", "Silver Ring", "Whip"])
+
+    def test_lookup_finds_any_distance_within_max(self):
+        # Flip bits spread over every 16-bit band: no band matches exactly
+        whip = self.index.names.index("Whip")
+        value = self.index.hashes[whip]
+        for bit in (1, 17, 33, 49, 2, 18, 34, 50):
+            value ^= 1 << bit
+        self.assertEqual(self.index.lookup(value, self.index.colors[whip], max_distance=8), ("Whip", 8))
+        self.assertEqual(self.index.lookup(value, self.index.colors[whip], max_distance=7), (None, -1))
+
+    def test_save_load_roundtrip(self):
+        path = os.path.join(self.tmp.name, "index.npz")
+        self.index.save(path)
+        loaded = IconIndex.load(path)
+        self.assertEqual(loaded.names, self.index.names)
+        self.assertEqual(loaded.hashes, self.index.hashes)
+
+    def test_recognizes_cards_from_frame(self):
+        recognizer = OptionRecognizer(self.index)
+        h, w = 768, 1245
+        frame = np.zeros((h, w, 3), dtype=np.uint8)
+        frame[:] = (10, 10, 10)
+
+        on_screen = ["Gold Ring.png", "Sprite-Whip.png", "Silver_Ring.png"] # Three cards, slot 4 empty
+        for (cx, cy, cw, ch), sprite_name in zip(recognizer.slots, on_screen):
+            x0, y0 = int(cx * w), int(cy * h)
+            frame[y0:y0 + int(ch * h), x0:x0 + int(cw * w)] = BACKGROUND
+
+            sprite = self.sprites[sprite_name]
+            alpha = sprite[:, :, 3:4] / 255
+            icon = (sprite[:, :, :3] * alpha + BACKGROUND * (1 - alpha)).astype(np.uint8)
+            icon = cv2.resize(icon, (48, 48), interpolation=cv2.INTER_NEAREST) # In-game scale
+            ix, iy = int((cx + 0.04 * cw) * w), int((cy + 0.2 * ch) * h)
+            frame[iy:iy + 48, ix:ix + 48] = icon
+
+        self.assertEqual(recognizer.recognize(frame), ["Gold Ring", "Whip", "Silver Ring"])
+
+if __name__ == "__main__":
+    unittest.main()
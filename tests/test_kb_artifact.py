@@ -0,0 +1,98 @@
+import unittest
+import sys
+import os
+import json
+import shutil
+import struct
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.knowledge_base import kb_artifact
+from bot.knowledge_base.evolution_index import KnowledgeBase
+from bot.knowledge_base.kb_artifact import KBArtifact, compile_kb, load_artifact
+
+KB_DIR = os.path.join(os.path.dirname(__file__), "..", "bot", "knowledge_base")
+
+class TestKBArtifact(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        for filename in kb_artifact.SOURCES:
+            shutil.copy(os.path.join(KB_DIR, filename), self.tmp)
+        self.addCleanup(kb_artifact._loaded.pop, self.tmp, None)
+        with open(os.path.join(KB_DIR, "items.json"), encoding="utf-8") as f:
+            self.items = json.load(f)
+        with open(os.path.join(KB_DIR, "evolutions.json"), encoding="utf-8") as f:
+            self.rows = json.load(f)
+
+    def test_round_trip(self):
+        artifact = KBArtifact(compile_kb(self.tmp))
+        self.assertEqual(artifact.item_types(), self.items)
+        self.assertEqual([artifact.row(i) for i in range(len(self.rows))], self.rows)
+        self.assertEqual(artifact.item_type("Tirajisú"), self.items["Tirajisú"])
+        self.assertIsNone(artifact.item_type("Not An Item"))
+        self.assertIn("Magic Wand", artifact.weapons_for("Empty Tome"))
+        self.assertIn("Bloody Tear", [artifact.row(i)["evolution"] for i in artifact.evolutions_from("Whip")])
+
+    def test_string_lookup_by_binary_search(self):
+        artifact = KBArtifact(compile_kb(self.tmp))
+        for i in range(artifact.counts["strings"]):
+            self.assertEqual(artifact.string_id(artifact.string(i)), i)
+        self.assertIsNone(artifact.string_id("Zzz Not An Item"))
+        self.assertIsNone(artifact.string_id("\u00ff"))
+
+    def test_knowledge_base_from_artifact(self):
+        kb = KnowledgeBase(self.tmp)
+        self.assertEqual(kb.item_types, self.items)
+        self.assertEqual(list(kb.evolution_rows), self.rows)
+        self.assertEqual(kb.evolution_rows[-1], self.rows[-1])
+        holy_wand = next(e for e in kb.evolutions if e.name == "Holy Wand")
+        self.assertEqual(holy_wand.components, {"Magic Wand", "Empty Tome"})
+        self.assertIn("Whip", kb.rows_by_item)
+        self.assertNotIn("Not An Item", kb.rows_by_item)
+        self.assertEqual(kb.rows_by_item["Whip"], kb.artifact.rows_for("Whip"))
+        self.assertTrue(all(b["core_items"] for b in kb.builds))
+
+    def test_loaded_once_and_mapped(self):
+        cache = os.path.join(self.tmp, "cache")
+        artifact = load_artifact(self.tmp, cache_dir=cache)
+        self.assertIs(load_artifact(self.tmp, cache_dir=cache), artifact)
+        self.assertEqual(artifact.path, kb_artifact.cached_artifact_path(self.tmp, cache))
+        self.assertTrue(artifact.is_current(self.tmp))
+        # Runtime builds go to the cache, never next to the sources
+        self.assertFalse(os.path.exists(os.path.join(self.tmp, kb_artifact.ARTIFACT_NAME)))
+
+    def test_built_artifact_is_preferred(self):
+        path = kb_artifact.build_artifact(self.tmp)
+        self.assertEqual(path, os.path.join(self.tmp, kb_artifact.ARTIFACT_NAME))
+        cache = os.path.join(self.tmp, "cache")
+        self.assertEqual(load_artifact(self.tmp, cache_dir=cache).path, path)
+        self.assertFalse(os.path.exists(cache))
+
+    def test_stale_artifact_is_rebuilt(self):
+        path = kb_artifact.build_artifact(self.tmp, os.path.join(self.tmp, "kb.bin"))
+        self.items["Brand New Item"] = "weapon"
+        with open(os.path.join(self.tmp, "items.json"), "w", encoding="utf-8") as f:
+            json.dump(self.items, f)
+        self.assertFalse(KBArtifact.open(path).is_current(self.tmp))
+        self.assertEqual(KBArtifact(compile_kb(self.tmp)).item_type("Brand New Item"), "weapon")
+
+    def test_rejects_other_format_versions(self):
+        data = bytearray(compile_kb(self.tmp))
+        struct.pack_into("<I", data, 4, kb_artifact.FORMAT_VERSION + 1)
+        with self.assertRaises(ValueError):
+            KBArtifact(bytes(data))
+
+    def test_relative_dirs_ignore_cwd(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmp)
+        try:
+            self.assertEqual(os.path.realpath(kb_artifact.resolve_kb_dir("bot/knowledge_base")),
+                             os.path.realpath(KB_DIR))
+        finally:
+            os.chdir(cwd)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import unittest
+import sys
+import os
+import time
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.core.game_state import GameState
+from bot.core.level_up_policy import LevelUpDecider, LevelUpPolicy
+from bot.knowledge_base.evolution_index import KnowledgeBase
+from bot.knowledge_base.kb_artifact import split_names
+from bot.core.state_handlers import handle_level_up
+
+KB_DIR = os.path.join(os.path.dirname(__file__), "..", "bot", "knowledge_base")
+
+class TestLevelUpPolicy(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.kb = KnowledgeBase(KB_DIR)
+
+    def setUp(self):
+        self.policy = LevelUpPolicy(self.kb)
+
+    def test_split_concatenated_names(self):
+        names = ["Silver Ring", "Gold Ring", "Ring"]
+        self.assertEqual(split_names("Silver RingGold Ring", names), ["Silver Ring", "Gold Ring"])
+        self.assertEqual(split_names("", names), [])
+        self.assertIsNone(split_names("5 passives", names))
+
+    def test_knowledge_base_parses_wiki_quirks(self):
+        by_name = {e.name: e for e in self.kb.evolutions}
+        self.assertEqual(by_name["Infinite Corridor"].components, {"Clock Lancet", "Silver Ring", "Gold Ring"})
+        self.assertTrue(by_name["Infinite Corridor"].max_level)
+        self.assertNotIn("Chaos Malachite", by_name) # Character requirement
+
+    def test_completes_evolution(self):
+        result = self.policy.decide(["Garlic", "Hollow Heart", "Knife"], ["Whip"], [])
+        self.assertEqual(result.decision["slot"], 2)
+        self.assertEqual(result.decision["item_type"], "passive")
+        self.assertGreaterEqual(result.confidence, 0.9)
+
+    def test_fills_empty_slots_early(self):
+        result = self.policy.decide(["Shadow Pinion"], ["Whip"], [])
+        self.assertEqual(result.decision["item_name"], "Shadow Pinion")
+
+    def test_ambiguous_screen_is_low_confidence(self):
+        # Two new weapons, nothing completes a pair: a judgement call
+        result = self.policy.decide(["Shadow Pinion", "Vento Sacro"], ["Whip"], [])
+        self.assertLess(result.confidence, 0.7)
+
+        result = self.policy.decide(["Shadow Pinion", None], ["Whip"], [])
+        self.assertLess(result.confidence, 0.7)
+
+    def test_full_slots_block_new_items(self):
+        weapons = ["Whip", "Magic Wand", "Axe", "Cross", "King Bible", "Fire Wand"]
+        result = self.policy.decide(["Garlic"], weapons, [])
+        self.assertIsNone(result.decision)
+
+class TestEvolutionIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.kb = KnowledgeBase(KB_DIR)
+
+    def test_every_row_is_indexed(self):
+        rows = {i for hits in self.kb.rows_by_item.values() for i in hits}
+        self.assertEqual(rows, set(range(len(self.kb.evolution_rows))))
+
+    def test_relevant_rows_for_inventory(self):
+        rows = self.kb.relevant_evolution_rows(["Peachone"])
+        self.assertTrue(any(r["passive_item"] == "Ebony Wings" for r in rows)) # Union
+        self.assertLess(len(rows), 5)
+
+        rows = self.kb.relevant_evolution_rows(["Gold Ring"])
+        self.assertIn("Infinite Corridor", [r["evolution"] for r in rows]) # Glued "Silver RingGold Ring"
+
+    def test_relevant_builds(self):
+        builds = self.kb.relevant_builds(["Laurel"])
+        self.assertTrue(builds)
+        self.assertNotIn("core_items", builds[0])
+        self.assertEqual(self.kb.relevant_builds(["Not An Item"]), [])
+
+        ranked = self.kb.relevant_builds(["Peachone", "Ebony Wings", "Spinach"], limit=1)
+        self.assertEqual(ranked[0]["build_name"], "The 'Vandalier' Union Build")
+
+class TestLevelUpDecider(unittest.TestCase):
+    def setUp(self):
+        self.llm = MagicMock()
+        self.llm.get_decision.return_value = {"action": "skip", "slot": 1, "item_name": ""}
+        self.state = GameState()
+        self.state.add_weapon("Whip")
+        self.decider = LevelUpDecider(self.llm, LevelUpPolicy(KnowledgeBase(KB_DIR)))
+
+    def test_local_path_skips_llm(self):
+        decision = self.decider.decide(None, None, self.state, options=["Hollow Heart"])
+        self.assertEqual(decision["source"], "local")
+        self.llm.get_decision.assert_not_called()
+
+    def test_escalates_without_options(self):
+        decision = self.decider.decide(None, None, self.state)
+        self.assertEqual(decision["source"], "llm")
+
+        stats = self.decider.get_stats()
+        self.assertEqual(stats["paths"], {"llm": 1})
+        self.assertEqual(stats["local_hit_rate"], 0.0)
+
+    def test_cache_hits_are_their_own_path(self):
+        self.llm.get_decision.return_value = {"action": "select", "slot": 1, "item_name": "Garlic", "source": "cache"}
+        self.assertEqual(self.decider.decide(None, None, self.state)["source"], "cache")
+        self.assertEqual(self.decider.get_stats()["paths"], {"cache": 1})
+        self.assertNotIn("llm", self.decider.get_stats()["mean_latency_s"])
+
+class TestSpeculativeLevelUp(unittest.TestCase):
+    def setUp(self):
+        self.bot = MagicMock()
+        played = Future()
+        played.set_result(None)
+        self.bot.sequence.return_value = played
+        self.llm = MagicMock()
+        self.state = GameState()
+        self.decider = LevelUpDecider(self.llm, LevelUpPolicy(KnowledgeBase(KB_DIR)))
+        self.frame = __import__("numpy").zeros((8, 8, 3), dtype="uint8")
+
+    def tearDown(self):
+        self.decider.shutdown(wait=True)
+
+    def test_returns_before_the_llm_answers(self):
+        def slow(*args, **kwargs):
+            time.sleep(0.2)
+            return {"action": "skip", "slot": 1, "item_name": ""}
+        self.llm.get_decision.side_effect = slow
+
+        start = time.perf_counter()
+        done = handle_level_up(self.bot, self.decider, self.state, self.frame)
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertFalse(done.done())
+
+        done.result(timeout=2.0)
+        self.assertEqual(self.state.history[-1]["source"], "llm")
+
+    def test_timeout_takes_fallback(self):
+        self.decider.timeout = 0.05
+        self.decider.fallback_action = {"action": "select", "slot": 1, "item_name": ""}
+        self.llm.get_decision.side_effect = lambda *a, **k: time.sleep(0.5)
+
+        handle_level_up(self.bot, self.decider, self.state, self.frame).result(timeout=2.0)
+        self.assertEqual(self.state.history[-1]["source"], "fallback")
+        self.decider.shutdown(wait=True) # let the late LLM answer come in
+        self.assertEqual(self.decider.get_stats()["paths"], {"timeout": 1})
+
+    def test_failed_bookkeeping_still_resolves(self):
+        self.llm.get_decision.return_value = {"action": "skip", "slot": 1, "item_name": ""}
+        self.state.log_decision = MagicMock(side_effect=RuntimeError("disk full"))
+        self.assertIsNone(handle_level_up(self.bot, self.decider, self.state, self.frame).result(timeout=2.0))
+
+    def test_cancelled_inputs_resolve_the_level_up(self):
+        inputs = Future()
+        self.bot.sequence.return_value = inputs
+        self.llm.get_decision.return_value = {"action": "skip", "slot": 1, "item_name": ""}
+        done = handle_level_up(self.bot, self.decider, self.state, self.frame)
+        deadline = time.perf_counter() + 2.0
+        while not self.state.history and time.perf_counter() < deadline: # decision chained to the inputs
+            time.sleep(0.01)
+        inputs.cancel()
+        self.assertTrue(done.cancelled())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+import base64
+import io
+import json
+import urllib.request
+
+from PIL import Image
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.dirname(__file__))
+
+from bot.system.llm_payload import PayloadSettings, encode_image
+from mock_llm_server import MockLLMServer, image_tokens
+
+def _decode(url):
+    return Image.open(io.BytesIO(base64.b64decode(url.split(",", 1)[1])))
+
+class TestLLMPayload(unittest.TestCase):
+    def setUp(self):
+        self.frame = Image.new("RGB", (1245, 768), (40, 80, 120))
+
+    def test_crop_and_downscale(self):
+        url, stats = encode_image(self.frame, PayloadSettings(crop=(0.25, 0.1, 0.5, 0.8), max_side=256))
+        self.assertTrue(url.startswith("data:image/jpeg;base64,"))
+        self.assertEqual(max(_decode(url).size), 256)
+        self.assertEqual(stats["source_size"], [1245, 768])
+        self.assertEqual(stats["base64_bytes"], len(url.split(",", 1)[1]))
+
+    def test_smaller_than_full_frame(self):
+        _, full = encode_image(self.frame, PayloadSettings())
+        _, small = encode_image(self.frame, PayloadSettings(crop=(0.25, 0.1, 0.5, 0.8), max_side=512, quality=60))
+        self.assertLess(small["base64_bytes"], full["base64_bytes"])
+
+    def test_formats(self):
+        url, _ = encode_image(self.frame, PayloadSettings(format="PNG", max_side=64))
+        self.assertTrue(url.startswith("data:image/png;base64,"))
+        with self.assertRaises(ValueError):
+            encode_image(self.frame, PayloadSettings(format="BMP"))
+
+    def test_settings_from_config(self):
+        settings = PayloadSettings.from_config({"crop": [0, 0, 1, 1], "max_side": 512, "format": "webp"})
+        self.assertEqual(settings, PayloadSettings(crop=(0.0, 0.0, 1.0, 1.0), max_side=512, format="WEBP"))
+
+    def test_mock_endpoint_counts_image_tokens(self):
+        url, _ = encode_image(self.frame, PayloadSettings(max_side=512))
+        body = {"model": "mock", "messages": [{"role": "user", "content": [
+            {"type": "text", "text": "x" * 400},
+            {"type": "image_url", "image_url": {"url": url}},
+        ]}]}
+        with MockLLMServer() as server:
+            request = urllib.request.Request(server.url + "/chat/completions", data=json.dumps(body).encode(),
+                                             headers={"Content-Type": "application/json"})
+            with urllib.request.urlopen(request, timeout=5) as response:
+                reply = json.loads(response.read())
+
+        self.assertEqual(reply["usage"]["prompt_tokens"], 100 + image_tokens(_decode(url).size))
+        self.assertIn("decision", json.loads(reply["choices"][0]["message"]["content"]))
+
+if __name__ == "__main__":
+    unittest.main()
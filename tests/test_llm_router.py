@@ -0,0 +1,135 @@
+import unittest
+import sys
+import os
+import time
+
+from PIL import Image
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.dirname(__file__))
+
+from bot.system.llm_router import Endpoint, LLMRouter
+
+def sleeper(delays, calls=None):
+    """Request function answering after delays[endpoint.name] (an Exception is raised)."""
+    def request(endpoint, cancel):
+        if calls is not None:
+            calls.append(endpoint.name)
+        delay = delays[endpoint.name]
+        if isinstance(delay, Exception):
+            raise delay
+        cancel.wait(delay)
+        if cancel.is_set():
+            raise RuntimeError("cancelled")
+        return endpoint.name
+    return request
+
+class TestLLMRouter(unittest.TestCase):
+    def setUp(self):
+        self.endpoints = [Endpoint("a", "m"), Endpoint("b", "m")]
+
+    def make(self, **kwargs):
+        router = LLMRouter(self.endpoints, **{"hedge_delay": 0.05, "min_samples": 3, "cooldown": 60.0, **kwargs})
+        self.addCleanup(router.shutdown)
+        return router
+
+    def test_fast_primary_is_not_hedged(self):
+        router = self.make()
+        calls = []
+        result, endpoint = router.call(sleeper({"a": 0.0, "b": 0.0}, calls))
+        self.assertEqual((result, endpoint.name), ("a", "a"))
+        self.assertEqual(calls, ["a"])
+
+    def test_slow_primary_is_hedged_and_cancelled(self):
+        router = self.make()
+        calls = []
+        start = time.perf_counter()
+        result, _ = router.call(sleeper({"a": 1.0, "b": 0.0}, calls))
+        self.assertEqual(result, "b")
+        self.assertEqual(calls, ["a", "b"])
+        self.assertLess(time.perf_counter() - start, 0.5)
+        stats = router.get_stats()
+        self.assertEqual((stats["a"]["cancelled"], stats["b"]["wins"]), (1, 1))
+
+    def test_routes_to_faster_endpoint(self):
+        router = self.make()
+        for _ in range(3):
+            router.call(sleeper({"a": 1.0, "b": 0.0}))
+        self.assertEqual(router.ranked()[0].name, "b")
+        calls = []
+        router.call(sleeper({"a": 0.0, "b": 0.0}, calls))
+        self.assertEqual(calls, ["b"])
+
+    def test_cancelled_requests_are_not_latency_samples(self):
+        router = self.make()
+        for _ in range(3):
+            router.call(sleeper({"a": 1.0, "b": 0.02}))
+        stats = router.get_stats()
+        self.assertIsNone(stats["a"]["p50_s"]) # Never finished: no measured latency
+        self.assertEqual(stats["a"]["cancelled"], 1) # b then answers within the hedge delay
+        self.assertEqual(router.ranked()[0].name, "b")
+
+    def test_hedge_delay_follows_p95(self):
+        router = self.make()
+        self.assertEqual(router.hedge_delay(self.endpoints[0]), 0.05)
+        for _ in range(3):
+            router.call(sleeper({"a": 0.1, "b": 1.0}))
+        self.assertAlmostEqual(router.hedge_delay(self.endpoints[0]), 0.1, delta=0.05)
+
+    def test_error_fails_over_and_cools_down(self):
+        router = self.make()
+        result, _ = router.call(sleeper({"a": ConnectionError("down"), "b": 0.0}))
+        self.assertEqual(result, "b")
+        self.assertEqual(router.get_stats()["a"]["errors"], 1)
+        self.assertEqual(router.ranked()[0].name, "b")
+
+    def test_all_failing_raises_last_error(self):
+        router = self.make()
+        with self.assertRaises(ConnectionError):
+            router.call(sleeper({"a": ConnectionError("a"), "b": ConnectionError("b")}))
+
+class TestRoutedClient(unittest.TestCase):
+    def test_hedges_to_fast_mock_endpoint(self):
+        try:
+            from bot.system.llm_client import LLMClient
+        except ImportError as e:
+            self.skipTest(f"LLM client dependencies missing: {e}")
+        from mock_llm_server import MockLLMServer
+
+        for stream in (False, True):
+            with self.subTest(stream=stream), MockLLMServer(latency=2.0) as slow, MockLLMServer() as fast:
+                client = LLMClient()
+                client.cache, client.log_enabled, client.stream = None, False, stream
+                client.router = LLMRouter([Endpoint("slow", "openai/mock", slow.url, "mock"),
+                                           Endpoint("fast", "openai/mock", fast.url, "mock")], hedge_delay=0.1)
+
+                start = time.perf_counter()
+                decision = client.get_decision(Image.new("RGB", (64, 64)), {"weapons": [], "passives": []})
+                elapsed = time.perf_counter() - start
+                client.router.shutdown()
+
+                self.assertEqual(decision["action"], "select")
+                self.assertLess(elapsed, 1.0)
+                self.assertEqual(client.router.get_stats()["fast"]["wins"], 1)
+
+    def test_fails_over_on_http_error(self):
+        try:
+            from bot.system.llm_client import LLMClient
+        except ImportError as e:
+            self.skipTest(f"LLM client dependencies missing: {e}")
+        from mock_llm_server import MockLLMServer
+
+        with MockLLMServer(fail_status=503) as broken, MockLLMServer() as working:
+            client = LLMClient()
+            client.cache, client.log_enabled, client.stream = None, False, False
+            client.router = LLMRouter([Endpoint("broken", "openai/mock", broken.url, "mock"),
+                                       Endpoint("working", "openai/mock", working.url, "mock")], hedge_delay=5.0)
+            decision = client.get_decision(Image.new("RGB", (64, 64)), {"weapons": [], "passives": []})
+            client.router.shutdown()
+
+        self.assertEqual(decision["action"], "select")
+        self.assertEqual(client.router.get_stats()["broken"]["errors"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+import json
+import time
+
+from PIL import Image
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.dirname(__file__))
+
+from bot.system.json_stream import ObjectExtractor
+
+DOCUMENT = json.dumps({
+    "decision": {"action": "select", "slot": 2, "item_name": "Garlic {the \"best\"}"},
+    "analysis": {"strategy_fit": "} \" { tricky", "visible_options": ["a", "b"]},
+})
+
+class TestObjectExtractor(unittest.TestCase):
+    def test_extracts_before_document_ends(self):
+        extractor = ObjectExtractor("decision")
+        end = DOCUMENT.index('"analysis"')
+        results = [extractor.feed(DOCUMENT[i:i + 3]) for i in range(0, end, 3)]
+        self.assertEqual([r for r in results if r], [json.loads(DOCUMENT)["decision"]])
+
+        for i in range(end, len(DOCUMENT), 3):
+            self.assertIsNone(extractor.feed(DOCUMENT[i:i + 3]))
+        self.assertEqual(json.loads(extractor.text), json.loads(DOCUMENT))
+
+    def test_ignores_nested_and_quoted_keys(self):
+        document = json.dumps({
+            "analysis": {"decision": {"action": "wrong"}, "note": "\"decision\": {\"action\": \"wrong\"}"},
+            "decision": {"action": "skip", "slot": 1, "item_name": ""},
+        })
+        extractor = ObjectExtractor("decision")
+        found = [r for r in (extractor.feed(c) for c in document) if r]
+        self.assertEqual(found, [{"action": "skip", "slot": 1, "item_name": ""}])
+
+class TestStreamingClient(unittest.TestCase):
+    def test_decision_returned_while_analysis_streams(self):
+        try:
+            from bot.system.llm_client import LLMClient
+        except ImportError as e:
+            self.skipTest(f"LLM client dependencies missing: {e}")
+        from mock_llm_server import MockLLMServer
+
+        with MockLLMServer(chunk_latency=0.01, chunk_chars=8, analysis="x" * 800) as server:
+            client = LLMClient()
+            client.model_name, client.api_base, client.api_key = "openai/mock", server.url, "mock"
+            client.cache, client.log_enabled, client.stream = None, False, True
+
+            start = time.perf_counter()
+            decision = client.get_decision(Image.new("RGB", (64, 64)), {"weapons": [], "passives": []})
+            elapsed = time.perf_counter() - start
+
+        self.assertEqual(decision["action"], "select")
+        # ~100 chunks of analysis follow the decision; it must not wait for them
+        self.assertLess(elapsed, 0.5)
+
+if __name__ == "__main__":
+    unittest.main()
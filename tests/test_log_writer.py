@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+import gzip
+import json
+import tempfile
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.system.log_writer import LogWriter
+
+def read_lines(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+class TestLogWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def make(self, **kwargs):
+        writer = LogWriter(**{"flush_interval": 0.05, "fsync": "flush", **kwargs})
+        self.addCleanup(writer.close)
+        return writer
+
+    def test_writes_records_in_order(self):
+        writer = self.make()
+        stream = writer.open(self.path("a.jsonl"), max_bytes=0, compress=False)
+        for i in range(100):
+            self.assertTrue(stream.write({"i": i}))
+        stream.write(lambda: {"i": "lazy"})
+        stream.write("{\"i\": \"line\"}")
+        self.assertTrue(writer.flush())
+        self.assertEqual([r["i"] for r in read_lines(stream.path)], list(range(100)) + ["lazy", "line"])
+        self.assertEqual(writer.get_stats()["written"], 102)
+
+    def test_periodic_flush(self):
+        writer = self.make()
+        stream = writer.open(self.path("a.jsonl"), max_bytes=0, compress=False)
+        stream.write({"i": 1})
+        for _ in range(50):
+            if os.path.exists(stream.path) and os.path.getsize(stream.path):
+                break
+            time.sleep(0.02)
+        self.assertEqual(read_lines(stream.path), [{"i": 1}])
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        writer = self.make(queue_size=4, batch_size=1)
+        gate = threading.Event()
+        stream = writer.open(self.path("a.jsonl"), max_bytes=0, compress=False)
+        stream.write(lambda: gate.wait(5) and {"blocked": True}) # Holds the writer thread
+        results = [stream.write({"i": i}) for i in range(10)]
+        gate.set()
+        writer.flush()
+        self.assertIn(False, results)
+        self.assertEqual(writer.get_stats()["dropped"], results.count(False))
+        self.assertEqual(len(read_lines(stream.path)), 1 + results.count(True))
+
+    def test_rotation(self):
+        writer = self.make()
+        stream = writer.open(self.path("a.jsonl"), max_bytes=200, backups=2, compress=False)
+        for i in range(40):
+            stream.write({"i": i, "pad": "x" * 20})
+        writer.flush()
+        files = sorted(os.listdir(self.tmp.name))
+        self.assertEqual(files, ["a.jsonl", "a.jsonl.1", "a.jsonl.2"])
+        self.assertTrue(all(os.path.getsize(self.path(f)) <= 200 for f in files))
+        self.assertEqual(read_lines(stream.path)[-1]["i"], 39)
+        self.assertGreater(writer.get_stats()["rotations"], 2)
+
+    def test_gzip_stream(self):
+        writer = self.make()
+        stream = writer.open(self.path("a.jsonl"), max_bytes=0, compress=True)
+        for i in range(10):
+            stream.write({"i": i})
+        writer.flush()
+        stream.write({"i": 10})
+        writer.close()
+        self.assertTrue(stream.path.endswith(".gz"))
+        self.assertEqual([r["i"] for r in read_lines(stream.path)], list(range(11)))
+
+    def test_bad_record_is_counted_not_fatal(self):
+        writer = self.make()
+        stream = writer.open(self.path("a.jsonl"), max_bytes=0, compress=False)
+        stream.write({"bad": object()})
+        stream.write({"ok": 1})
+        writer.flush()
+        self.assertEqual(read_lines(stream.path), [{"ok": 1}])
+        self.assertEqual(writer.get_stats()["errors"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import sys
+import os
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+import cv2
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.core.menu_navigator import MenuNavigator
+from bot.core.state_handlers import GUY_CURSOR_RESET, LEVEL_UP_CURSOR_RESET, execute_decision, handle_guy
+from bot.vision.menu_cursor import MenuCursorDetector, MenuLayout
+
+FRAME_SIZE = (768, 1245) # (h, w)
+
+class FakeMenu:
+    """Simulated level-up screen: d-pad taps move a highlight drawn on the frame."""
+    def __init__(self, layout: MenuLayout, cursor: str, lag_frames: int = 2):
+        self.layout = layout
+        self.cursor = cursor
+        self.pending = []
+        self.lag_frames = lag_frames
+        self.taps = []
+
+    def tap(self, button, hold=None, gap=None):
+        self.taps.append(button)
+        if button in self.layout.neighbours[self.cursor] or self.pending:
+            self.pending.append(button)
+        done = Future()
+        done.set_result(None)
+        return done
+
+    def sequence(self, steps, hold=None, gap=None):
+        self.taps.append(("sequence", list(steps)))
+        done = Future()
+        done.set_result(None)
+        return done
+
+    def render(self):
+        # Presses take a couple of frames to show up, like the real UI
+        if self.pending:
+            self.lag_frames -= 1
+            if self.lag_frames <= 0:
+                button = self.pending.pop(0)
+                self.cursor = self.layout.neighbours[self.cursor].get(button, self.cursor)
+                self.lag_frames = 2
+        frame = np.full(FRAME_SIZE + (3,), (40, 30, 30), dtype=np.uint8)
+        h, w = FRAME_SIZE
+        rx, ry, rw, rh = self.layout.rects[self.cursor]
+        cv2.rectangle(frame, (int(rx * w), int(ry * h)), (int((rx + rw) * w) - 1, int((ry + rh) * h) - 1), (0, 220, 255), 4)
+        return frame
+
+class TestMenuNavigator(unittest.TestCase):
+    def setUp(self):
+        self.detector = MenuCursorDetector()
+        self.layout = self.detector.layouts["level_up"]
+
+    def _navigator(self, menu, capture=None):
+        nav = MenuNavigator(menu, {}, detector=self.detector, capture=capture or menu.render)
+        nav.step_timeout = 0.05
+        nav.appear_timeout = 0.05
+        nav.poll_interval = 0.0
+        return nav
+
+    def test_shortest_path(self):
+        self.assertEqual(self.layout.shortest_path("slot_1", "slot_3"), ["DPAD_DOWN", "DPAD_DOWN"])
+        self.assertEqual(sorted(self.layout.shortest_path("slot_1", "skip")), ["DPAD_DOWN", "DPAD_RIGHT"])
+        self.assertEqual(self.layout.shortest_path("banish", "slot_3"), ["DPAD_LEFT"])
+        self.assertEqual(self.layout.shortest_path("slot_2", "slot_2"), [])
+
+    def test_detects_highlighted_cell(self):
+        for cell in ("slot_1", "slot_4", "banish"):
+            self.assertEqual(self.detector.detect(FakeMenu(self.layout, cell).render(), "level_up"), cell)
+        blank = np.zeros(FRAME_SIZE + (3,), dtype=np.uint8)
+        self.assertIsNone(self.detector.detect(blank, "level_up"))
+
+    def test_navigates_from_observed_cursor(self):
+        # Cursor was left on slot_4 by gameplay input bleed
+        menu = FakeMenu(self.layout, "slot_4")
+        self.assertTrue(self._navigator(menu).navigate("level_up", "slot_2"))
+        self.assertEqual(menu.cursor, "slot_2")
+        self.assertEqual(menu.taps, ["DPAD_UP", "DPAD_UP", "A"])
+
+    def test_banish_stages(self):
+        menu = FakeMenu(self.layout, "slot_1")
+        nav = self._navigator(menu)
+        self.assertTrue(nav.submit([("level_up", "banish", True), ("level_up", "slot_3", True)]).result(timeout=5))
+        self.assertEqual(menu.taps.count("A"), 2)
+        self.assertEqual(menu.cursor, "slot_3")
+
+    def test_settles_after_confirming(self):
+        menu = FakeMenu(self.layout, "slot_1")
+        self.assertTrue(self._navigator(menu).submit([("level_up", "slot_2", True)], settle=0.5).result(timeout=5))
+        self.assertEqual(menu.taps[-2:], ["A", ("sequence", [("wait", 0.5)])])
+
+    def test_falls_back_to_blind_macro(self):
+        menu = FakeMenu(self.layout, "slot_1")
+        blank = np.zeros(FRAME_SIZE + (3,), dtype=np.uint8)
+        nav = self._navigator(menu, capture=lambda: blank)
+        self.assertFalse(nav.submit([("level_up", "slot_2", True)], fallback_steps=["DPAD_DOWN", "A"]).result(timeout=5))
+        self.assertEqual(menu.taps, [("sequence", ["DPAD_DOWN", "A"])])
+
+    def test_fallback_macros_reset_the_cursor_first(self):
+        nav = MagicMock()
+        nav.has_layout.return_value = True
+        execute_decision(MagicMock(), {"action": "banish", "slot": 3}, navigator=nav)
+        fallback = nav.submit.call_args.kwargs["fallback_steps"]
+        self.assertEqual(fallback[:len(LEVEL_UP_CURSOR_RESET)], LEVEL_UP_CURSOR_RESET)
+
+        handle_guy(MagicMock(), navigator=nav)
+        fallback = nav.submit.call_args.kwargs["fallback_steps"]
+        self.assertEqual(fallback[:len(GUY_CURSOR_RESET)], GUY_CURSOR_RESET)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+import json
+import urllib.request
+
+from PIL import Image
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.dirname(__file__))
+
+from mock_llm_server import MockLLMServer, schema_errors
+
+SCHEMA = {
+    "type": "object",
+    "properties": {"action": {"type": "string", "enum": ["select", "skip"]}, "slot": {"type": "integer"}},
+    "required": ["action", "slot"],
+    "additionalProperties": False,
+}
+
+def post(server: MockLLMServer, body: dict) -> dict:
+    request = urllib.request.Request(f"{server.url}/chat/completions", data=json.dumps(body).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.loads(response.read())
+
+class TestSchemaErrors(unittest.TestCase):
+    def test_valid(self):
+        self.assertEqual(schema_errors({"action": "skip", "slot": 1}, SCHEMA), [])
+
+    def test_violations(self):
+        errors = schema_errors({"action": "buy", "slot": True, "extra": 1}, SCHEMA)
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(schema_errors({"action": "skip"}, SCHEMA), ["$: missing slot"])
+
+class TestMockServer(unittest.TestCase):
+    def test_scripted_responses_and_schema_check(self):
+        script = [{"action": "select", "slot": 2}, {"action": "buy", "slot": 1}]
+        body = {"model": "mock", "messages": [{"role": "user", "content": "hi"}],
+                "response_format": {"type": "json_schema", "json_schema": {"name": "t", "schema": SCHEMA}}}
+        with MockLLMServer(script=script) as server:
+            contents = [json.loads(post(server, body)["choices"][0]["message"]["content"]) for _ in range(3)]
+            self.assertEqual(contents, [script[0], script[1], script[0]])
+            self.assertEqual(server.requests, 3)
+            self.assertEqual(len(server.schema_errors), 1)
+            self.assertEqual(len(server.handle_times), 3)
+
+    def test_client_requests_match_schema(self):
+        try:
+            from bot.system.llm_client import LLMClient
+        except ImportError as e:
+            self.skipTest(f"LLM client dependencies missing: {e}")
+
+        for stream in (False, True):
+            with self.subTest(stream=stream), MockLLMServer() as server:
+                client = LLMClient()
+                client.model_name, client.api_base, client.api_key = "openai/mock", server.url, "mock"
+                client.router, client.cache, client.log_enabled, client.stream = None, None, False, stream
+                decision = client.get_decision(Image.new("RGB", (64, 64)), {"weapons": [], "passives": []})
+
+                self.assertEqual(decision["action"], "select")
+                self.assertEqual(server.bodies[0]["response_format"]["type"], "json_schema")
+                self.assertEqual(server.schema_errors, [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.core.game_state import GameState
+from bot.knowledge_base.evolution_index import KnowledgeBase
+from bot.knowledge_base.name_index import NameIndex, normalize
+
+KB_DIR = os.path.join(os.path.dirname(__file__), "..", "bot", "knowledge_base")
+
+class TestNameIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.kb = KnowledgeBase(KB_DIR)
+        cls.names = cls.kb.names
+
+    def test_normalize(self):
+        self.assertEqual(normalize("Skull O'Maniac"), "skullomaniac")
+        self.assertEqual(normalize("  tirajisú "), "tirajisu")
+
+    def test_exact_and_normalized(self):
+        self.assertEqual(self.names.resolve("Garlic").via, "exact")
+        match = self.names.resolve("skull-o-maniac")
+        self.assertEqual((match.name, match.via), ("Skull O'Maniac", "exact"))
+
+    def test_evolution_alias(self):
+        match = self.names.resolve("emergency meeting")
+        self.assertEqual((match.name, match.via), ("Report!", "alias"))
+        self.assertNotEqual(self.names.resolve("Emergency Meeting", aliases=False).via, "alias")
+
+    def test_items_are_not_aliased(self):
+        # Evolution results that are items themselves resolve to themselves
+        for name in ("Hollow Heart", "Holy Wand", "Bloody Tear", "Vandalier"):
+            match = self.names.resolve(name)
+            self.assertEqual((match.name, match.via), (name, "exact"))
+
+    def test_fuzzy_top_k(self):
+        match = self.names.resolve("Magick Wand")
+        self.assertEqual((match.name, match.via), ("Magic Wand", "fuzzy"))
+        candidates = self.names.candidates("Spinnach", k=3)
+        self.assertEqual(candidates[0].name, "Spinach")
+        self.assertEqual(list(candidates), sorted(candidates, key=lambda m: (-m.score, m.name)))
+        self.assertIsNone(self.names.resolve("Completely Unrelated Thing"))
+
+    def test_deterministic_ties(self):
+        index = NameIndex(["Ring A", "Ring B"], cutoff=0.1)
+        self.assertEqual([m.name for m in index.candidates("Ring")], ["Ring A", "Ring B"])
+
+    def test_lookups_are_fast(self):
+        index = NameIndex(self.kb.item_types, {e: b[0] for e, b in self.kb.evolves_from.items()})
+        queries = [f"{name[:-1]}x" for name in list(self.kb.item_types)[:200]]
+        start = time.perf_counter()
+        for query in queries:
+            index.candidates(query)
+        self.assertLess((time.perf_counter() - start) / len(queries), 0.001)
+
+    def test_game_state_uses_index(self):
+        state = GameState(self.names)
+        state.log_decision({"action": "select", "slot": 1, "item_name": "garlick"})
+        state.log_decision({"action": "select", "slot": 2, "item_name": "Holy Wand"})
+        state.log_decision({"action": "select", "slot": 3, "item_name": "Hollow Heart"})
+        self.assertEqual(state.weapons, ["Garlic", "Holy Wand"])
+        self.assertEqual(state.passives, ["Hollow Heart"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.core.pilot import Pilot, _nearest_neighbours
+from bot.vision.types import Detection
+
+CLASS_NAMES = {0: "monster", 1: "rune"}
+
+def monster_at(x, y, size=20):
+    return Detection((x - size // 2, y - size // 2, x + size // 2, y + size // 2), 0, 1.0)
+
+class TestPilotPrediction(unittest.TestCase):
+    def setUp(self):
+        self.center = (480, 304)
+
+    def _force_after(self, frames, dt=1 / 30):
+        pilot = Pilot(self.center)
+        for i, detections in enumerate(frames):
+            pilot.update(detections, CLASS_NAMES, timestamp=i * dt)
+        return pilot, pilot.get_force_vector(frames[-1], CLASS_NAMES)
+
+    def test_velocity_estimated_from_consecutive_frames(self):
+        # Monster moves 3px/frame towards the player at 30 FPS -> 90 px/s
+        pilot, _ = self._force_after([[monster_at(560, 304)], [monster_at(557, 304)]])
+        np.testing.assert_allclose(pilot.monster_velocities[0], [-45.0, 0.0]) # Smoothed with 0 prior
+
+    def test_charging_monster_repels_harder_than_receding(self):
+        _, (charging_fx, _) = self._force_after([[monster_at(565, 304)], [monster_at(560, 304)], [monster_at(555, 304)]])
+        _, (receding_fx, _) = self._force_after([[monster_at(545, 304)], [monster_at(550, 304)], [monster_at(555, 304)]])
+        self.assertLess(charging_fx, receding_fx)
+        self.assertLess(charging_fx, 0)
+
+    def test_approaching_monster_beyond_range_triggers_early_correction(self):
+        # 130px away: outside repulsion_range, but closing at 150 px/s
+        _, (fx, fy) = self._force_after([[monster_at(615, 304)], [monster_at(610, 304)], [monster_at(605, 304)]])
+        self.assertLess(fx, 0)
+
+        _, (static_fx, static_fy) = self._force_after([[monster_at(605, 304)], [monster_at(605, 304)]])
+        self.assertEqual((static_fx, static_fy), (0.0, 0.0))
+
+    def test_passing_monster_pushes_sideways(self):
+        # Monster above-right moving left along a line 30px above the player
+        _, (fx, fy) = self._force_after([[monster_at(540, 274)], [monster_at(535, 274)], [monster_at(530, 274)]])
+        self.assertGreater(fy, 0) # Pushed down, away from its path
+
+    def test_nearest_neighbours_radius(self):
+        points = np.array([[0.0, 0.0], [100.0, 100.0], [500.0, 500.0]])
+        candidates = np.array([[3.0, 4.0], [130.0, 100.0], [90.0, 100.0]])
+        idx, matched = _nearest_neighbours(points, candidates, 40)
+        self.assertEqual(list(matched), [True, True, False])
+        self.assertEqual(list(idx[:2]), [0, 2])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.simulation.scenes import generate, load_replay, save_replay
+from bot.simulation.sweep import Scenario, evaluate, expand_grid, run_sweep, SimSettings
+
+class TestSweep(unittest.TestCase):
+    def test_expand_grid(self):
+        combos = expand_grid({"a": [1, 2], "b": [3, 4, 5]})
+        self.assertEqual(len(combos), 6)
+        self.assertIn({"a": 2, "b": 5}, combos)
+
+    def test_replay_round_trip_and_scoring(self):
+        frames = generate("mixed", 30, 10)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "detections_test.jsonl")
+            save_replay(frames, path)
+            loaded, timestamps = load_replay(path)
+            self.assertEqual(len(loaded), 10)
+            self.assertEqual(len(loaded[0]), len(frames[0]))
+
+            result = evaluate(({"pilot.forces.repel_monster": 700.0}, [Scenario("replay", 0, replay_path=path)], SimSettings()))
+            self.assertGreaterEqual(result["min_clearance"], 0)
+            self.assertGreaterEqual(result["jerk"], 0)
+
+    def test_parallel_sweep_is_ranked(self):
+        scenarios = [Scenario("closing_ring", 12, frames=20)]
+        results = run_sweep({"pilot.forces.repel_monster": [100.0, 1000.0]}, scenarios,
+                            {"clearance": 1.0, "gems": 1.0, "jerk": 1.0}, workers=2)
+        self.assertEqual(len(results), 2)
+        self.assertGreaterEqual(results[0]["score"], results[1]["score"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+from concurrent.futures import Future
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bot.core.ui_flow import UIStateMachine, load_states
+
+class TestUIFlow(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.futures = {}
+        names = ["suspend_steering", "level_up", "open_treasure", "collect_treasure", "revive", "guy", "quit", "gameplay"]
+        actions = {name: (lambda frame, n=name: self._record(n)) for name in names}
+        self.flow = UIStateMachine(actions, states=load_states({}))
+
+    def _record(self, name):
+        self.calls.append(name)
+        return self.futures.get(name)
+
+    def test_fires_on_first_frame_of_new_state(self):
+        self.flow.step("GAMEPLAY", now=0.0)
+        self.flow.step("LEVEL_UP", now=0.1)
+        self.assertEqual(self.calls, ["gameplay", "suspend_steering", "level_up"])
+
+    def test_pending_inputs_defer_transitions(self):
+        pending = Future()
+        self.futures["open_treasure"] = pending
+        self.flow.step("TREASURE_START", now=0.0)
+        self.flow.step("TREASURE_DONE", now=0.5)
+        self.assertNotIn("collect_treasure", self.calls)
+
+        pending.set_result(None)
+        self.flow.step("TREASURE_DONE", now=0.6)
+        self.assertEqual(self.calls.count("collect_treasure"), 1)
+        self.assertEqual(self.calls.count("open_treasure"), 1)
+
+    def test_rearm_handles_back_to_back_menus(self):
+        done = Future()
+        done.set_result(None)
+        self.futures["level_up"] = done
+        self.flow.step("LEVEL_UP", now=0.0)
+        self.flow.step("LEVEL_UP", now=0.1) # Inputs played out, menu still up -> next level
+        self.assertEqual(self.calls.count("level_up"), 2)
+
+    def test_non_rearming_state_waits_for_timeout(self):
+        self.flow.step("TREASURE_START", now=0.0)
+        self.flow.step("TREASURE_START", now=30.0)
+        self.assertEqual(self.calls.count("open_treasure"), 1)
+
+        self.flow.step("TREASURE_START", now=61.0) # timed out -> re-armed
+        self.flow.step("TREASURE_START", now=61.1)
+        self.assertEqual(self.calls.count("open_treasure"), 2)
+
+    def test_hung_inputs_time_out(self):
+        hung = Future() # A handler whose inputs never resolve
+        self.futures["level_up"] = hung
+        self.flow.step("LEVEL_UP", now=0.0)
+        self.flow.step("LEVEL_UP", now=10.0)
+        self.assertEqual(self.calls.count("level_up"), 1)
+
+        self.flow.step("LEVEL_UP", now=31.0) # timed out -> dropped and re-entered
+        self.assertTrue(hung.cancelled())
+        self.assertEqual(self.calls.count("level_up"), 2)
+
+    def test_pause_throttles_capture(self):
+        self.flow.step("GAMEPLAY", now=0.0)
+        self.assertEqual(self.flow.capture_interval(), 0.0)
+        self.flow.step("PAUSE", now=0.1)
+        self.assertAlmostEqual(self.flow.capture_interval(), 0.5)
+
+    def test_unknown_action_rejected(self):
+        with self.assertRaises(ValueError):
+            UIStateMachine({}, states=load_states({}))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -112,4 +112,11 @@ all_stage_images = get_wiki_images(stage_wiki_api, pages=stage_list_page)
 
 # Filter specifically for 'Preview' to capture the "Preview of normal..." images
 # and ignore UI icons like gold, items, or character heads.
-download_files(all_stage_images, "stage_previews", filter_keywords=["Preview"])
\ No newline at end of file
+download_files(all_stage_images, "stage_previews", filter_keywords=["Preview"])
+
+# 3. Download item icons for the level-up option recognizer
+# Files that don't resolve to an item name are skipped when the index is built:
+#   python -m bot.vision.item_icons --sprites item_icons
+print("Fetching item icons from the Weapons and Passive items pages...")
+item_icons = get_wiki_images(stage_wiki_api, pages=["Weapons", "Passive items"])
+download_files(item_icons, "item_icons")